@@ -0,0 +1,50 @@
+"""
+Micro benchmarks for the server, run from the `server` directory
+
+    python3 -m benchmarks.<name>
+
+Benchmarks that touch the database use MONGO_URI and TEST_MONGO_DB,
+same as the test suite.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "githubsrm"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("DEBUG", "true")
+
+import django
+
+django.setup()
+
+from pymongo import monitoring
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server"""
+
+    def __init__(self) -> None:
+        self.commands = 0
+
+    def started(self, event) -> None:
+        if event.command_name not in ("isMaster", "hello", "endSessions"):
+            self.commands += 1
+
+    def succeeded(self, event) -> None:
+        pass
+
+    def failed(self, event) -> None:
+        pass
+
+
+def report(title: str, rows) -> None:
+    """Print a small result table
+
+    Args:
+        title (str): benchmark name
+        rows: iterable of (label, value) pairs
+    """
+    print(f"\n{title}")
+    for label, value in rows:
+        print(f"  {label:<40} {value}")
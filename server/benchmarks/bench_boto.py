@@ -0,0 +1,87 @@
+"""
+Per call overhead of an SNS publish against a local stub endpoint, a
+client built on every call against the shared BotoService clients.
+
+    python3 -m benchmarks.bench_boto [calls]
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import report
+
+import boto3
+from core.aws import service
+from django.conf import settings
+
+PUBLISH_RESPONSE = b"""<PublishResponse xmlns="http://sns.amazonaws.com/doc/2010-03-31/">
+<PublishResult><MessageId>bench</MessageId></PublishResult>
+<ResponseMetadata><RequestId>bench</RequestId></ResponseMetadata>
+</PublishResponse>"""
+
+TOPIC = "arn:aws:sns:ap-south-1:000000000000:bench"
+
+
+class Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(PUBLISH_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(PUBLISH_RESPONSE)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def per_call(endpoint: str):
+    return boto3.client("sns", region_name="ap-south-1", endpoint_url=endpoint)
+
+
+def shared(endpoint: str):
+    return service.client("sns")
+
+
+def measure(get_client, endpoint: str, calls: int) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(calls):
+        get_client(endpoint).publish(TopicArn=TOPIC, Message=f"{i}", Subject="bench")
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1e3 / calls, peak / 1024
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    endpoint = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.AWS["endpoint_url"] = endpoint
+
+    rows = []
+    try:
+        for label, get_client in (("client per call", per_call), ("shared", shared)):
+            # warm up imports and the endpoint data loader
+            get_client(endpoint).publish(TopicArn=TOPIC, Message="-", Subject="-")
+            ms, peak = measure(get_client, endpoint, calls)
+            rows.append((f"{label} ms/call", f"{ms:.2f}"))
+            rows.append((f"{label} peak KiB", f"{peak:.0f}"))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    report(f"SNS publish overhead, {calls} calls", rows)
@@ -0,0 +1,63 @@
+"""
+Email render latency per role, reading and compiling the template on
+every call as get_email_content used to against the startup compiled
+registry.
+
+    python3 -m benchmarks.bench_email_templates [renders]
+"""
+
+import json
+import os
+import sys
+import time
+
+from . import report
+
+from core.email_templates import EmailTemplates, email_templates
+from django.conf import settings
+from jinja2 import Template
+
+
+def legacy_render(role: str, data: dict) -> dict:
+    folder = settings.EMAIL_TEMPLATES["folder"]
+    with open(f"{folder}/email_statics.json", "r") as fp:
+        email_context = json.load(fp)[role]
+    with open(f"{folder}/{email_context['file']}.html") as file_:
+        html_email = Template(file_.read()).render(**data)
+    body_kw = [data[i] for i in email_context["body_kw"]]
+    return {
+        "Simple": {
+            "Subject": {"Data": email_context["subject"], "Charset": "utf-8"},
+            "Body": {
+                "Text": {
+                    "Data": email_context["bodyText"].format(*body_kw),
+                    "Charset": "utf-8",
+                },
+                "Html": {"Data": html_email, "Charset": "utf-8"},
+            },
+        },
+    }
+
+
+def measure(render, role: str, data: dict, renders: int) -> float:
+    start = time.perf_counter()
+    for _ in range(renders):
+        render(role, data)
+    return (time.perf_counter() - start) * 1e6 / renders
+
+
+if __name__ == "__main__":
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    start = time.perf_counter()
+    EmailTemplates().load()
+    rows = [("startup load ms", f"{(time.perf_counter() - start) * 1e3:.1f}")]
+
+    for role, (context, _) in email_templates.roles.items():
+        data = {key: f"{key}-value" for key in context["kw"]}
+        assert legacy_render(role, data) == email_templates.render(role, data)
+        legacy = measure(legacy_render, role, data, renders)
+        registry = measure(email_templates.render, role, data, renders)
+        rows.append((f"{role} us", f"{legacy:.0f} -> {registry:.0f}"))
+
+    report(f"Email render, {renders} renders per role, legacy -> registry", rows)
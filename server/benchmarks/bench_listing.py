@@ -0,0 +1,75 @@
+"""
+Peak memory of the public project listing, legacy
+`json.loads(json_util.dumps(cursor))` + `JsonResponse` against the
+streaming encoder, for a growing number of approved public projects.
+"""
+
+import json
+import sys
+import tracemalloc
+
+from . import report
+
+from bson import json_util
+from core.mongo import registry
+from core.utils import stream_json
+from django.http import JsonResponse, StreamingHttpResponse
+
+FILTER = {"private": False, "is_admin_approved": True, "benchmark": True}
+PROJECTION = {"maintainer_id": 0, "team_slug": 0}
+
+
+def seed(db, projects: int) -> None:
+    db.project.insert_many(
+        [
+            {
+                "project_name": f"benchmark-{i}",
+                "description": "x" * 300,
+                "tags": ["a", "b", "c"],
+                "contributor_id": [f"C{j:07d}" for j in range(20)],
+                **FILTER,
+            }
+            for i in range(projects)
+        ]
+    )
+
+
+def clean(db) -> None:
+    db.project.delete_many({"benchmark": True})
+
+
+def legacy(db) -> int:
+    result = json.loads(json_util.dumps(db.project.find(FILTER, PROJECTION)))
+    return len(JsonResponse(data=result, safe=False).content)
+
+
+def streaming(db) -> int:
+    response = StreamingHttpResponse(stream_json(db.project.find(FILTER, PROJECTION)))
+    return sum(len(chunk) for chunk in response.streaming_content)
+
+
+def peak_kib(run, db) -> float:
+    tracemalloc.start()
+    run(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 1000, 10000]
+    db = registry.db
+    rows = []
+
+    for size in sizes:
+        clean(db)
+        seed(db, size)
+        try:
+            rows.append((f"legacy peak KiB ({size})", f"{peak_kib(legacy, db):.0f}"))
+            rows.append(
+                (f"streaming peak KiB ({size})", f"{peak_kib(streaming, db):.0f}")
+            )
+        finally:
+            clean(db)
+
+    report("Public project listing", rows)
@@ -0,0 +1,79 @@
+"""
+Maintainer login throughput with concurrent request threads, password
+hashes derived on the request thread (`workers` 0) against the process
+pool, and how long other requests handled meanwhile take.
+
+    python3 -m benchmarks.bench_login [logins] [threads]
+"""
+
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import report
+
+from core.mongo import registry
+from core.passwords import passwords
+from django.conf import settings
+from maintainer import entry
+
+EMAIL = "benchmark-login@githubsrm.tech"
+PASSWORD = "benchmark-password"
+
+
+def seed(db) -> None:
+    db.maintainer_credentials.delete_many({"email": EMAIL})
+    db.maintainer_credentials.insert_one(
+        {"email": EMAIL, "password": passwords.hash(PASSWORD), "reset": False}
+    )
+
+
+def other_requests(stop: threading.Event, latencies: list) -> None:
+    # Pure python work standing in for the requests sharing the worker
+    while not stop.is_set():
+        start = time.perf_counter()
+        sum(i * i for i in range(20000))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+def run(logins: int, threads: int):
+    stop, latencies = threading.Event(), []
+    background = threading.Thread(target=other_requests, args=(stop, latencies))
+    background.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(
+            lambda _: entry.check_hash(EMAIL, PASSWORD), range(logins)
+        ):
+            pass
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    background.join()
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0
+    return logins / elapsed, p95
+
+
+if __name__ == "__main__":
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    db = registry.db
+    workers = settings.PASSWORD_HASHING["workers"] or 2
+    rows = []
+
+    try:
+        for label, pool in (("request thread", 0), (f"pool of {workers}", workers)):
+            settings.PASSWORD_HASHING["workers"] = pool
+            seed(db)
+            # warm the pool up before timing
+            passwords.verify(PASSWORD, passwords.hash(PASSWORD))
+            throughput, p95 = run(logins, threads)
+            rows.append((f"{label} logins/s", f"{throughput:.1f}"))
+            rows.append((f"{label} other request p95 ms", f"{p95:.1f}"))
+    finally:
+        db.maintainer_credentials.delete_many({"email": EMAIL})
+
+    report(f"Maintainer login, {logins} logins on {threads} threads", rows)
@@ -0,0 +1,96 @@
+"""
+Maintainer login reads, the legacy credentials + password + maintainer
+lookups against the single `find_login` aggregation, timed from
+concurrent request threads. Password hashing is left out to isolate
+the database round trips.
+
+    python3 -m benchmarks.bench_login_queries [logins] [threads]
+"""
+
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import monitoring
+
+from . import CommandCounter, report
+
+counter = CommandCounter()
+monitoring.register(counter)
+
+from core.epochs import token_epochs
+from core.models import only
+from core.mongo import registry
+from maintainer import entry
+
+EMAIL = "benchmark-login@githubsrm.tech"
+PROJECTS = 5
+
+
+def seed(db) -> None:
+    db.maintainer_credentials.insert_one(
+        {"email": EMAIL, "password": "x" * 200, "reset": False}
+    )
+    db.maintainer.insert_many(
+        [
+            {
+                "email": EMAIL,
+                "name": "benchmark",
+                "project_id": f"BENCH{i}",
+                "is_admin_approved": True,
+                "description": "x" * 300,
+            }
+            for i in range(PROJECTS)
+        ]
+    )
+
+
+def clean(db) -> None:
+    db.maintainer_credentials.delete_many({"email": EMAIL})
+    db.maintainer.delete_many({"email": EMAIL})
+
+
+def legacy(db) -> None:
+    db.maintainer_credentials.find_one({"email": EMAIL}, only("email"))
+    db.maintainer_credentials.find_one({"email": EMAIL}, only("password"))
+    db[token_epochs.collection].find_one({"_id": EMAIL}, only("epoch"))
+    list(db.maintainer.find({"email": EMAIL}, only("email", "name", "project_id")))
+
+
+def one_query(db) -> None:
+    entry.find_login(EMAIL)
+
+
+def measure(run, db, logins: int, threads: int) -> tuple:
+    def timed(_):
+        start = time.perf_counter()
+        run(db)
+        return (time.perf_counter() - start) * 1000
+
+    counter.commands = 0
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(timed, range(logins)))
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    return counter.commands / logins, statistics.median(latencies), p95
+
+
+if __name__ == "__main__":
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    db = registry.db
+    clean(db)
+    seed(db)
+    rows = []
+
+    try:
+        for label, run in (("legacy", legacy), ("find_login", one_query)):
+            measure(run, db, threads, threads)
+            trips, p50, p95 = measure(run, db, logins, threads)
+            rows.append((f"{label} round trips", f"{trips:.1f}"))
+            rows.append((f"{label} p50 ms", f"{p50:.2f}"))
+            rows.append((f"{label} p95 ms", f"{p95:.2f}"))
+    finally:
+        clean(db)
+
+    report(f"Maintainer login reads, {logins} logins on {threads} threads", rows)
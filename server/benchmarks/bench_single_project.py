@@ -0,0 +1,122 @@
+"""
+Maintainer single project view, the legacy count + fetch aggregations
+against the single $facet pipeline, on a project with thousands of
+approved contributors.
+"""
+
+import sys
+import time
+
+from pymongo import monitoring
+
+from . import CommandCounter, report
+
+counter = CommandCounter()
+monitoring.register(counter)
+
+from core.mongo import registry
+from maintainer.utils import ITEMS_PER_PAGE, get_pagnation_aggregate
+
+PROJECT_ID = "BENCHPRJ"
+RUNS = 50
+
+
+def legacy_aggregates(project_id, maintainer_page, contributor_page):
+    def lookup(collection, match, tail):
+        return {
+            "$lookup": {
+                "from": collection,
+                "pipeline": [{"$match": match}, *tail],
+                "as": collection,
+            }
+        }
+
+    maintainer = {"is_admin_approved": True, "project_id": project_id}
+    contributor = {"is_admin_approved": True, "interested_project": project_id}
+    count = [{"$count": "count"}]
+
+    def page(number):
+        return [
+            {"$skip": (int(number) - 1) * ITEMS_PER_PAGE},
+            {"$limit": ITEMS_PER_PAGE},
+        ]
+
+    return (
+        [
+            {"$match": {"_id": project_id}},
+            lookup("maintainer", maintainer, count),
+            lookup("contributor", contributor, count),
+        ],
+        [
+            {"$match": {"_id": project_id}},
+            lookup("maintainer", maintainer, page(maintainer_page)),
+            lookup("contributor", contributor, page(contributor_page)),
+        ],
+    )
+
+
+def seed(db, contributors: int) -> None:
+    db.project.insert_one({"_id": PROJECT_ID, "project_name": "benchmark"})
+    db.maintainer.insert_many(
+        [
+            {"project_id": PROJECT_ID, "is_admin_approved": True, "name": f"m{i}"}
+            for i in range(5)
+        ]
+    )
+    db.contributor.insert_many(
+        [
+            {
+                "interested_project": PROJECT_ID,
+                "is_admin_approved": True,
+                "name": f"c{i}",
+                "poa": "x" * 200,
+            }
+            for i in range(contributors)
+        ]
+    )
+
+
+def clean(db) -> None:
+    db.project.delete_one({"_id": PROJECT_ID})
+    db.maintainer.delete_many({"project_id": PROJECT_ID})
+    db.contributor.delete_many({"interested_project": PROJECT_ID})
+
+
+def measure(run) -> tuple:
+    counter.commands = 0
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        run()
+    elapsed = time.perf_counter() - start
+    return counter.commands / RUNS, elapsed * 1000 / RUNS
+
+
+if __name__ == "__main__":
+    contributors = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    db = registry.db
+    clean(db)
+    seed(db, contributors)
+    last_page = contributors // ITEMS_PER_PAGE
+
+    try:
+        counts, pages = legacy_aggregates(PROJECT_ID, 1, last_page)
+        legacy_trips, legacy_ms = measure(
+            lambda: (
+                list(db.project.aggregate(counts)),
+                list(db.project.aggregate(pages)),
+            )
+        )
+        facet = get_pagnation_aggregate(PROJECT_ID, 1, last_page)
+        facet_trips, facet_ms = measure(lambda: list(db.project.aggregate(facet)))
+    finally:
+        clean(db)
+
+    report(
+        f"Single project view, {contributors} contributors, last page",
+        [
+            ("legacy round trips", f"{legacy_trips:.1f}"),
+            ("legacy ms", f"{legacy_ms:.2f}"),
+            ("$facet round trips", f"{facet_trips:.1f}"),
+            ("$facet ms", f"{facet_ms:.2f}"),
+        ],
+    )
@@ -0,0 +1,72 @@
+"""
+PostThrottle overhead per request, the legacy per-process cache
+throttle against the in-process and MongoDB sliding window limiters,
+and the GET fast path.
+
+    python3 -m benchmarks.bench_throttle [requests]
+"""
+
+import sys
+import time
+
+from pymongo import monitoring
+
+from . import CommandCounter, report
+
+counter = CommandCounter()
+monitoring.register(counter)
+
+from core.mongo import registry
+from core.throttle import (
+    LocalRateLimiter,
+    MongoRateLimiter,
+    PostThrottle,
+    rate_limiter,
+)
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from rest_framework import throttling
+
+factory = RequestFactory()
+
+
+class LegacyThrottle(throttling.AnonRateThrottle):
+    scope = "post_throttle"
+
+
+def request(method: str, client: int):
+    request = factory.generic(method, "/api/contact-us", REMOTE_ADDR=f"10.0.0.{client}")
+    request.user = AnonymousUser()
+    return request
+
+
+def measure(throttle_class, method: str, requests: int) -> tuple:
+    batch = [request(method, i % 250) for i in range(requests)]
+    counter.commands = 0
+    start = time.perf_counter()
+    for item in batch:
+        throttle_class().allow_request(item, None)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1e6 / requests, counter.commands / requests
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rows = []
+
+    runs = [
+        ("GET fast path", PostThrottle, "GET", None),
+        ("legacy per-process cache", LegacyThrottle, "POST", None),
+        ("local sliding window", PostThrottle, "POST", LocalRateLimiter()),
+        ("mongo sliding window", PostThrottle, "POST", MongoRateLimiter()),
+    ]
+    try:
+        for label, throttle_class, method, backend in runs:
+            rate_limiter._backend = backend
+            us, trips = measure(throttle_class, method, requests)
+            rows.append((f"{label} us/request", f"{us:.1f}"))
+            rows.append((f"{label} round trips", f"{trips:.1f}"))
+    finally:
+        registry.db.rate_limits.delete_many({"_id": {"$regex": "^throttle_"}})
+
+    report(f"PostThrottle overhead, {requests} requests", rows)
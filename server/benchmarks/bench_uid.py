@@ -0,0 +1,89 @@
+"""
+Round trips spent inserting an alpha maintainer submission, the legacy
+lookup based `get_uid` followed by an insert against
+`IdAllocator.insert`, which leaves uniqueness to the `_id` index and
+retries on collisions. A small ID space is used to time the retry path.
+"""
+
+import random
+import string
+import time
+
+from pymongo import monitoring
+
+from . import CommandCounter, report
+
+counter = CommandCounter()
+monitoring.register(counter)
+
+from core.ids import IdAllocator, allocator
+from core.mongo import registry
+
+SUBMISSIONS = 200
+COLLECTION = "bench_uid"
+
+
+def legacy_get_uid(db) -> str:
+    gen_id = random.choices(string.ascii_uppercase + string.digits, k=8)
+
+    if (
+        db.project.find_one({"_id": gen_id})
+        or db.contributor.find_one({"_id": gen_id})
+        or db.maintainer.find_one({"_id": gen_id})
+    ):
+        return legacy_get_uid(db)
+
+    return "".join(gen_id)
+
+
+def legacy_insert(db, doc: dict) -> str:
+    _id = legacy_get_uid(db)
+    db[COLLECTION].insert_one({**doc, **{"_id": _id}})
+    return _id
+
+
+def measure(insert) -> tuple:
+    counter.commands = 0
+    start = time.perf_counter()
+    for _ in range(SUBMISSIONS):
+        # enter_maintainer inserts a project and a maintainer
+        insert({"kind": "project"})
+        insert({"kind": "maintainer"})
+    elapsed = time.perf_counter() - start
+    return counter.commands / SUBMISSIONS, elapsed * 1000 / SUBMISSIONS
+
+
+if __name__ == "__main__":
+    db = registry.db
+    db.command("ping")
+    db[COLLECTION].drop()
+
+    try:
+        legacy_trips, legacy_ms = measure(lambda doc: legacy_insert(db, doc))
+        local_trips, local_ms = measure(
+            lambda doc: allocator.insert(db[COLLECTION], doc)
+        )
+
+        # 4 digit IDs with half of them taken, about one collision per insert
+        db[COLLECTION].drop()
+        crowded = IdAllocator(length=4, alphabet=string.digits, max_retries=20)
+        db[COLLECTION].insert_many(
+            [{"_id": f"{i:04d}"} for i in random.sample(range(10000), 5000)]
+        )
+        crowded_trips, crowded_ms = measure(
+            lambda doc: crowded.insert(db[COLLECTION], doc)
+        )
+    finally:
+        db[COLLECTION].drop()
+
+    report(
+        f"Inserts per submission ({SUBMISSIONS} submissions)",
+        [
+            ("legacy get_uid + insert round trips", f"{legacy_trips:.1f}"),
+            ("legacy get_uid + insert ms", f"{legacy_ms:.3f}"),
+            ("allocator.insert round trips", f"{local_trips:.1f}"),
+            ("allocator.insert ms", f"{local_ms:.3f}"),
+            ("allocator.insert round trips, crowded ids", f"{crowded_trips:.1f}"),
+            ("allocator.insert ms, crowded ids", f"{crowded_ms:.3f}"),
+        ],
+    )
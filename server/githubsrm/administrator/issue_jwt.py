@@ -1,17 +1,65 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import jwt
+from django.conf import settings
 from dotenv import load_dotenv
 from .errors import AuthenticationErrors
 
 load_dotenv()
 
 
+class VerifiedTokenCache:
+    def __init__(self, max_entries: int = 1024) -> None:
+        """
+        Bounded LRU of verified tokens keyed by their digest, entries are
+        dropped once the token expires so expiry is still enforced.
+
+        Args:
+            max_entries (int): tokens kept before evicting the oldest
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._claims: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        digest = self._digest(token)
+        with self._lock:
+            claims = self._claims.get(digest)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._claims[digest]
+                return None
+            self._claims.move_to_end(digest)
+            return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        digest = self._digest(token)
+        with self._lock:
+            self._claims[digest] = claims
+            self._claims.move_to_end(digest)
+            while len(self._claims) > self.max_entries:
+                self._claims.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._claims.clear()
+
+
 class IssueKey:
     def __init__(self):
         self.signature = os.getenv("SIGNATURE")
+        self.verified = VerifiedTokenCache(max_entries=settings.JWT_CACHE_SIZE)
 
     def issue_key(
         self,
@@ -50,8 +98,21 @@ class IssueKey:
 
         return jwt.encode(payload=payload, key=self.signature)
 
+    def _decode(self, token: str) -> Dict[str, Any]:
+        claims = self.verified.get(token)
+        if claims is None:
+            claims = jwt.decode(
+                jwt=token,
+                key=self.signature,
+                options={"require": ["exp"], "verify_signature": True},
+                algorithms=["HS256"],
+            )
+            self.verified.put(token, claims)
+        return dict(claims)
+
     def verify_key(self, key: str) -> bool:
-        """Verify JwT with the original signature
+        """Verify JwT with the original signature, tokens verified before
+        by this worker are served from the verified token cache.
 
         Args:
             key (str): jwt key
@@ -63,57 +124,55 @@ class IssueKey:
         try:
             if isinstance(key, (tuple, list)):
                 _, token = key
-                decoded = jwt.decode(
-                    jwt=token,
-                    key=self.signature,
-                    options={"require": ["exp"], "verify_signature": True},
-                    algorithms=["HS256"],
-                )
-                return decoded
+                return self._decode(token)
 
             elif isinstance(key, dict):
                 access_token, _ = key["access_token"], key["refresh_token"]
-                decoded = jwt.decode(
-                    jwt=access_token,
-                    key=self.signature,
-                    options={"require": ["exp"], "verify_signature": True},
-                    algorithms=["HS256"],
-                )
-                return decoded
+                return self._decode(access_token)
 
             else:
-                decoded = jwt.decode(
-                    jwt=key,
-                    key=self.signature,
-                    options={"require": ["exp"], "verify_signature": True},
-                    algorithms=["HS256"],
-                )
-                return decoded
+                return self._decode(key)
         except Exception:
             # Fix status code here
             raise AuthenticationErrors(
                 status_code=400, detail={"error": "Invalid key!"}
             )
 
-    def verify_role(self, key: str, path: str) -> bool:
+    def verify_request(self, request, token: str) -> Dict[str, Any]:
+        """Verified claims of the request token, decoded at most once per
+        request and shared by the middlewares and views.
+
+        Args:
+            request: django request
+            token (str): bearer token of the request
+
+        Returns:
+            Dict[str, Any]: claims
+        """
+        decoded = getattr(request, "decoded", None)
+        if decoded is None:
+            decoded = self.verify_key(key=token)
+            request.decoded = decoded
+        return decoded
+
+    def verify_role(
+        self, key: str, path: str, decoded: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """Verify user permissions
 
         Args:
             key (str): jwt key passed
             path (str): verify if jwt is allowed on this path
+            decoded (Optional[Dict[str, Any]]): claims already verified
 
         Returns:
             bool: is allowed
         """
-        try:
-            decoded = jwt.decode(
-                jwt=key,
-                key=self.signature,
-                options={"verify_signature": True},
-                algorithms=["HS256"],
-            )
-        except Exception:
-            raise AuthenticationErrors(detail={"error": "Invalid key"})
+        if decoded is None:
+            try:
+                decoded = self._decode(key)
+            except Exception:
+                raise AuthenticationErrors(detail={"error": "Invalid key"})
         if "admin" in path:
             return decoded.get("admin") == True
         if "maintainer" in path:
@@ -137,21 +196,28 @@ class IssueKey:
         return self.issue_key(payload=payload)
 
     def refresh_to_access(
-        self, refresh_token: str, payload: Dict[str, Any], expiry: int = 1
+        self,
+        refresh_token: str,
+        payload: Dict[str, Any],
+        expiry: int = 1,
+        decoded: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Get new access token from refresh token
 
         Args:
             refresh_token (str): refresh token provided with access token
+            decoded (Optional[Dict[str, Any]]): claims already verified
 
         Returns:
             str: new access tokens
         """
 
-        try:
-            token = self.verify_key(key=refresh_token)
-        except AuthenticationErrors:
-            return
+        token = decoded
+        if token is None:
+            try:
+                token = self.verify_key(key=refresh_token)
+            except AuthenticationErrors:
+                return
         if token.get("refresh"):
             payload["exp"] = (datetime.utcnow() + timedelta(hours=expiry)).timestamp()
             return self.issue_key(payload=payload, get_refresh_token=True)
@@ -1,14 +1,13 @@
-import binascii
-import hashlib
-import os
 import secrets
 from datetime import datetime
-from threading import Thread
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from core.aws import service
+from core.aws import notifier, service
+from core.cache import project_listing
+from core.epochs import token_epochs
 from core.errorfactory import ProjectErrors
-from core.models import BaseModel
+from core.models import BaseModel, only
+from core.passwords import passwords
 from pymongo import ReturnDocument
 
 from .errors import (
@@ -21,6 +20,7 @@ from .errors import (
     MaintainerNotFoundError,
     ProjectNotFoundError,
 )
+from .webhooks import webhook_tokens
 
 
 class AdminEntry(BaseModel):
@@ -31,29 +31,25 @@ class AdminEntry(BaseModel):
         """Checks for available webHook Token
 
         Args:
-            token (Tuple): token sent as header
+            token (Tuple): token sent as header, looked up in the cached
+                token set, see administrator.webhooks
         """
         token_type, token = token
         if token_type != "Bearer":
             raise InvalidWebhookError(detail={"error": "Invalid token type"})
-        webHook = self.db.webHook.find_one({"token": token})
-        if webHook:
+        if token in webhook_tokens:
             return True
         raise InvalidWebhookError(detail={"error": "Invalid token"})
 
     def hash_password(self, password: str) -> str:
-        """Hashes password using salted password hashing (SHA512 & PBKDF_HMAC2)
+        """Hashes password with the configured algorithm, see core.passwords
         Args:
             password : Password to be hashed
 
         Returns:
             str : Hashed password
         """
-        salt = hashlib.sha256(os.urandom(60)).hexdigest().encode("ascii")
-        pwd_hash = hashlib.pbkdf2_hmac("sha512", password.encode("utf-8"), salt, 100000)
-        pwd_hash = binascii.hexlify(pwd_hash)
-        final_hashed_pwd = (salt + pwd_hash).decode("ascii")
-        return final_hashed_pwd
+        return passwords.hash(password)
 
     def insert_admin(self, doc: Dict[str, str]) -> bool:
         """Insert admin details.
@@ -65,7 +61,7 @@ class AdminEntry(BaseModel):
             bool
 
         """
-        if self.db.admins.find_one({"email": doc.get("email")}):
+        if self.db.admins.find_one({"email": doc.get("email")}, only("email")):
             raise ExistingAdminError()
         password = doc.pop("password")
         password_hash = self.hash_password(password)
@@ -82,15 +78,13 @@ class AdminEntry(BaseModel):
         Returns:
             bool
         """
-        if value := self.db.admins.find_one({"email": email}):
-            dbpwd = value["password"]
-            salt = dbpwd[:64]
-            dbpwd = dbpwd[64:]
-            pwd_hash = hashlib.pbkdf2_hmac(
-                "sha512", password.encode("utf-8"), salt.encode("ascii"), 100000
-            )
-            pwd_hash = binascii.hexlify(pwd_hash).decode("ascii")
-            if pwd_hash == dbpwd:
+        if value := self.db.admins.find_one({"email": email}, only("password")):
+            if passwords.verify(password, value["password"]):
+                if passwords.needs_rehash(value["password"]):
+                    self.db.admins.update_one(
+                        {"email": email, "password": value["password"]},
+                        {"$set": {"password": passwords.hash(password)}},
+                    )
                 return value
         raise InvalidAdminCredentialsError()
 
@@ -118,12 +112,14 @@ class AdminEntry(BaseModel):
                     ),
                 }
             },
+            projection=only("_id", "name", "email", "is_admin_approved"),
             return_document=ReturnDocument.BEFORE,
         )
 
         if maintainer:
             if maintainer.get("is_admin_approved"):
                 raise MaintainerApprovedError()
+            token_epochs.bump(maintainer_email)
             project = self._update_project(
                 project_id=project_id, maintainer_id=maintainer_id
             )
@@ -144,6 +140,7 @@ class AdminEntry(BaseModel):
         project = self.db.project.find_one_and_update(
             {"_id": project_id},
             update={"$addToSet": {"maintainer_id": maintainer_id}},
+            projection=only("_id", "project_name", "maintainer_id"),
             return_document=ReturnDocument.AFTER,
         )
 
@@ -160,7 +157,9 @@ class AdminEntry(BaseModel):
             bool: [description]
         """
 
-        credentials = self.db.maintainer_credentials.find_one({"email": email})
+        credentials = self.db.maintainer_credentials.find_one(
+            {"email": email}, only("password")
+        )
 
         if credentials:
             return credentials.get("password")
@@ -193,7 +192,9 @@ class AdminEntry(BaseModel):
         """
         val = []
         if maintainers := list(
-            self.db.maintainer.find(filter={"_id": {"$in": maintainer_ids}})
+            self.db.maintainer.find(
+                filter={"_id": {"$in": maintainer_ids}}, projection=only("github_id")
+            )
         ):
             for maintainer in maintainers:
                 val.append(maintainer["github_id"])
@@ -211,7 +212,16 @@ class AdminEntry(BaseModel):
         Returns:
             bool
         """
-        project_doc = self.db.project.find_one(filter={"_id": identifier})
+        project_doc = self.db.project.find_one(
+            filter={"_id": identifier},
+            projection=only(
+                "maintainer_id",
+                "project_name",
+                "description",
+                "private",
+                "is_admin_approved",
+            ),
+        )
         if project_doc:
             maintainer_github_id = self.get_maintainer_github_id(
                 project_doc["maintainer_id"]
@@ -237,21 +247,21 @@ class AdminEntry(BaseModel):
                             "project_url": response["repo-link"],
                         }
                     },
+                    projection=only("_id", "project_name", "maintainer_id"),
                     return_document=ReturnDocument.BEFORE,
                 )
+                project_listing.invalidate()
                 project = {**project, **{"project_url": response["repo-link"]}}
                 return project
             else:
                 if response["success"] == False:
-                    Thread(
-                        target=service.sns,
-                        kwargs={
-                            "payload": {
-                                "message": f"Lambda failing on Project Creation\nError:\n{response}",
-                                "subject": "[LAMBDA-ERROR] Lambda failed: Lambda githubcommunitysrm-v1 return False",
-                            }
+                    notifier.submit(
+                        service.sns,
+                        payload={
+                            "message": f"Lambda failing on Project Creation\nError:\n{response}",
+                            "subject": "[LAMBDA-ERROR] Lambda failed: Lambda githubcommunitysrm-v1 return False",
                         },
-                    ).start()
+                    )
                 raise ProjectErrors(detail={"error": response})
         raise ProjectNotFoundError()
 
@@ -268,6 +278,7 @@ class AdminEntry(BaseModel):
         contributor = self.db.contributor.find_one_and_update(
             {"_id": contributor_id, "interested_project": project_id},
             update={"$set": {"is_admin_approved": True}},
+            projection=only("name", "email", "interested_project", "is_admin_approved"),
             return_document=ReturnDocument.BEFORE,
         )
         if contributor:
@@ -278,7 +289,8 @@ class AdminEntry(BaseModel):
                 )
 
             project = self.db.project.find_one(
-                {"_id": contributor["interested_project"]}
+                {"_id": contributor["interested_project"]},
+                only("project_name", "maintainer_id"),
             )
             return contributor, project
 
@@ -293,9 +305,13 @@ class AdminEntry(BaseModel):
         Returns:
             bool
         """
-        self.db.maintainer.find_one_and_update(
-            {"_id": identifier}, update={"$set": {"is_admin_approved": False}}
+        maintainer = self.db.maintainer.find_one_and_update(
+            {"_id": identifier},
+            update={"$set": {"is_admin_approved": False}},
+            projection=only("email", "is_admin_approved"),
         )
+        if maintainer and maintainer.get("is_admin_approved"):
+            token_epochs.bump(maintainer["email"])
 
         self.db.project.find_one_and_update(
             {"_id": project_id}, update={"$pull": {"maintainer_id": identifier}}
@@ -323,10 +339,12 @@ class AdminEntry(BaseModel):
                     "year": "",
                 }
             },
+            projection=only("_id"),
             return_document=ReturnDocument.BEFORE,
         )
 
         if project:
+            project_listing.invalidate()
             return True
 
         return False
@@ -358,7 +376,8 @@ class AdminEntry(BaseModel):
         """
 
         maintainer = self.db.maintainer.find_one_and_delete(
-            {"_id": identifier, "is_admin_approved": False}
+            {"_id": identifier, "is_admin_approved": False},
+            projection=only("name", "email", "project_id"),
         )
 
         if not maintainer:
@@ -366,10 +385,13 @@ class AdminEntry(BaseModel):
 
         project_id = maintainer["project_id"]
 
-        project_name = self.db.project.find_one({"_id": project_id})["project_name"]
+        project_name = self.db.project.find_one(
+            {"_id": project_id}, only("project_name")
+        )["project_name"]
 
         project = self.db.project.find_one_and_delete(
-            {"_id": project_id, "maintainer_id": {"$exists": False}}
+            {"_id": project_id, "maintainer_id": {"$exists": False}},
+            projection=only("_id"),
         )
 
         maintainer["project_name"] = project_name
@@ -394,35 +416,41 @@ class AdminEntry(BaseModel):
                 "_id": identifier,
                 "is_maintainer_approved": False,
                 "is_admin_approved": False,
-            }
+            },
+            projection=only("name", "email", "interested_project"),
         )
 
         if contributor:
             project_name = self.db.project.find_one(
-                {"_id": contributor["interested_project"]}
+                {"_id": contributor["interested_project"]}, only("project_name")
             )["project_name"]
             contributor["project_name"] = project_name
             return contributor
         else:
             return False
 
-    def get_all_maintainer_emails(self, project: Dict[str, Any]) -> Dict[str, Any]:
-        """Get all maintainer emails from projects
+    def get_maintainer_recipients(
+        self, project: Dict[str, Any]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Name and email of every maintainer of project, for bulk emails
 
         Args:
             project (Dict[str, Any]): project document
 
         Returns:
-            Dict[str, Any]: list of all maintainer emails
+            Optional[List[Dict[str, Any]]]: one dict per maintainer
         """
         try:
             maintainer_ids = project["maintainer_id"]
-            maintainers = list(
-                self.db.maintainer.find({"_id": {"$in": maintainer_ids}})
+            maintainers = self.db.maintainer.find(
+                {"_id": {"$in": maintainer_ids}}, only("name", "email")
             )
+            return [
+                {"name": maintainer["name"], "email": maintainer["email"]}
+                for maintainer in maintainers
+            ]
         except Exception:
             return
-        return dict(email=[maintainer["email"] for maintainer in maintainers])
 
     def get_maintainer_email(self, identifier: str) -> str:
         """Get maintainer email from identifier
@@ -434,7 +462,7 @@ class AdminEntry(BaseModel):
             str: email
         """
 
-        maintainer = self.db.maintainer.find_one({"_id": identifier})
+        maintainer = self.db.maintainer.find_one({"_id": identifier}, only("email"))
         if maintainer:
             return maintainer["email"]
 
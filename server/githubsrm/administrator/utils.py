@@ -1,9 +1,12 @@
 from math import ceil
-from threading import Thread
 from typing import Dict
 
 from apis import open_entry
-from core.aws import service
+from core.aws import notifier, service
+from core.cache import LocalLRUBackend
+from core.epochs import token_epochs
+from core.utils import keyset_page
+from django.conf import settings
 from django.http import response
 from django.http.response import JsonResponse
 from rest_framework import status
@@ -11,10 +14,14 @@ from rest_framework import status
 from administrator import entry, jwt_keys
 from .errors import InvalidRefreshTokenError, InvalidUserError
 from maintainer import entry as maintainer_entry
-from .models import AdminEntry
 
 ITEMS_PER_PAGE = 10
 
+# Approved project ids of refreshing maintainers, keyed by email and epoch
+refresh_projects = LocalLRUBackend(
+    max_entries=1024, timeout=settings.REFRESH_PROJECTS_CACHE_TIMEOUT
+)
+
 
 def update_token(refresh_token):
     if not refresh_token:
@@ -28,16 +35,29 @@ def update_token(refresh_token):
         if admin:
             payload = {"user": email, "admin": True}
             key = jwt_keys.refresh_to_access(
-                refresh_token=refresh_token, payload=payload
+                refresh_token=refresh_token, payload=payload, decoded=user
             )
             if key:
                 return key
             raise InvalidRefreshTokenError()
 
-        project_ids = maintainer_entry.projects_from_email(email=email)
+        # Read before the projects so a concurrent bump revokes this token,
+        # a bump also moves the cached projects to a new key
+        epoch = token_epochs.current(email)
+        project_ids = refresh_projects.get(f"{email}:{epoch}")
+        if project_ids is None:
+            project_ids = maintainer_entry.projects_from_email(email=email)
+            refresh_projects.set(f"{email}:{epoch}", project_ids)
         if project_ids:
-            payload = {"email": email, "name": name, "project_id": project_ids}
-            key = jwt_keys.refresh_to_access(refresh_token, payload=payload)
+            payload = {
+                "email": email,
+                "name": name,
+                "project_id": project_ids,
+                "epoch": epoch,
+            }
+            key = jwt_keys.refresh_to_access(
+                refresh_token, payload=payload, decoded=user
+            )
             if key:
                 return key
             raise InvalidRefreshTokenError()
@@ -88,6 +108,32 @@ def project_pagination(request, **kwargs):
         )
 
 
+def project_cursor_pagination(request, match: Dict = None, **kwargs):
+    """
+    Send projects after the cursor passed in the `after` query param,
+    an empty cursor starts from the first page.
+
+    Args:
+        request
+        match (Dict): filter for the listing
+
+    Returns:
+        response.JsonResponse
+    """
+    try:
+        page = keyset_page(
+            open_entry.db.project,
+            match=match or {},
+            after=request.GET.get("after"),
+            limit=ITEMS_PER_PAGE,
+        )
+    except ValueError:
+        return response.JsonResponse(
+            {"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST
+        )
+    return response.JsonResponse(page, status=status.HTTP_200_OK)
+
+
 def project_single_project(request, **kwargs):
     """
     Send single project but detailed
@@ -98,7 +144,6 @@ def project_single_project(request, **kwargs):
     Returns:
         response.JsonResponse
     """
-    entry = AdminEntry()
     try:
         project = entry.db.project.find_one({"_id": request.GET["projectId"]})
         if not project:
@@ -287,19 +332,17 @@ def beta_maintainer_support(
                 "email": maintainer["email"],
             },
         ):
-            Thread(
-                target=service.wrapper_email,
-                kwargs={
-                    "role": "new_maintainer_notification",
-                    "data": {
-                        "name": "Maintainer",
-                        "email": alpha_email,
-                        "project_name": project["project_name"],
-                        "beta_name": maintainer["name"],
-                        "beta_email": maintainer["email"],
-                    },
+            notifier.submit(
+                service.wrapper_email,
+                role="new_maintainer_notification",
+                data={
+                    "name": "Maintainer",
+                    "email": alpha_email,
+                    "project_name": project["project_name"],
+                    "beta_name": maintainer["name"],
+                    "beta_email": maintainer["email"],
                 },
-            ).start()
+            )
 
             return {
                 "message": {"success": "Approved existing maintainer"},
@@ -325,19 +368,17 @@ def beta_maintainer_support(
                 "email": maintainer["email"],
             },
         ):
-            Thread(
-                target=service.wrapper_email,
-                kwargs={
-                    "role": "new_maintainer_notification",
-                    "data": {
-                        "name": "Maintainer",
-                        "email": alpha_email,
-                        "project_name": project["project_name"],
-                        "beta_name": maintainer["name"],
-                        "beta_email": maintainer["email"],
-                    },
+            notifier.submit(
+                service.wrapper_email,
+                role="new_maintainer_notification",
+                data={
+                    "name": "Maintainer",
+                    "email": alpha_email,
+                    "project_name": project["project_name"],
+                    "beta_name": maintainer["name"],
+                    "beta_email": maintainer["email"],
                 },
-            ).start()
+            )
 
             return {"message": {"success": "Approved new maintainer"}, "status": 200}
         else:
@@ -1,6 +1,4 @@
-from threading import Thread
-
-from core.aws import service
+from core.aws import notifier, service
 from core.settings import PostThrottle
 from core.utils import api_view
 from django.http.response import JsonResponse
@@ -16,6 +14,7 @@ from .utils import (
     alpha_maintainer_support,
     beta_maintainer_support,
     get_token,
+    project_cursor_pagination,
     project_pagination,
     project_single_project,
     update_token,
@@ -71,22 +70,20 @@ class ProjectsAdmin(APIView):
             project = entry.approve_project(
                 identifier=validate.get("project_id"), year=validate.get("year")
             )
-            email_document = entry.get_all_maintainer_emails(project=project)
-            if email_document:
-                email_status = service.wrapper_email(
+            recipients = entry.get_maintainer_recipients(project=project)
+            if recipients:
+                accepted = service.bulk_email(
                     role="project_approval",
                     data={
-                        **{
-                            "name": "Maintainer(s)",
-                            "project_name": project["project_name"],
-                            "project_url": project["project_url"],
-                            "project_id": project["_id"],
-                        },
-                        **email_document,
+                        "project_name": project["project_name"],
+                        "project_url": project["project_url"],
+                        "project_id": project["_id"],
                     },
-                    send_all=True,
+                    recipients=recipients,
                 )
-                if not email_status:
+                # Failed recipients are retried and reported in the
+                # background, only undo the approval when nobody is emailed
+                if not accepted:
                     entry.reset_status_project(project=project)
                     return JsonResponse(data={}, status=500)
 
@@ -97,15 +94,13 @@ class ProjectsAdmin(APIView):
             else:
                 entry.reset_status_project(project=project)
                 blame = request.decoded.get("user")
-                Thread(
-                    target=service.sns,
-                    kwargs={
-                        "payload": {
-                            "message": "Trying to approve project without approving maintainers",
-                            "subject": f"[ADMIN-ERROR] This person messed up -> {blame}",
-                        }
+                notifier.submit(
+                    service.sns,
+                    payload={
+                        "message": "Trying to approve project without approving maintainers",
+                        "subject": f"[ADMIN-ERROR] This person messed up -> {blame}",
                     },
-                ).start()
+                )
 
                 return JsonResponse(
                     data={"error": "Approve maintainer before approving project"},
@@ -118,21 +113,16 @@ class ProjectsAdmin(APIView):
                 contributor_id=validate.get("contributor_id"),
             )
 
-            emails = entry.get_all_maintainer_emails(project=project)
-            Thread(
-                target=service.wrapper_email,
-                kwargs={
-                    "role": "contributor_application_to_maintainer",
-                    "send_all": True,
-                    "data": {
-                        "name": "Maintainer(s)",
-                        "project_name": project["project_name"],
-                        "contributor_name": contributor["name"],
-                        "contributor_email": contributor["email"],
-                        "email": emails["email"],
-                    },
+            notifier.submit(
+                service.bulk_email,
+                role="contributor_application_to_maintainer",
+                data={
+                    "project_name": project["project_name"],
+                    "contributor_name": contributor["name"],
+                    "contributor_email": contributor["email"],
                 },
-            ).start()
+                recipients=entry.get_maintainer_recipients(project=project) or [],
+            )
 
             return JsonResponse(data={"admin_approved": True}, status=200)
 
@@ -141,7 +131,10 @@ class ProjectsAdmin(APIView):
         single_project = ["projectId", "maintainer", "contributor"]
         request_query_keys = list(request.GET.keys())
 
-        if len(set(pagination) & set(request_query_keys)) == 1:
+        if "after" in request_query_keys:
+            return project_cursor_pagination(request, **kwargs)
+
+        elif len(set(pagination) & set(request_query_keys)) == 1:
             return project_pagination(request, **kwargs)
 
         elif len(set(single_project) & set(request_query_keys)) == 3:
@@ -163,27 +156,23 @@ class ProjectsAdmin(APIView):
 
         key = request.decoded
 
-        Thread(
-            target=service.sns,
-            kwargs={
-                "payload": {
-                    "message": f"Contributor -> {request.data.get('contributor_id')} removed by -> {key.get('user')}",
-                    "subject": "[CONTRIBUTOR-REMOVE]",
-                }
+        notifier.submit(
+            service.sns,
+            payload={
+                "message": f"Contributor -> {request.data.get('contributor_id')} removed by -> {key.get('user')}",
+                "subject": "[CONTRIBUTOR-REMOVE]",
             },
-        ).start()
-
-        Thread(
-            target=service.wrapper_email,
-            kwargs={
-                "role": "admin_contributor_rejection",
-                "data": {
-                    "name": status["name"],
-                    "email": status["email"],
-                    "project_name": status["project_name"],
-                },
+        )
+
+        notifier.submit(
+            service.wrapper_email,
+            role="admin_contributor_rejection",
+            data={
+                "name": status["name"],
+                "email": status["email"],
+                "project_name": status["project_name"],
             },
-        ).start()
+        )
 
         return JsonResponse(
             data={"removed": str(request.data.get("contributor_id"))}, status=200
@@ -192,27 +181,23 @@ class ProjectsAdmin(APIView):
     @staticmethod
     def _remove_maintainer(request, status) -> JsonResponse:
         key = request.decoded
-        Thread(
-            target=service.sns,
-            kwargs={
-                "payload": {
-                    "message": f"Maintainer -> {request.data.get('maintainer_id')} removed by -> {key.get('user')}",
-                    "subject": "[MAINTAINER-REMOVAL]",
-                }
+        notifier.submit(
+            service.sns,
+            payload={
+                "message": f"Maintainer -> {request.data.get('maintainer_id')} removed by -> {key.get('user')}",
+                "subject": "[MAINTAINER-REMOVAL]",
             },
-        ).start()
-
-        Thread(
-            target=service.wrapper_email,
-            kwargs={
-                "role": "maintainer_application_rejection",
-                "data": {
-                    "name": status["name"],
-                    "email": status["email"],
-                    "project_name": status["project_name"],
-                },
+        )
+
+        notifier.submit(
+            service.wrapper_email,
+            role="maintainer_application_rejection",
+            data={
+                "name": status["name"],
+                "email": status["email"],
+                "project_name": status["project_name"],
             },
-        ).start()
+        )
 
         return JsonResponse(
             data={"removed": str(request.data.get("maintainer_id"))}, status=200
@@ -221,32 +206,28 @@ class ProjectsAdmin(APIView):
     @staticmethod
     def _error_maintainer(request) -> JsonResponse:
         key = request.decoded
-        Thread(
-            target=service.sns,
-            kwargs={
-                "payload": {
-                    "message": f"This admin messed up -> {key.get('user')} \
+        notifier.submit(
+            service.sns,
+            payload={
+                "message": f"This admin messed up -> {key.get('user')} \
                 trying to remove admin approved maintainer({request.data.get('maintainer_id')})",
-                    "subject": "[WARNING-ADMIN-MESSED-UP]",
-                }
+                "subject": "[WARNING-ADMIN-MESSED-UP]",
             },
-        ).start()
+        )
 
         return JsonResponse(data={"error": "Invalid request"}, status=400)
 
     @staticmethod
     def _error_contributor(request) -> JsonResponse:
         key = request.decoded
-        Thread(
-            target=service.sns,
-            kwargs={
-                "payload": {
-                    "message": f"Tring to remove maintainer / admin or the contributor id is wrong\
+        notifier.submit(
+            service.sns,
+            payload={
+                "message": f"Tring to remove maintainer / admin or the contributor id is wrong\
                      approved contributor ({request.data.get('contributor_id')}), {key.get('user')} messed up.",
-                    "subject": "[WARNING-ADMIN-MESSED-UP]",
-                }
+                "subject": "[WARNING-ADMIN-MESSED-UP]",
             },
-        ).start()
+        )
 
         return JsonResponse(data={"error": "invalid request"}, status=400)
 
@@ -299,6 +280,11 @@ def admin_login(request) -> JsonResponse:
 
 @api_view(["GET"])
 def admin_accepted(request) -> JsonResponse:
+    if "after" in request.GET:
+        return project_cursor_pagination(
+            request=request, match={"is_admin_approved": True}
+        )
+
     if "page" not in request.GET:
         return JsonResponse({"error": "Invalid query paramerts"}, status=400)
 
@@ -0,0 +1,98 @@
+"""
+In-memory set of webhook tokens allowed to register admins. Tokens are
+kept as digests and reloaded from the webHook collection every
+`WEBHOOK_TOKENS["ttl"]` seconds, or after `invalidate`, so lookups of
+unknown tokens never reach MongoDB. On a replica set or mongos a change
+stream on webHook invalidates the set as soon as a token changes.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import FrozenSet, Optional
+
+from core.log_utils.log import get_logger
+from core.models import only
+from core.mongo import registry
+from django.conf import settings
+
+logger = get_logger(
+    "webhook_tokens.errors",
+    filename="WebhookTokensError.log",
+    level=30,
+)
+
+
+class WebhookTokens:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._digests: Optional[FrozenSet[bytes]] = None
+        self._expires_at = 0.0
+        self._watching: Optional[int] = None
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def _watch(self) -> None:
+        resumed = False
+        while True:
+            try:
+                with registry.db.webHook.watch() as stream:
+                    # changes made while the stream was down were missed
+                    if resumed:
+                        self.invalidate()
+                    for _ in stream:
+                        self.invalidate()
+            except Exception as e:
+                logger.critical("Webhook token watch failed!")
+                logger.exception(e)
+                time.sleep(settings.WEBHOOK_TOKENS["ttl"])
+            resumed = True
+
+    def _start_watching(self) -> None:
+        # threads do not survive a fork, every worker starts its own.
+        # Change streams need a replica set or mongos, the same as
+        # transactions, standalone servers only get the TTL reload.
+        if self._watching == os.getpid():
+            return
+        self._watching = os.getpid()
+        if registry.supports_transactions:
+            threading.Thread(target=self._watch, daemon=True).start()
+
+    def _load(self) -> None:
+        self._start_watching()
+        tokens = registry.db.webHook.find({}, only("token"))
+        self._digests = frozenset(self._digest(doc["token"]) for doc in tokens)
+        self._expires_at = time.monotonic() + settings.WEBHOOK_TOKENS["ttl"]
+
+    def _refresh(self) -> None:
+        if self._digests is None:
+            with self._lock:
+                if self._digests is None:
+                    self._load()
+            return
+
+        # One thread reloads, the others keep using the current set
+        if self._lock.acquire(blocking=False):
+            try:
+                if self._expires_at <= time.monotonic():
+                    self._load()
+            except Exception as e:
+                logger.critical("Webhook token refresh failed!")
+                logger.exception(e)
+            finally:
+                self._lock.release()
+
+    def __contains__(self, token: str) -> bool:
+        if self._digests is None or self._expires_at <= time.monotonic():
+            self._refresh()
+        return self._digest(token) in self._digests
+
+    def invalidate(self) -> None:
+        """Reload the tokens on the next lookup"""
+        self._expires_at = 0.0
+
+
+webhook_tokens = WebhookTokens()
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApisConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apis"
+
+    def ready(self) -> None:
+        from core.email_templates import email_templates
+
+        # fail at startup on templates using undeclared keys
+        email_templates.load()
@@ -0,0 +1,280 @@
+from typing import Any, Dict
+
+from bson import json_util
+from core.cache import project_listing
+from core.models import AsyncBaseModel, only
+from core.outbox import outbox
+
+from .errors import (
+    ApprovedError,
+    ExisitingMaintainerError,
+    ExistingProjectError,
+    InvalidProjectId,
+    MiscErrors,
+    NotApprovedError,
+    ProjectErrors,
+)
+from .models import Notifications
+
+
+class AsyncEntry(AsyncBaseModel):
+    """
+    Async counterpart of `apis.models.Entry` used by the async views
+    """
+
+    async def _existing_password(
+        self, doc: Dict[str, Any], session=None
+    ) -> Dict[str, Any]:
+        existing_maintainer = await self.db.maintainer.find_one(
+            {"srm_email": doc.get("srm_email"), "reg_number": doc.get("reg_number")},
+            only("password"),
+            session=session,
+        )
+        if existing_maintainer and "password" in existing_maintainer:
+            return {"password": existing_maintainer.get("password")}
+        return {}
+
+    async def enter_maintainer(
+        self, doc: Dict[str, str], notifications: Notifications = None
+    ) -> Any:
+        """Enter project and alpha maintainer in one transaction
+
+        Args:
+            doc (Dict[str, str]): Maintainer Schema
+            notifications (Notifications): outbox messages for the entered
+                maintainer, written in the same transaction
+
+        Returns:
+            Any: (project_id, maintainer_id, project_name, description)
+        """
+        description = doc.pop("description")
+        tags = doc.pop("tags")
+        project_name = doc.pop("project_name")
+
+        # Default approve to false
+        project = {
+            "project_url": doc.get("project_url"),
+            "description": description,
+            "tags": tags,
+            "is_admin_approved": False,
+            "project_name": project_name,
+            "private": doc["private"],
+        }
+        inserted = {}
+
+        async def write(session) -> tuple:
+            password = await self._existing_password(doc, session=session)
+            inserted["project"] = await self.insert_with_uid(
+                "project", project, session=session
+            )
+            inserted["maintainer"] = await self.insert_with_uid(
+                "maintainer",
+                {
+                    **doc,
+                    **{"project_id": inserted["project"]},
+                    **{"is_admin_approved": False},
+                    **password,
+                },
+                session=session,
+            )
+            if notifications:
+                entered = {
+                    **doc,
+                    **project,
+                    **{"_id": inserted["maintainer"]},
+                    **{"project_id": inserted["project"]},
+                }
+                await outbox.enqueue_async(notifications(entered), session=session)
+            return inserted["project"], inserted["maintainer"]
+
+        async def compensate() -> None:
+            await self.alpha_maintainer_reset_status(
+                inserted.get("project"), inserted.get("maintainer")
+            )
+
+        project_id, _id = await self.run_transaction(write, compensate)
+        return project_id, _id, project_name, description
+
+    async def enter_beta_maintainer(
+        self, doc: Dict[str, Any], notifications: Notifications = None
+    ) -> str:
+        """Add beta maintainers to project and updates maintainers
+        collection.
+        """
+        inserted = {}
+
+        async def write(session) -> str:
+            maintainer = {
+                **doc,
+                **{"project_id": doc.get("project_id")},
+                **{"is_admin_approved": False},
+                **(await self._existing_password(doc, session=session)),
+            }
+            inserted["maintainer"] = await self.insert_with_uid(
+                "maintainer", maintainer, session=session
+            )
+            if notifications:
+                await outbox.enqueue_async(
+                    notifications({**maintainer, **{"_id": inserted["maintainer"]}}),
+                    session=session,
+                )
+            return inserted["maintainer"]
+
+        async def compensate() -> None:
+            if "maintainer" in inserted:
+                await self.beta_maintainer_reset_status(inserted["maintainer"])
+
+        return await self.run_transaction(write, compensate)
+
+    async def enter_contributor(
+        self, doc: Dict[str, Any], notifications: Notifications = None
+    ) -> Dict[str, str]:
+        """Addition of contributors for avaliable Projects
+
+        Args:
+            doc (Dict[str, Any])
+            notifications (Notifications): outbox messages for the entered
+                contributor, written in the same transaction
+        """
+        doc = {
+            **doc,
+            **{"is_admin_approved": False},
+            **{"is_maintainer_approved": False},
+            **{"is_added_to_repo": False},
+        }
+
+        project_doc = await self.db.project.find_one(
+            {"_id": doc.get("interested_project")}, only("project_name")
+        )
+        if not project_doc:
+            raise ProjectErrors(
+                detail={"error": "Project not approved or project does not exist"}
+            )
+
+        inserted = {}
+
+        async def write(session) -> Dict[str, Any]:
+            inserted["contributor"] = await self.insert_with_uid(
+                "contributor", doc, session=session
+            )
+            entered = {**doc, **{"_id": inserted["contributor"]}, **project_doc}
+            if notifications:
+                await outbox.enqueue_async(notifications(entered), session=session)
+            return entered
+
+        async def compensate() -> None:
+            if "contributor" in inserted:
+                await self.db.contributor.delete_one({"_id": inserted["contributor"]})
+
+        return await self.run_transaction(write, compensate)
+
+    async def beta_maintainer_reset_status(self, maintainer_id: str) -> None:
+        await self.db.maintainer.delete_one({"_id": maintainer_id})
+
+    async def alpha_maintainer_reset_status(
+        self, project_id: str, maintainer_id: str
+    ) -> None:
+        await self.db.project.delete_one({"_id": project_id})
+        await self.db.maintainer.delete_one({"_id": maintainer_id})
+
+    def get_projects(self) -> object:
+        return self.db.project.find(
+            {"private": False, "is_admin_approved": True},
+            {"maintainer_id": 0, "team_slug": 0},
+        )
+
+    async def get_public_projects(self) -> str:
+        async def fill() -> str:
+            return json_util.dumps(await self.get_projects().to_list(length=None))
+
+        return await project_listing.aget_or_set("public", fill)
+
+    def get_team_data(self) -> object:
+        return self.db.team.find({})
+
+    async def enter_contact_us(self, doc: Dict[str, Any]) -> bool:
+        details = await self.db.contactUs.find_one(
+            {"message": doc.get("message")}, only("_id")
+        )
+
+        if details:
+            raise MiscErrors(
+                status_code=409, detail={"error": "Message already exists!"}
+            )
+        await self.db.contactUs.insert_one(doc)
+
+
+class AsyncEntryCheck(AsyncBaseModel):
+    """
+    Async counterpart of `apis.checks_models.EntryCheck`
+    """
+
+    async def check_existing_project(
+        self, description: str, project_name: str, project_url: str
+    ) -> bool:
+        checks = [{"project_name": project_name}, {"description": description}]
+        if project_url != "":
+            checks.append({"project_url": project_url})
+
+        if await self.db.project.find_one({"$or": checks}, only("_id")):
+            raise ExistingProjectError(detail={"error": "Project Exists"})
+
+    async def check_approved_project(self, identifier: str) -> bool:
+        result = await self.db.project.find_one(
+            {"_id": identifier}, only("_id", "is_admin_approved", "project_name")
+        )
+        if result:
+            if result.get("is_admin_approved"):
+                raise ApprovedError(detail={"error": "Project approved"})
+            return result
+
+    async def check_contributor(
+        self, interested_project: str, reg_number: str, github_id: str, srm_email: str
+    ) -> bool:
+        result = await self.db.project.find_one(
+            {"_id": interested_project}, only("_id", "is_admin_approved")
+        )
+        if not result:
+            raise InvalidProjectId(detail={"error": "Invalid Project Id!"})
+
+        if not result.get("is_admin_approved"):
+            raise NotApprovedError(detail={"error": "Project not approved"})
+
+        identity = {
+            "$or": [
+                {"reg_number": reg_number},
+                {"github_id": github_id},
+                {"srm_email": srm_email},
+            ]
+        }
+        contributor = await self.db.contributor.find_one(
+            {"$and": [{"interested_project": interested_project}, identity]},
+            only("_id"),
+        )
+        maintainer = await self.db.maintainer.find_one(
+            {"$and": [{"project_id": interested_project}, identity]}, only("_id")
+        )
+
+        if contributor or maintainer:
+            raise MiscErrors(
+                status_code=409,
+                detail={"error": "Existing contributor/maintainer for project"},
+            )
+
+    async def validate_beta_maintainer(self, doc: Dict[str, Any]) -> Any:
+        result = await self.db.maintainer.count_documents(
+            {
+                "project_id": doc.get("project_id"),
+                "$or": [
+                    {"github_id": doc.get("github_id")},
+                    {"srm_email": doc.get("srm_email")},
+                ],
+            }
+        )
+
+        if result >= 1:
+            raise ExisitingMaintainerError(
+                detail={"error": "Maintainer for this project exists"}
+            )
+
+        return await self.check_approved_project(identifier=doc.get("project_id"))
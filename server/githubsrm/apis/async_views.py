@@ -0,0 +1,113 @@
+"""
+Async versions of the public /api endpoints, routed instead of
+`open_views` when the app is served through `core.asgi`.
+"""
+
+from asgiref.sync import sync_to_async
+from bson import json_util
+from core.aws import notifier, service
+from core.outbox import outbox
+from core.utils import async_api_view
+from django.http import HttpResponse, JsonResponse
+
+from .async_models import AsyncEntry, AsyncEntryCheck
+from .definitions import CommonSchema, ContactUsSchema
+from .notifications import (
+    alpha_maintainer_entered,
+    beta_maintainer_entered,
+    contributor_entered,
+)
+
+async_entry = AsyncEntry()
+async_entry_checks = AsyncEntryCheck()
+
+# Schema validation hits the GitHub API, it runs off the event loop.
+validate_common = sync_to_async(
+    lambda data, role: CommonSchema(data, query_param=role).valid(),
+    thread_sensitive=False,
+)
+validate_contact_us = sync_to_async(
+    lambda data: ContactUsSchema(data=data).valid(), thread_sensitive=False
+)
+
+
+def notify(message: str, subject: str) -> None:
+    notifier.submit_nowait(
+        service.sns, payload={"message": message, "subject": subject}
+    )
+
+
+@async_api_view(["POST"])
+async def contributor(request) -> JsonResponse:
+    validate = await validate_common(request.data, request.GET.get("role"))
+
+    await async_entry_checks.check_contributor(
+        validate["interested_project"],
+        validate["reg_number"],
+        validate["github_id"],
+        validate["srm_email"],
+    )
+
+    await async_entry.enter_contributor(validate, notifications=contributor_entered)
+    outbox.kick(wait=False)
+    return JsonResponse(data={}, status=201)
+
+
+async def beta_maintainer(request, validate) -> JsonResponse:
+    details = await async_entry_checks.validate_beta_maintainer(doc=validate)
+    await async_entry.enter_beta_maintainer(
+        doc=request.data,
+        notifications=beta_maintainer_entered(details["project_name"]),
+    )
+    outbox.kick(wait=False)
+    return JsonResponse(data={}, status=201)
+
+
+async def alpha_maintainer(request, validate) -> JsonResponse:
+    await async_entry_checks.check_existing_project(
+        description=validate["description"],
+        project_name=validate["project_name"],
+        project_url=validate["project_url"],
+    )
+
+    await async_entry.enter_maintainer(validate, notifications=alpha_maintainer_entered)
+    outbox.kick(wait=False)
+    return JsonResponse(data={}, status=201)
+
+
+@async_api_view(["GET", "POST"])
+async def maintainer(request) -> JsonResponse:
+    if request.method == "GET":
+        return HttpResponse(
+            await async_entry.get_public_projects(),
+            content_type="application/json",
+            status=200,
+        )
+
+    validate = await validate_common(request.data, request.GET.get("role"))
+    if "project_id" in validate:
+        return await beta_maintainer(request, validate)
+    return await alpha_maintainer(request, validate)
+
+
+@async_api_view(["GET"])
+async def team(request) -> JsonResponse:
+    result = await async_entry.get_team_data().to_list(length=None)
+    return HttpResponse(
+        json_util.dumps(result), content_type="application/json", status=200
+    )
+
+
+@async_api_view(["POST"])
+async def contact_us(request) -> JsonResponse:
+    validate = await validate_contact_us(request.data)
+    await async_entry.enter_contact_us(doc=request.data)
+
+    notify(
+        f'New Query Received! \n Name:{validate.get("name")} \n \
+            Email: {validate.get("email")} \n \
+            Message: {validate.get("message")} \n \
+            Phone Number: {validate.get("phone_number")}',
+        "[QUERY]: https://githubsrm.tech",
+    )
+    return JsonResponse(data={"success": True}, status=201)
@@ -1,6 +1,6 @@
 from .errors import MiscErrors
-import pymongo
-from django.conf import settings
+from core.models import only
+from core.mongo import registry
 from typing import Dict, Any
 
 from .errors import (
@@ -13,9 +13,9 @@ from .errors import (
 
 
 class EntryCheck:
-    def __init__(self) -> None:
-        client = pymongo.MongoClient(settings.DATABASE["mongo_uri"])
-        self.db = client[settings.DATABASE["db"]]
+    @property
+    def db(self):
+        return registry.db
 
     def check_existing_project(
         self, description: str, project_name: str, project_url: str
@@ -35,7 +35,7 @@ class EntryCheck:
         if project_url != "":
             checks.append({"project_url": project_url})
 
-        result = self.db.project.find_one({"$or": checks})
+        result = self.db.project.find_one({"$or": checks}, only("_id"))
 
         if result:
             raise ExistingProjectError(detail={"error": "Project Exists"})
@@ -49,7 +49,9 @@ class EntryCheck:
         Returns:
             bool
         """
-        result = self.db.project.find_one({"_id": identifier})
+        result = self.db.project.find_one(
+            {"_id": identifier}, only("_id", "is_admin_approved", "project_name")
+        )
         if result:
             if result.get("is_admin_approved"):
                 raise ApprovedError(detail={"error": "Project approved"})
@@ -68,7 +70,9 @@ class EntryCheck:
             bool
         """
 
-        result = self.db.project.find_one({"_id": interested_project})
+        result = self.db.project.find_one(
+            {"_id": interested_project}, only("_id", "is_admin_approved")
+        )
         if not result:
             raise InvalidProjectId(detail={"error": "Invalid Project Id!"})
 
@@ -87,7 +91,8 @@ class EntryCheck:
                         ]
                     },
                 ]
-            }
+            },
+            only("_id"),
         )
 
         maintainer = self.db.maintainer.find_one(
@@ -102,7 +107,8 @@ class EntryCheck:
                         ]
                     },
                 ]
-            }
+            },
+            only("_id"),
         )
 
         if contributor or maintainer:
@@ -0,0 +1,152 @@
+"""
+GitHub user and repository checks behind a TTL cache in MongoDB shared
+by every worker. Answers are kept with their ETag, stale entries are
+revalidated with conditional requests and a 404 is cached for a shorter
+time than a hit. Answers taken from github.com while the API rate limits
+us are cached for the same shorter time.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import requests
+from core.log_utils.log import get_logger
+from core.mongo import registry
+from django.conf import settings
+
+logger = get_logger(
+    "github.errors",
+    filename="GithubError.log",
+    level=30,
+)
+
+GITHUB_API = "https://api.github.com"
+SOURCE_ROUTE = "https://github.com"
+
+
+class GithubVerifier:
+    def __init__(self, collection: str = "github_cache") -> None:
+        """
+        Args:
+            collection (str): cache collection, entries expire through the
+                `expires_at` TTL index
+        """
+        self.collection = collection
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "upstream_calls": 0,
+        }
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return settings.GITHUB_CACHE
+
+    @property
+    def db(self) -> Any:
+        return registry.db
+
+    def _incr(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the current worker
+
+        Returns:
+            Dict[str, Any]
+        """
+        counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        return counters
+
+    def _get(self, url: str, etag: Optional[str] = None) -> requests.Response:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if url.startswith(GITHUB_API) and self.config["token"]:
+            # Conditional requests answered with 304 are free when authorized
+            headers["Authorization"] = f"token {self.config['token']}"
+        self._incr("upstream_calls")
+        return self.session.get(url, headers=headers, timeout=self.config["timeout"])
+
+    @staticmethod
+    def _unavailable(response: requests.Response) -> bool:
+        return response.status_code in (403, 429) or response.status_code >= 500
+
+    def _store(
+        self, url: str, ok: bool, etag: Optional[str], ttl: Optional[int] = None
+    ) -> None:
+        if ttl is None:
+            ttl = self.config["ttl"] if ok else self.config["negative_ttl"]
+        fresh_until = datetime.utcnow() + timedelta(seconds=ttl)
+        self.db[self.collection].update_one(
+            {"_id": url},
+            {
+                "$set": {
+                    "ok": ok,
+                    "etag": etag,
+                    "fresh_until": fresh_until,
+                    # stale entries are kept one more ttl for revalidation
+                    "expires_at": fresh_until + timedelta(seconds=ttl),
+                }
+            },
+            upsert=True,
+        )
+
+    def verify(self, url: str, fallback: Optional[str] = None) -> bool:
+        """Whether `url` answers 200, through the cache
+
+        Args:
+            url (str): url to check
+            fallback (Optional[str]): url checked instead when the GitHub
+                API rate limits us and nothing is cached
+
+        Returns:
+            bool
+        """
+        entry = self.db[self.collection].find_one(
+            {"_id": url}, {"_id": 0, "ok": 1, "etag": 1, "fresh_until": 1}
+        )
+        if entry and entry["fresh_until"] > datetime.utcnow():
+            self._incr("hits")
+            return entry["ok"]
+        self._incr("misses")
+
+        try:
+            response = self._get(url, etag=entry and entry.get("etag"))
+            if response.status_code == 304 and entry:
+                self._incr("revalidated")
+                self._store(url, entry["ok"], entry.get("etag"))
+                return entry["ok"]
+
+            if self._unavailable(response):
+                # Not cached, stale answers are better than none meanwhile
+                if entry:
+                    return entry["ok"]
+                if response.status_code >= 500 or not fallback:
+                    return False
+
+                answer = self._get(fallback)
+                if self._unavailable(answer):
+                    return False
+                # Kept briefly, the API answers again once the limit resets
+                ok = answer.status_code == 200
+                self._store(url, ok, None, ttl=self.config["negative_ttl"])
+                return ok
+        except requests.RequestException as e:
+            logger.critical("GitHub check failed!")
+            logger.exception(e)
+            return entry["ok"] if entry else False
+
+        ok = response.status_code == 200
+        self._store(url, ok, response.headers.get("ETag"))
+        return ok
+
+
+github = GithubVerifier()
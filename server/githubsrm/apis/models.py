@@ -1,23 +1,33 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
-from core.models import BaseModel
+from core.cache import project_listing
+from core.models import BaseModel, only
+from core.outbox import outbox
+from core.utils import stream_json
 
 from .errors import MiscErrors, ProjectErrors
 
+# Builds the outbox messages for an entered document
+Notifications = Optional[Callable[[Dict[str, Any]], List[Dict[str, Any]]]]
+
 
 class Entry(BaseModel):
     def _enter_project(
-        self, doc: Dict[str, str], visibility: bool, project_id: str
-    ) -> None:
+        self, doc: Dict[str, str], visibility: bool, session=None
+    ) -> str:
         """Project Entry (only accessed by maintainer)
 
         Args:
             doc (Dict[str, str]): post to be entred
-            project_id (str): project id
+            visibility (bool): private project
+            session: optional client session
+
+        Returns:
+            str: project id
         """
 
-        doc = {**doc, **{"_id": project_id}, **{"private": visibility}}
-        self.db.project.insert_one(doc)
+        doc = {**doc, **{"private": visibility}}
+        return self.insert_with_uid("project", doc, session=session)
 
     def _update_project(self, identifier: str, project_id: str) -> None:
         """Update contributers of the project (only accessed by contributor)
@@ -34,111 +44,166 @@ class Entry(BaseModel):
         if project:
             return True
 
-    def enter_maintainer(self, doc: Dict[str, str]) -> Any:
-        """Enter Maintainers
+    def enter_maintainer(
+        self, doc: Dict[str, str], notifications: Notifications = None
+    ) -> Any:
+        """Enter project and alpha maintainer in one transaction
 
         Args:
             doc (Dict[str, str]): Maintainer Schema
-        """
-        project_url = doc.get("project_url")
+            notifications (Notifications): outbox messages for the entered
+                maintainer, written in the same transaction
 
+        Returns:
+            Any: (project_id, maintainer_id, project_name, description)
+        """
         description = doc.pop("description")
         tags = doc.pop("tags")
         project_name = doc.pop("project_name")
 
-        project_id = self.get_uid()
-        _id = self.get_uid()
-        doc = {
-            **doc,
-            **{"_id": _id},
-            **{"project_id": project_id},
-            **{"is_admin_approved": False},
+        # Default approve to false
+        project = {
+            "project_url": doc.get("project_url"),
+            "description": description,
+            "tags": tags,
+            "is_admin_approved": False,
+            "project_name": project_name,
         }
-        existing_maintainer = self.db.maintainer.find_one(
-            {"srm_email": doc.get("srm_email"), "reg_number": doc.get("reg_number")}
-        )
+        inserted = {}
 
-        if existing_maintainer and "password" in existing_maintainer:
-            self.db.maintainer.insert_one(
-                {**doc, **{"password": existing_maintainer.get("password")}}
+        def write(session) -> tuple:
+            existing_maintainer = self.db.maintainer.find_one(
+                {
+                    "srm_email": doc.get("srm_email"),
+                    "reg_number": doc.get("reg_number"),
+                },
+                only("password"),
+                session=session,
             )
+            inserted["project"] = self._enter_project(
+                project, visibility=doc["private"], session=session
+            )
+            inserted["maintainer"] = self.insert_with_uid(
+                "maintainer",
+                {
+                    **doc,
+                    **{"project_id": inserted["project"]},
+                    **{"is_admin_approved": False},
+                    **(existing_maintainer or {}),
+                },
+                session=session,
+            )
+            if notifications:
+                entered = {
+                    **doc,
+                    **project,
+                    **{"_id": inserted["maintainer"]},
+                    **{"project_id": inserted["project"]},
+                }
+                outbox.enqueue(notifications(entered), session=session)
+            return inserted["project"], inserted["maintainer"]
 
-        else:
-            self.db.maintainer.insert_one(doc)
-
-        # Default approve to false
-        self._enter_project(
-            {
-                "project_url": project_url,
-                "description": description,
-                "tags": tags,
-                "is_admin_approved": False,
-                "project_name": project_name,
-                "project_url": project_url,
-            },
-            visibility=doc["private"],
-            project_id=project_id,
-        )
+        def compensate() -> None:
+            self.alpha_maintainer_reset_status(
+                inserted.get("project"), inserted.get("maintainer")
+            )
 
+        project_id, _id = self.run_transaction(write, compensate)
         return project_id, _id, project_name, description
 
-    def enter_beta_maintainer(self, doc: Dict[str, Any]) -> str:
+    def enter_beta_maintainer(
+        self, doc: Dict[str, Any], notifications: Notifications = None
+    ) -> str:
         """Add beta maintainers to project and updates maintainers
         collection.
-        """
-        _id = self.get_uid()
 
-        existing_maintainer = self.db.maintainer.find_one(
-            {"srm_email": doc.get("srm_email"), "reg_number": doc.get("reg_number")}
-        )
+        Args:
+            doc (Dict[str, Any]): Maintainer Schema with the project_id
+            notifications (Notifications): outbox messages for the entered
+                maintainer, written in the same transaction
 
-        if existing_maintainer and "password" in existing_maintainer:
-            self.db.maintainer.insert_one(
-                {
-                    **doc,
-                    **{"_id": _id},
-                    **{"project_id": doc.get("project_id")},
-                    **{"is_admin_approved": False},
-                    **{"password": existing_maintainer.get("password")},
-                }
-            )
-            return _id
+        Returns:
+            str: maintainer id
+        """
+        inserted = {}
 
-        else:
-            self.db.maintainer.insert_one(
+        def write(session) -> str:
+            existing_maintainer = self.db.maintainer.find_one(
                 {
-                    **doc,
-                    **{"_id": _id},
-                    **{"project_id": doc.get("project_id")},
-                    **{"is_admin_approved": False},
-                }
+                    "srm_email": doc.get("srm_email"),
+                    "reg_number": doc.get("reg_number"),
+                },
+                only("password"),
+                session=session,
             )
-            return _id
-
-    def enter_contributor(self, doc: Dict[str, Any]) -> Dict[str, str]:
+            password = {}
+            if existing_maintainer and "password" in existing_maintainer:
+                password = {"password": existing_maintainer.get("password")}
+
+            maintainer = {
+                **doc,
+                **{"project_id": doc.get("project_id")},
+                **{"is_admin_approved": False},
+                **password,
+            }
+            inserted["maintainer"] = self.insert_with_uid(
+                "maintainer", maintainer, session=session
+            )
+            if notifications:
+                outbox.enqueue(
+                    notifications({**maintainer, **{"_id": inserted["maintainer"]}}),
+                    session=session,
+                )
+            return inserted["maintainer"]
+
+        def compensate() -> None:
+            if "maintainer" in inserted:
+                self.beta_maintainer_reset_status(inserted["maintainer"])
+
+        return self.run_transaction(write, compensate)
+
+    def enter_contributor(
+        self, doc: Dict[str, Any], notifications: Notifications = None
+    ) -> Dict[str, str]:
         """Addition of contributors for avaliable Projects
 
         Args:
             doc (Dict[str, Any])
+            notifications (Notifications): outbox messages for the entered
+                contributor, written in the same transaction
         """
 
-        _id = self.get_uid()
         doc = {
             **doc,
-            **{"_id": _id},
             **{"is_admin_approved": False},
             **{"is_maintainer_approved": False},
             **{"is_added_to_repo": False},
         }
 
-        project_doc = self.db.project.find_one({"_id": doc.get("interested_project")})
+        project_doc = self.db.project.find_one(
+            {"_id": doc.get("interested_project")}, only("project_name")
+        )
         if not project_doc:
             raise ProjectErrors(
                 detail={"error": "Project not approved or project does not exist"}
             )
 
-        self.db.contributor.insert_one(doc)
-        return {**doc, **project_doc}
+        inserted = {}
+
+        def write(session) -> Dict[str, Any]:
+            inserted["contributor"] = self.insert_with_uid(
+                "contributor", doc, session=session
+            )
+            entered = {**doc, **{"_id": inserted["contributor"]}, **project_doc}
+            if notifications:
+                outbox.enqueue(notifications(entered), session=session)
+            return entered
+
+        def compensate() -> None:
+            if "contributor" in inserted:
+                self.db.contributor.delete_one({"_id": inserted["contributor"]})
+
+        return self.run_transaction(write, compensate)
 
     def beta_maintainer_reset_status(self, maintainer_id: str) -> None:
         self.db.maintainer.delete_one({"_id": maintainer_id})
@@ -161,6 +226,18 @@ class Entry(BaseModel):
             {"maintainer_id": 0, "team_slug": 0},
         )
 
+    def get_public_projects(self) -> Iterator[str]:
+        """Serialized public project listing, served from the cache until
+        a project is approved or reset and streamed from the cursor on a
+        miss.
+
+        Returns:
+            Iterator[str]: chunks of the JSON array of projects
+        """
+        return project_listing.stream_through(
+            "public", lambda: stream_json(self.get_projects())
+        )
+
     def get_contributors(self) -> object:
         return self.db.contributor.find({})
 
@@ -171,7 +248,9 @@ class Entry(BaseModel):
         return self.db.team.find({})
 
     def enter_contact_us(self, doc: Dict[str, Any]) -> bool:
-        details = self.db.contactUs.find_one({"message": doc.get("message")})
+        details = self.db.contactUs.find_one(
+            {"message": doc.get("message")}, only("_id")
+        )
 
         if details:
             raise MiscErrors(
@@ -0,0 +1,113 @@
+"""
+Outbox messages sent for public submissions, shared by the sync and
+async views. Keys are derived from the entered document so a retried
+transaction never queues a message twice.
+"""
+
+from typing import Any, Callable, Dict, List
+
+from core.outbox import outbox
+
+
+def contributor_entered(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Confirmation email and admin notification for a contributor"""
+    return [
+        outbox.email(
+            f"contributor_received:{doc['_id']}",
+            role="contributor_received",
+            data={
+                "contribution": doc["poa"],
+                "project_name": doc["project_name"],
+                "name": doc["name"],
+                "email": doc["email"],
+            },
+        ),
+        outbox.sns(
+            f"contributor_entry:{doc['_id']}",
+            payload={
+                "message": f"A new contributor has applied for this project -> {doc.get('interested_project')}",
+                "subject": "[CONTRIBUTOR-ENTRY] New Contributor Applied",
+            },
+        ),
+    ]
+
+
+def beta_maintainer_entered(
+    project_name: str,
+) -> Callable[[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Messages for a beta maintainer of `project_name`
+
+    Args:
+        project_name (str): name of the project joined
+
+    Returns:
+        Callable[[Dict[str, Any]], List[Dict[str, Any]]]
+    """
+
+    def messages(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            outbox.email(
+                f"maintainer_received:{doc['_id']}",
+                role="maintainer_received",
+                data={
+                    "name": doc["name"],
+                    "project_name": project_name,
+                    "email": doc["email"],
+                },
+            ),
+            outbox.sns(
+                f"beta_maintainer:{doc['_id']}",
+                payload={
+                    "message": f'New Beta Maintainer for Project ID {doc.get("project_id")}\n \
+                    Details: \n \
+                    Name: {doc.get("name")} \n \
+                    Email Personal: {doc.get("email")}',
+                    "subject": "[BETA-MAINTAINER]: https://githubsrm.tech",
+                },
+            ),
+        ]
+
+    return messages
+
+
+def alpha_maintainer_entered(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Submission confirmation and admin notifications for a project"""
+    details = f'Details: \n \
+                    Name: {doc.get("name")} \n \
+                    Email Personal: {doc.get("email")} \n \
+                    Project Details: \n \
+                    Name: {doc.get("project_name")} \n \
+                    Description: {doc.get("description")}'
+
+    messages = [
+        outbox.email(
+            f"project_submission_confirmation:{doc['_id']}",
+            role="project_submission_confirmation",
+            data={
+                "project_name": doc["project_name"],
+                "name": doc["name"],
+                "project_description": doc["description"],
+                "email": doc["email"],
+            },
+        )
+    ]
+    if doc.get("project_url"):
+        messages.append(
+            outbox.sns(
+                f"project_port:{doc['_id']}",
+                payload={
+                    "message": f'Porting new project {doc.get("project_id")}\n {details}',
+                    "subject": "[PROJECT-PORT]: https://githubsrm.tech",
+                },
+            )
+        )
+    messages.append(
+        outbox.sns(
+            f"alpha_maintainer:{doc['_id']}",
+            payload={
+                "message": f'New Alpha Maintainer for Project ID {doc.get("project_id")}\n {details}',
+                "subject": "[ALPHA-MAINTAINER]: https://githubsrm.tech",
+            },
+        )
+    )
+    return messages
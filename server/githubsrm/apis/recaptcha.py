@@ -0,0 +1,106 @@
+"""
+reCAPTCHA verification client. Requests go through a pooled keep-alive
+session with strict timeouts, rejected tokens are cached briefly and a
+circuit breaker stops calling the verify endpoint while it is failing,
+answering with the configured fail-open or fail-closed policy instead.
+"""
+
+import hashlib
+import threading
+from typing import Any, Dict
+
+import requests
+from core.breaker import CircuitBreaker
+from core.cache import LocalLRUBackend
+from core.log_utils.log import get_logger
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = get_logger(
+    "recaptcha.errors",
+    filename="RecaptchaError.log",
+    level=30,
+)
+
+
+class RecaptchaClient:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._session = None
+        self._cache = None
+        self._breaker = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return settings.RECAPTCHA
+
+    def _setup(self) -> None:
+        if self._session is not None:
+            return
+        with self._lock:
+            if self._session is None:
+                config = self.config
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=config["pool_size"]
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._cache = LocalLRUBackend(
+                    max_entries=config["cache_size"], timeout=config["cache_ttl"]
+                )
+                self._breaker = CircuitBreaker(
+                    config["failure_threshold"], config["reset_timeout"]
+                )
+                self._session = session
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        self._setup()
+        return self._breaker
+
+    def _verify(self, token: str) -> bool:
+        config = self.config
+        response = self._session.post(
+            config["verify_url"],
+            data={"secret": config["secret"], "response": token},
+            timeout=(config["connect_timeout"], config["read_timeout"]),
+        )
+        response.raise_for_status()
+        result = response.json()
+        return bool(result["success"]) and result.get("score", 0) >= config["min_score"]
+
+    def verify(self, token: str) -> bool:
+        """Verify a reCAPTCHA token
+
+        Args:
+            token (str): token sent by the client
+
+        Returns:
+            bool: whether the request may go through
+        """
+        self._setup()
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        if (cached := self._cache.get(key)) is not None:
+            return cached
+
+        if not self._breaker.allow():
+            return self.config["fail_open"]
+
+        try:
+            valid = self._verify(token)
+        except Exception as e:
+            # anything unexpected still has to end a half-open trial
+            logger.critical("reCaptcha verification failed!")
+            logger.exception(e)
+            self._breaker.failure()
+            return self.config["fail_open"]
+
+        self._breaker.success()
+        # tokens are single use, only rejections are safe to replay
+        if not valid:
+            self._cache.set(key, False)
+        return valid
+
+
+recaptcha = RecaptchaClient()
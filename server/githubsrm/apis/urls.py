@@ -1,10 +1,16 @@
+from django.conf import settings
 from django.urls import path
 
-from .open_views import Contributor, Maintainer, contact_us, team
+if settings.ASYNC_VIEWS:
+    from .async_views import contact_us, contributor, maintainer, team
+else:
+    from .open_views import Contributor, Maintainer, contact_us, team
+
+    contributor, maintainer = Contributor.as_view(), Maintainer.as_view()
 
 urlpatterns = [
-    path("contributor", Contributor.as_view()),
-    path("maintainer", Maintainer.as_view()),
+    path("contributor", contributor),
+    path("maintainer", maintainer),
     path("contact-us", contact_us),
     path("team", team),
 ]
@@ -1,11 +1,11 @@
-from functools import lru_cache
 import os
-import requests
 from dotenv import load_dotenv
 
+from .github import GITHUB_API, SOURCE_ROUTE, github
+from .recaptcha import recaptcha
+
 
 load_dotenv()
-session = requests.Session()
 
 
 def check_token(token) -> bool:
@@ -21,35 +21,21 @@ def check_token(token) -> bool:
     if os.getenv("CI"):
         return True
 
-    url = "https://www.google.com/recaptcha/api/siteverify"
-    secret_key = os.getenv("RECAPTCHA_SECRET_KEY")
-
-    payload = {
-        "secret": secret_key,
-        "response": token,
-    }
-
-    response = requests.post(url, data=payload)
-    return response.json()["success"] and response.json()["score"] >= 0.5
+    return recaptcha.verify(token)
 
 
-@lru_cache()
 def verify_github_details(verify_user=False, **kwargs):
     """Perf enhancement using the github rest API instead
     of directly hitting the github url, handles rate-limiting
-    by directly hitting the url.
+    by directly hitting the url. Answers are cached in MongoDB,
+    see apis.github.
     """
-    github_api = "https://api.github.com"
-    source_route = "https://github.com"
-
     if verify_user:
-        response = session.get(f"{github_api}/users/{kwargs['user_id']}")
-        if response.status_code == 403:
-            response = session.get(f"{source_route}/{kwargs['user_id']}")
-        return response.status_code == 200
+        return github.verify(
+            f"{GITHUB_API}/users/{kwargs['user_id']}",
+            fallback=f"{SOURCE_ROUTE}/{kwargs['user_id']}",
+        )
     else:
         # Todo: move to github apis after discussion on porting
         # Used for existing projects.
-        response = session.get(kwargs["url"])
-
-        return response.status_code == 200
+        return github.verify(kwargs["url"])
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self) -> None:
+        from .epochs import logger, token_epochs
+
+        # the first authorized request would load them otherwise, on the
+        # event loop when served through core.asgi
+        try:
+            token_epochs.start()
+        except Exception as e:
+            logger.critical("Token epoch load at startup failed!")
+            logger.exception(e)
@@ -10,5 +10,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+# Route the public /api endpoints to the async views
+os.environ.setdefault("ASYNC_VIEWS", "true")
 
 application = get_asgi_application()
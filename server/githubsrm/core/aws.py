@@ -1,11 +1,19 @@
+import atexit
+import hashlib
 import json
 import os
-from typing import Any, Dict, List, TypedDict
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
 
+from .email_templates import email_templates
 from .log_utils.log import get_logger
-from .settings import TRIGGER_AWS
 from .utils import get_email_content
 
 # Set logging level to critical since breaking aws service breaks everything :).
@@ -16,22 +24,93 @@ logger = get_logger(
 )
 
 
+FROM_ADDRESS = "GitHub Community SRM <community@githubsrm.tech>"
+REPLY_TO = "community@githubsrm.tech"
+
+# SES accepts at most 50 destinations per SendBulkEmail call
+BULK_BATCH_SIZE = 50
+BULK_RETRYABLE = {
+    "TRANSIENT_FAILURE",
+    "FAILED",
+    "ACCOUNT_THROTTLED",
+    "TEMPLATE_NOT_FOUND",
+}
+
+
 class SNSpayload(TypedDict):
     message: str
     subject: str
 
 
 class BotoService:
-    def sns(self, payload: SNSpayload) -> None:
+    def __init__(self) -> None:
+        """
+        Clients are created lazily, one per service and region, and reused
+        by every thread of the worker. botocore clients are thread safe but
+        sessions are not, so creation is locked and everything is dropped
+        after a fork.
+        """
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return settings.AWS
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._session = None
+        self._clients = {}
+        self._templates = {}
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    def client(self, service_name: str, region: Optional[str] = None) -> Any:
+        """Shared client for the current worker
+
+        Args:
+            service_name (str): sns, sesv2, lambda...
+            region (Optional[str]): defaults to AWS["region"]
+
+        Returns:
+            botocore.client.BaseClient
+        """
+        self._check_pid()
+        config = self.config
+        region = region or config["region"]
+        key = (service_name, region)
+        if (client := self._clients.get(key)) is None:
+            with self._lock:
+                if (client := self._clients.get(key)) is None:
+                    if self._session is None:
+                        self._session = boto3.session.Session()
+                    client = self._session.client(
+                        service_name,
+                        region_name=region,
+                        endpoint_url=config["endpoint_url"],
+                        config=Config(
+                            max_pool_connections=config["max_pool_connections"]
+                        ),
+                    )
+                    self._clients[key] = client
+        return client
+
+    def sns(self, payload: SNSpayload) -> bool:
         """Send notifications to admins
 
         Args:
             payload (SNSpayload): SNSpayload
+        Returns:
+            bool
         """
-        if not TRIGGER_AWS:
+        if not self.config["enabled"]:
             return True
 
-        client = boto3.client("sns", region_name="ap-south-1")
+        client = self.client("sns")
 
         try:
             client.publish(
@@ -39,11 +118,13 @@ class BotoService:
                 Message=payload["message"],
                 Subject=payload["subject"],
             )
+            return True
         except Exception as e:
             logger.critical("SNS Failed!")
             logger.exception(e)
+            return False
 
-    def wrapper_email(self, role: str, data: Dict[str, Any], send_all=False) -> bool:
+    def wrapper_email(self, role: str, data: Dict[str, Any]) -> bool:
         """Send Emails to contributors and maintainers
 
         Args:
@@ -52,9 +133,9 @@ class BotoService:
         Returns:
             bool
         """
-        if not TRIGGER_AWS:
+        if not self.config["enabled"]:
             return True
-        client = boto3.client("sesv2", region_name="ap-south-1")
+        client = self.client("sesv2")
 
         email_addresses = []
         data_email = data.get("email")
@@ -65,11 +146,9 @@ class BotoService:
 
         try:
             client.send_email(
-                FromEmailAddress="GitHub Community SRM <community@githubsrm.tech>",
+                FromEmailAddress=FROM_ADDRESS,
                 Destination={"ToAddresses": email_addresses},
-                ReplyToAddresses=[
-                    "community@githubsrm.tech",
-                ],
+                ReplyToAddresses=[REPLY_TO],
                 Content=get_email_content(role, data),
             )
             return True
@@ -77,6 +156,211 @@ class BotoService:
         except Exception as e:
             logger.critical("Email Failed!")
             logger.exception(e)
+            return False
+
+    def _stored_template(self, role: str) -> str:
+        """SES stored template for role, created on first use. Every `kw`
+        is left as an SES placeholder and the name carries a digest of the
+        content, so edited templates are stored under a new name.
+
+        Args:
+            role (str): key of email_statics.json
+
+        Returns:
+            str: template name
+        """
+        if role in self._templates:
+            return self._templates[role]
+
+        email_context, _ = email_templates.roles[role]
+        placeholders = {key: "{{%s}}" % key for key in email_context["kw"]}
+        content = email_templates.render(role, placeholders)["Simple"]
+        stored = {
+            "Subject": content["Subject"]["Data"],
+            "Text": content["Body"]["Text"]["Data"],
+            "Html": content["Body"]["Html"]["Data"],
+        }
+        digest = hashlib.sha256(
+            json.dumps(stored, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:10]
+        # SES template names are limited to 64 characters
+        name = f"{self.config['template_prefix']}-{role}"[:53] + f"-{digest}"
+
+        client = self.client("sesv2")
+        try:
+            client.create_email_template(TemplateName=name, TemplateContent=stored)
+        except client.exceptions.AlreadyExistsException:
+            pass
+        self._templates[role] = name
+        return name
+
+    def _send_bulk(
+        self, role: str, data: Dict[str, Any], batch: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """One SendBulkEmail call
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: recipients
+                worth retrying and recipients rejected for good
+        """
+        try:
+            response = self.client("sesv2").send_bulk_email(
+                FromEmailAddress=FROM_ADDRESS,
+                ReplyToAddresses=[REPLY_TO],
+                DefaultContent={
+                    "Template": {
+                        "TemplateName": self._stored_template(role),
+                        "TemplateData": json.dumps(data),
+                    }
+                },
+                BulkEmailEntries=[
+                    {
+                        "Destination": {"ToAddresses": [recipient["email"]]},
+                        "ReplacementEmailContent": {
+                            "ReplacementTemplate": {
+                                "ReplacementTemplateData": json.dumps(recipient)
+                            }
+                        },
+                    }
+                    for recipient in batch
+                ],
+            )
+        except (BotoCoreError, ClientError) as e:
+            logger.critical("Bulk email batch failed!")
+            logger.exception(e)
+            return batch, []
+
+        retry, rejected = [], []
+        for recipient, result in zip(batch, response["BulkEmailEntryResults"]):
+            if result["Status"] == "SUCCESS":
+                continue
+            logger.critical(
+                f"Bulk email to {recipient['email']} failed: {result['Status']} {result.get('Error')}"
+            )
+            if result["Status"] == "TEMPLATE_NOT_FOUND":
+                # deleted behind our back, stored again on the next attempt
+                self._templates.pop(role, None)
+            if result["Status"] in BULK_RETRYABLE:
+                retry.append(recipient)
+            else:
+                rejected.append(recipient)
+        return retry, rejected
+
+    def _send_bulk_all(
+        self, role: str, data: Dict[str, Any], pending: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        retry, rejected = [], []
+        for start in range(0, len(pending), BULK_BATCH_SIZE):
+            failed, lost = self._send_bulk(
+                role, data, pending[start : start + BULK_BATCH_SIZE]
+            )
+            retry.extend(failed)
+            rejected.extend(lost)
+        return retry, rejected
+
+    def _report_bulk(self, role: str, lost: List[Dict[str, Any]]) -> None:
+        emails = ", ".join(recipient["email"] for recipient in lost)
+        logger.critical(f"Bulk email {role} gave up on {len(lost)} recipients!")
+        notifier.submit(
+            self.sns,
+            payload={
+                "message": f"{role} email was not delivered to: {emails}",
+                "subject": f"[BULK-EMAIL] {len(lost)} recipients not reached",
+            },
+        )
+
+    def _retry_bulk(
+        self,
+        role: str,
+        data: Dict[str, Any],
+        pending: List[Dict[str, Any]],
+        attempt: int,
+    ) -> bool:
+        """Queue another attempt for `pending` on the notification workers
+        once its backoff ran out, or report them once `bulk_max_attempts`
+        is used up. The backoff runs on a timer so no worker sleeps.
+
+        Returns:
+            bool: whether another attempt is scheduled
+        """
+        config = self.config
+        if attempt >= config["bulk_max_attempts"]:
+            self._report_bulk(role, pending)
+            return False
+
+        def submit() -> None:
+            if not notifier.submit(
+                self._bulk_attempt,
+                role=role,
+                data=data,
+                pending=pending,
+                attempt=attempt,
+            ):
+                self._report_bulk(role, pending)
+
+        timer = threading.Timer(
+            config["bulk_backoff_seconds"] * 2 ** (attempt - 1), submit
+        )
+        timer.daemon = True
+        timer.start()
+        return True
+
+    def _bulk_attempt(
+        self,
+        role: str,
+        data: Dict[str, Any],
+        pending: List[Dict[str, Any]],
+        attempt: int,
+    ) -> None:
+        retry, rejected = self._send_bulk_all(role, data, pending)
+        if rejected:
+            self._report_bulk(role, rejected)
+        if retry:
+            self._retry_bulk(role, data, retry, attempt + 1)
+
+    def bulk_email(
+        self, role: str, data: Dict[str, Any], recipients: List[Dict[str, Any]]
+    ) -> int:
+        """Send role to every recipient on their own through SES templated
+        bulk sending, in batches of 50. Only the first attempt is made by
+        the caller, recipients failing with a transient status are retried
+        with backoff on the notification workers. Recipients given up on
+        are logged and reported through SNS.
+
+        Args:
+            role (str): key of email_statics.json
+            data (Dict[str, Any]): data shared by every recipient
+            recipients (List[Dict[str, Any]]): per recipient data, each
+                with their `email`
+
+        Returns:
+            int: recipients accepted or still being retried, 0 when nobody
+                will get the email
+        """
+        config = self.config
+        pending = [{**data, **recipient} for recipient in recipients]
+
+        try:
+            email_context, _ = email_templates.roles[role]
+            for recipient in pending:
+                if not recipient.keys() >= set(email_context["kw"]):
+                    raise ValueError(
+                        f"inconsistent data, data should have the following keys {email_context['kw']}"
+                    )
+            if not config["enabled"]:
+                return len(pending)
+            self._stored_template(role)
+        except Exception as e:
+            logger.critical("Bulk email failed!")
+            logger.exception(e)
+            return 0
+
+        retry, rejected = self._send_bulk_all(role, data, pending)
+        if rejected:
+            self._report_bulk(role, rejected)
+        if retry and not self._retry_bulk(role, data, retry, attempt=1):
+            return len(pending) - len(rejected) - len(retry)
+        return len(pending) - len(rejected)
 
     def lambda_(self, func: str, payload: Dict) -> Dict:
         """[Lambda wrapper for AWS]
@@ -90,7 +374,7 @@ class BotoService:
         """
         res = None
 
-        if not TRIGGER_AWS:
+        if not self.config["enabled"]:
             # Test return!
             return {
                 "success": True,
@@ -98,7 +382,7 @@ class BotoService:
                 "private": True,
                 "repo-link": "https://github.com/SRM-IST-KTR/githubsrm",
             }
-        client = boto3.client("lambda", region_name="ap-south-1")
+        client = self.client("lambda")
         try:
             res = client.invoke(FunctionName=func, Payload=json.dumps(payload))
         except Exception as e:
@@ -108,10 +392,191 @@ class BotoService:
         if res and "Payload" in res and hasattr(res["Payload"], "read"):
             return json.loads(res["Payload"].read())
         else:
-            logger.critical(
-                f"lambda returned without payload!\n Returned Value: {res}"
-            )
+            logger.critical(f"lambda returned without payload!\n Returned Value: {res}")
             return {"error": "lambda failed!"}
 
 
 service = BotoService()
+
+
+class NotificationExecutor:
+    def __init__(self) -> None:
+        """
+        Bounded pool of worker threads for notifications sent off the
+        request path. Workers are started lazily in every worker process,
+        a full queue makes `submit` wait up to `submit_timeout` before the
+        message is dropped, and queued messages are drained on exit.
+        """
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._workers = []
+        self._closed = False
+        self._registered = False
+        self._reset_counters()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return settings.NOTIFICATIONS
+
+    def _reset_counters(self) -> None:
+        self.counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "run_seconds": 0.0,
+        }
+
+    def _start(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # threads and queue locks of the parent are gone after a fork
+            config = self.config
+            self._queue = queue.Queue(maxsize=config["max_queue"])
+            self._workers = [
+                threading.Thread(
+                    target=self._work, name=f"notifications-{i}", daemon=True
+                )
+                for i in range(config["workers"])
+            ]
+            self._closed = False
+            self._reset_counters()
+            for worker in self._workers:
+                worker.start()
+            if not self._registered:
+                atexit.register(self.shutdown)
+                self._registered = True
+            self._pid = os.getpid()
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            fn, kwargs, queued_at = item
+            started = time.monotonic()
+            try:
+                fn(**kwargs)
+                outcome = "completed"
+            except Exception as e:
+                logger.critical(f"Notification {getattr(fn, '__name__', fn)} failed!")
+                logger.exception(e)
+                outcome = "failed"
+            finished = time.monotonic()
+
+            with self._lock:
+                wait = started - queued_at
+                self.counters[outcome] += 1
+                self.counters["wait_seconds"] += wait
+                self.counters["max_wait_seconds"] = max(
+                    self.counters["max_wait_seconds"], wait
+                )
+                self.counters["run_seconds"] += finished - started
+
+    def _put(self, fn: Callable[..., Any], kwargs: Dict, wait: bool) -> bool:
+        try:
+            item = (fn, kwargs, time.monotonic())
+            if wait:
+                self._queue.put(item, timeout=self.config["submit_timeout"])
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.counters["rejected"] += 1
+            logger.critical(f"Notification queue full, dropped {fn}!")
+            return False
+
+        with self._lock:
+            self.counters["submitted"] += 1
+        return True
+
+    def submit(self, fn: Callable[..., Any], **kwargs) -> bool:
+        """Run `fn(**kwargs)` on the notification workers
+
+        Args:
+            fn (Callable[..., Any]): service.sns, service.wrapper_email...
+
+        Returns:
+            bool: False when the queue stayed full and the message was dropped
+        """
+        self._start()
+        if self._closed:
+            fn(**kwargs)
+            return True
+        return self._put(fn, kwargs, wait=True)
+
+    def submit_nowait(self, fn: Callable[..., Any], **kwargs) -> bool:
+        """`submit` for callers on an event loop, a full queue or a pool
+        shutting down drops the message instead of blocking
+
+        Args:
+            fn (Callable[..., Any]): service.sns, service.wrapper_email...
+
+        Returns:
+            bool: False when the message was dropped
+        """
+        self._start()
+        if self._closed:
+            logger.critical(f"Notification workers stopped, dropped {fn}!")
+            return False
+        return self._put(fn, kwargs, wait=False)
+
+    def shutdown(self, timeout: Optional[float] = None) -> int:
+        """Stop accepting messages and wait for queued ones to be sent
+
+        Args:
+            timeout (Optional[float]): defaults to `drain_timeout`
+
+        Returns:
+            int: messages still queued when the timeout ran out
+        """
+        if self._pid != os.getpid() or self._closed:
+            return 0
+        self._closed = True
+        deadline = time.monotonic() + (
+            self.config["drain_timeout"] if timeout is None else timeout
+        )
+        try:
+            for _ in self._workers:
+                self._queue.put(None, timeout=max(deadline - time.monotonic(), 0))
+        except queue.Full:
+            pass
+        for worker in self._workers:
+            worker.join(max(deadline - time.monotonic(), 0))
+
+        left = sum(1 for item in list(self._queue.queue) if item is not None)
+        if left:
+            logger.critical(f"Notification drain timed out, {left} messages lost!")
+        return left
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and latency of the current worker
+
+        Returns:
+            Dict[str, Any]
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            running = self._pid == os.getpid()
+        done = counters["completed"] + counters["failed"]
+        return {
+            "pid": os.getpid(),
+            "workers": len(self._workers) if running else 0,
+            "queue_depth": self._queue.qsize() if running else 0,
+            "submitted": counters["submitted"],
+            "completed": counters["completed"],
+            "failed": counters["failed"],
+            "rejected": counters["rejected"],
+            "avg_wait_ms": counters["wait_seconds"] * 1e3 / done if done else 0.0,
+            "max_wait_ms": counters["max_wait_seconds"] * 1e3,
+            "avg_run_ms": counters["run_seconds"] * 1e3 / done if done else 0.0,
+        }
+
+
+notifier = NotificationExecutor()
@@ -0,0 +1,76 @@
+"""
+Circuit breaker for calls to services that may stop answering, callers
+take their fallback straight away while it is open instead of waiting
+out a timeout on every request.
+"""
+
+import threading
+import time
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        Opens after `failure_threshold` consecutive failures, lets one
+        trial call through after `reset_timeout` seconds and closes again
+        when it succeeds.
+
+        Args:
+            failure_threshold (int): consecutive failures before opening
+            reset_timeout (float): seconds to stay open
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        """Whether a call may go through, only one trial call is let
+        through while half-open.
+
+        Returns:
+            bool
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def success(self) -> bool:
+        """Record a successful call
+
+        Returns:
+            bool: whether it closed the breaker
+        """
+        with self._lock:
+            closed = self._opened_at is not None
+            self._failures, self._opened_at, self._trial = 0, None, False
+        return closed
+
+    def failure(self) -> bool:
+        """Record a failed call
+
+        Returns:
+            bool: whether it opened the breaker, a failed trial keeps it open
+        """
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                opened = self._opened_at is None
+                self._opened_at, self._trial = time.monotonic(), False
+                return opened
+        return False
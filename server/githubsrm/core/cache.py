@@ -0,0 +1,277 @@
+"""
+Versioned read-through caches for data that only changes on a few
+known write paths. Writers call `invalidate` which bumps the namespace
+version, entries of older versions are never read again and age out.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class LocalLRUBackend:
+    def __init__(self, max_entries: int = 128, timeout: Optional[float] = None):
+        """
+        In-process LRU, entries are private to the worker so `timeout`
+        bounds how long other workers may serve a stale version.
+
+        Args:
+            max_entries (int): entries kept before evicting the oldest
+            timeout (Optional[float]): default entry lifetime in seconds
+        """
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _expiry(self, timeout: Optional[float]) -> Optional[float]:
+        return None if timeout is None else time.monotonic() + timeout
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: Any = ...) -> None:
+        timeout = self.timeout if timeout is ... else timeout
+        with self._lock:
+            self._data[key] = (value, self._expiry(timeout))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def add(self, key: str, value: Any, timeout: Any = ...) -> bool:
+        with self._lock:
+            if key in self._data:
+                return False
+        self.set(key, value, timeout)
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value, expires_at = self._data.get(key, (0, None))
+            self._data[key] = (value + 1, expires_at)
+            return value + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    # in memory, cheap enough to run on the event loop
+    async def aget(self, key: str) -> Any:
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, timeout: Any = ...) -> None:
+        self.set(key, value, timeout)
+
+    async def aadd(self, key: str, value: Any, timeout: Any = ...) -> bool:
+        return self.add(key, value, timeout)
+
+
+class DjangoCacheBackend:
+    def __init__(self, alias: str = "default", timeout: Optional[float] = None):
+        """
+        Backend on a Django cache from `CACHES` (memcached, redis...),
+        shared by every worker.
+
+        Args:
+            alias (str): `CACHES` alias
+            timeout (Optional[float]): default entry lifetime in seconds
+        """
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    def get(self, key: str) -> Any:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: Any, timeout: Any = ...) -> None:
+        self.cache.set(key, value, self.timeout if timeout is ... else timeout)
+
+    def add(self, key: str, value: Any, timeout: Any = ...) -> bool:
+        return self.cache.add(key, value, self.timeout if timeout is ... else timeout)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    def incr(self, key: str) -> int:
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, None):
+                return 1
+            return self.cache.incr(key)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    # network round trips, run off the event loop
+    async def aget(self, key: str) -> Any:
+        return await sync_to_async(self.get, thread_sensitive=False)(key)
+
+    async def aset(self, key: str, value: Any, timeout: Any = ...) -> None:
+        await sync_to_async(self.set, thread_sensitive=False)(key, value, timeout)
+
+    async def aadd(self, key: str, value: Any, timeout: Any = ...) -> bool:
+        return await sync_to_async(self.add, thread_sensitive=False)(
+            key, value, timeout
+        )
+
+
+def load_backend(config: Dict[str, Any]) -> Any:
+    """Build backend from a `{"BACKEND": path, "OPTIONS": {...}}` setting
+
+    Args:
+        config (Dict[str, Any]): backend config
+
+    Returns:
+        Any: cache backend
+    """
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+class VersionedCache:
+    def __init__(self, namespace: str, setting: str) -> None:
+        """
+        Args:
+            namespace (str): key prefix
+            setting (str): settings attribute holding the backend config
+        """
+        self.namespace = namespace
+        self.setting = setting
+        self._backend = None
+        self._max_entry_size = None
+
+    @property
+    def backend(self) -> Any:
+        if self._backend is None:
+            config = getattr(settings, self.setting)
+            self._max_entry_size = config.get("MAX_ENTRY_SIZE")
+            self._backend = load_backend(config)
+        return self._backend
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    def version(self) -> int:
+        """Current version, seeded with the clock so a lost version key
+        never brings back entries of an older version.
+
+        Returns:
+            int
+        """
+        version = self.backend.get(self._version_key)
+        if version is None:
+            self.backend.add(self._version_key, time.time_ns(), None)
+            version = self.backend.get(self._version_key)
+        return version
+
+    async def aversion(self) -> int:
+        """`version` through the async backend calls"""
+        version = await self.backend.aget(self._version_key)
+        if version is None:
+            await self.backend.aadd(self._version_key, time.time_ns(), None)
+            version = await self.backend.aget(self._version_key)
+        return version
+
+    def _key(self, name: str) -> str:
+        return f"{self.namespace}:{self.version()}:{name}"
+
+    def get_or_set(self, name: str, fill: Callable[[], Any]) -> Any:
+        """Read through the cache
+
+        Args:
+            name (str): entry name
+            fill (Callable[[], Any]): builds the value on a miss
+
+        Returns:
+            Any
+        """
+        key = self._key(name)
+        value = self.backend.get(key)
+        if value is None:
+            value = fill()
+            self.backend.set(key, value)
+        return value
+
+    async def aget_or_set(self, name: str, fill: Callable[[], Any]) -> Any:
+        """`get_or_set` with a coroutine `fill`, shared backends are
+        called off the event loop. Like `stream_through`, the value is
+        only kept when it fits in `MAX_ENTRY_SIZE` characters."""
+        key = f"{self.namespace}:{await self.aversion()}:{name}"
+        value = await self.backend.aget(key)
+        if value is None:
+            value = await fill()
+            if self._fits(len(value)):
+                await self.backend.aset(key, value)
+        return value
+
+    def stream_through(
+        self, name: str, stream: Callable[[], Iterable[str]]
+    ) -> Iterator[str]:
+        """Read through the cache for streamed values, a miss is passed
+        through chunk by chunk and only kept when it fits in the
+        configured `MAX_ENTRY_SIZE` characters.
+
+        Args:
+            name (str): entry name
+            stream (Callable[[], Iterable[str]]): builds the chunks on a miss
+
+        Returns:
+            Iterator[str]
+        """
+        key = self._key(name)
+        value = self.backend.get(key)
+        if value is not None:
+            return iter((value,))
+        return self._stream_and_set(key, stream())
+
+    def _fits(self, size: int) -> bool:
+        return self._max_entry_size is None or size <= self._max_entry_size
+
+    def _stream_and_set(self, key: str, chunks: Iterable[str]) -> Iterator[str]:
+        kept, size = [], 0
+        for chunk in chunks:
+            if kept is not None:
+                size += len(chunk)
+                if not self._fits(size):
+                    kept = None
+                else:
+                    kept.append(chunk)
+            yield chunk
+        if kept is not None:
+            self.backend.set(key, "".join(kept))
+
+    def invalidate(self) -> int:
+        """Drop every entry of the namespace by bumping its version
+
+        Returns:
+            int: new version
+        """
+        self.version()
+        return self.backend.incr(self._version_key)
+
+
+project_listing = VersionedCache("projects", "PROJECT_LISTING_CACHE")
@@ -0,0 +1,112 @@
+"""
+Email templates loaded once per process. `email_statics.json` and every
+template it names are read into a Jinja Environment when the apis app is
+ready, compiled templates are kept in a bytecode cache shared by worker
+restarts and emails are rendered from memory afterwards.
+"""
+
+import json
+import os
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    meta,
+)
+
+
+class EmailTemplates:
+    def __init__(self) -> None:
+        self._roles = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return settings.EMAIL_TEMPLATES
+
+    def _environment(self) -> Environment:
+        config = self.config
+        if config["bytecode_cache"]:
+            os.makedirs(config["bytecode_cache"], exist_ok=True)
+        return Environment(
+            loader=FileSystemLoader(config["folder"]),
+            bytecode_cache=FileSystemBytecodeCache(config["bytecode_cache"]),
+            auto_reload=False,
+        )
+
+    def load(self) -> Dict[str, Tuple[Dict[str, Any], Template]]:
+        """Compile every template and check it only uses declared `kw`
+
+        Raises:
+            ImproperlyConfigured: a template uses keys missing from `kw`
+
+        Returns:
+            Dict[str, Tuple[Dict[str, Any], Template]]: role -> (statics, template)
+        """
+        environment = self._environment()
+        with open(os.path.join(self.config["folder"], "email_statics.json")) as fp:
+            statics = json.load(fp)
+
+        roles = {}
+        errors = []
+        for role, context in statics.items():
+            name = f"{context['file']}.html"
+            source = environment.loader.get_source(environment, name)[0]
+            used = meta.find_undeclared_variables(environment.parse(source))
+            missing = (used | set(context["body_kw"])) - set(context["kw"])
+            if missing:
+                errors.append(f"{role} uses {sorted(missing)} missing from kw")
+            roles[role] = (context, environment.get_template(name))
+
+        if errors:
+            raise ImproperlyConfigured(f"email templates: {'; '.join(errors)}")
+        self._roles = roles
+        return roles
+
+    @property
+    def roles(self) -> Dict[str, Tuple[Dict[str, Any], Template]]:
+        if self._roles is None:
+            # loading twice from two threads is harmless
+            return self.load()
+        return self._roles
+
+    def render(self, role: str, data: Dict[str, str]) -> Dict[str, Any]:
+        """SES content for role
+
+        Args:
+            role (str): key of email_statics.json
+            data (Dict[str, str]): template data, must have every `kw`
+
+        Returns:
+            Dict[str, Any]: sesv2 `Content`
+        """
+        if role not in self.roles:
+            raise ValueError("role not found, wrong role passed")
+        email_context, template = self.roles[role]
+
+        # data can have extra unused args but must have the neccesary ones.
+        if not data.keys() >= set(email_context["kw"]):
+            raise ValueError(
+                f"inconsistent data, data should have the following keys {email_context['kw']}"
+            )
+
+        body_kw = [data[i] for i in email_context["body_kw"]]
+        return {
+            "Simple": {
+                "Subject": {"Data": email_context["subject"], "Charset": "utf-8"},
+                "Body": {
+                    "Text": {
+                        "Data": email_context["bodyText"].format(*body_kw),
+                        "Charset": "utf-8",
+                    },
+                    "Html": {"Data": template.render(**data), "Charset": "utf-8"},
+                },
+            },
+        }
+
+
+email_templates = EmailTemplates()
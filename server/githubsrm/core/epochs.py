@@ -0,0 +1,133 @@
+"""
+Per user token epochs. Tokens carry the epoch of their user when they
+are issued, writers that change what a token grants bump the epoch and
+older tokens stop being accepted. Each worker keeps the epochs in memory
+and polls the collection for bumps made by other workers, so requests
+are authorized without a round trip to MongoDB. The full load happens at
+startup, see `CoreConfig.ready` and gunicorn's `post_fork`, so that it
+never runs on a request.
+"""
+
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from pymongo import ReturnDocument
+
+from .log_utils.log import get_logger
+from .models import only
+from .mongo import registry
+
+logger = get_logger(
+    "token_epochs.errors",
+    filename="TokenEpochsError.log",
+    level=30,
+)
+
+
+class TokenEpochs:
+    def __init__(self, collection: str = "token_epochs") -> None:
+        """
+        Args:
+            collection (str): collection holding `{_id: user, epoch}`
+        """
+        self.collection = collection
+        self._lock = threading.RLock()
+        self._pid = None
+        self._epochs: Dict[str, int] = {}
+        self._since = None
+
+    @property
+    def interval(self) -> float:
+        return settings.TOKEN_EPOCHS["refresh_interval"]
+
+    def _load(self, since: Optional[Any] = None) -> None:
+        query = {}
+        if since is not None:
+            # Bumps committed out of order are still picked up
+            query = {"updated_at": {"$gte": since - timedelta(seconds=self.interval)}}
+
+        for doc in registry.db[self.collection].find(
+            query, only("_id", "epoch", "updated_at")
+        ):
+            self._set(doc["_id"], doc["epoch"])
+            if self._since is None or doc["updated_at"] > self._since:
+                self._since = doc["updated_at"]
+
+    def _set(self, user: str, epoch: int) -> None:
+        with self._lock:
+            if epoch > self._epochs.get(user, 0):
+                self._epochs[user] = epoch
+
+    def _poll(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self._load(since=self._since)
+            except Exception as e:
+                logger.critical("Token epoch refresh failed!")
+                logger.exception(e)
+
+    def start(self) -> None:
+        """Load every epoch and start polling for bumps, once per process"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._epochs, self._since = {}, None
+                self._load()
+                threading.Thread(target=self._poll, daemon=True).start()
+                self._pid = os.getpid()
+
+    def current(self, user: str) -> int:
+        """Epoch of the user as last seen by this worker
+
+        Args:
+            user (str): user identifier
+
+        Returns:
+            int
+        """
+        # processes forked after startup load on first use
+        self.start()
+        return self._epochs.get(user, 0)
+
+    def is_current(self, user: str, epoch: Optional[int]) -> bool:
+        """Whether a token issued at `epoch` is still valid, a token newer
+        than the worker's view was issued after a bump not polled yet.
+
+        Args:
+            user (str): user identifier
+            epoch (Optional[int]): epoch claim of the token
+
+        Returns:
+            bool
+        """
+        return isinstance(epoch, int) and epoch >= self.current(user)
+
+    def bump(self, user: str, session=None) -> int:
+        """Invalidate every token of the user issued so far
+
+        Args:
+            user (str): user identifier
+            session: optional transaction session
+
+        Returns:
+            int: new epoch
+        """
+        doc = registry.db[self.collection].find_one_and_update(
+            {"_id": user},
+            update={"$inc": {"epoch": 1}, "$currentDate": {"updated_at": True}},
+            projection=only("epoch"),
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        self._set(user, doc["epoch"])
+        return doc["epoch"]
+
+
+token_epochs = TokenEpochs()
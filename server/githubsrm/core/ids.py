@@ -0,0 +1,103 @@
+"""
+Local 8 character ID generation. Uniqueness is enforced by the `_id`
+index of every collection, colliding inserts are retried with a new ID
+instead of looking the ID up before writing.
+
+IDs are drawn one insert at a time. Reserving blocks of IDs ahead of
+writes was dropped: no write path inserts more than a few documents per
+request, and a collision costs a single retried insert.
+"""
+
+import secrets
+import string
+from typing import Any, Dict
+
+from pymongo.errors import DuplicateKeyError
+
+ALPHABET = string.ascii_uppercase + string.digits
+ID_LENGTH = 8
+DUPLICATE_KEY = 11000
+
+
+def is_id_collision(error: Dict[str, Any]) -> bool:
+    """Duplicate key error raised by the `_id` index
+
+    Args:
+        error (Dict[str, Any]): error details from pymongo
+
+    Returns:
+        bool
+    """
+    if error.get("code") != DUPLICATE_KEY:
+        return False
+    if "keyPattern" in error:
+        return list(error["keyPattern"]) == ["_id"]
+    return " _id_ " in error.get("errmsg", "")
+
+
+class IdAllocator:
+    def __init__(
+        self, length: int = ID_LENGTH, alphabet: str = ALPHABET, max_retries: int = 5
+    ) -> None:
+        self.length = length
+        self.alphabet = alphabet
+        self.max_retries = max_retries
+
+    def new_id(self) -> str:
+        """Generate an ID without touching the database
+
+        Returns:
+            str
+        """
+        return "".join(secrets.choice(self.alphabet) for _ in range(self.length))
+
+    def insert(self, collection, doc: Dict[str, Any], session=None) -> str:
+        """Insert document with a fresh `_id`, retrying on collision. Inside
+        a transaction the collision is raised instead, the server aborted
+        the transaction and `run_transaction` retries the whole callback.
+
+        Args:
+            collection: pymongo collection
+            doc (Dict[str, Any]): document without `_id`
+            session: optional client session
+
+        Returns:
+            str: inserted `_id`
+        """
+        for _ in range(self.max_retries):
+            _id = self.new_id()
+            try:
+                collection.insert_one({**doc, **{"_id": _id}}, session=session)
+                return _id
+            except DuplicateKeyError as e:
+                if session is not None and session.in_transaction:
+                    raise
+                if not is_id_collision(e.details or {}):
+                    raise
+        raise DuplicateKeyError("could not allocate a unique _id")
+
+    async def insert_async(self, collection, doc: Dict[str, Any], session=None) -> str:
+        """`insert` for motor collections
+
+        Args:
+            collection: motor collection
+            doc (Dict[str, Any]): document without `_id`
+            session: optional client session
+
+        Returns:
+            str: inserted `_id`
+        """
+        for _ in range(self.max_retries):
+            _id = self.new_id()
+            try:
+                await collection.insert_one({**doc, **{"_id": _id}}, session=session)
+                return _id
+            except DuplicateKeyError as e:
+                if session is not None and session.in_transaction:
+                    raise
+                if not is_id_collision(e.details or {}):
+                    raise
+        raise DuplicateKeyError("could not allocate a unique _id")
+
+
+allocator = IdAllocator()
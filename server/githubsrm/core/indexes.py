@@ -0,0 +1,229 @@
+"""
+Declared index set for every collection. Applied with
+`python manage.py ensure_indexes`, `--check` explains the queries the
+server recorded through `DATABASE["record_queries"]`.
+"""
+
+import json
+from typing import Any, Dict, Iterator, List
+
+from bson import json_util
+from pymongo import ASCENDING, HASHED, IndexModel
+
+from .mongo import query_shape
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "project": [
+        IndexModel(
+            [("is_admin_approved", ASCENDING), ("private", ASCENDING)],
+            name="approved_private",
+        ),
+        IndexModel(
+            [("is_admin_approved", ASCENDING), ("_id", ASCENDING)],
+            name="approved_id",
+        ),
+        IndexModel([("project_name", ASCENDING)], name="project_name"),
+        IndexModel([("description", HASHED)], name="description_hashed"),
+        IndexModel([("project_url", ASCENDING)], name="project_url"),
+        IndexModel([("contributor_id", ASCENDING)], name="contributor_id"),
+    ],
+    "maintainer": [
+        # Covers the approved project ids read on token refresh
+        IndexModel(
+            [
+                ("email", ASCENDING),
+                ("is_admin_approved", ASCENDING),
+                ("project_id", ASCENDING),
+            ],
+            name="email_approved_project",
+        ),
+        IndexModel(
+            [("project_id", ASCENDING), ("is_admin_approved", ASCENDING)],
+            name="project_approved",
+        ),
+        IndexModel(
+            [("srm_email", ASCENDING), ("reg_number", ASCENDING)],
+            name="srm_email_reg_number",
+        ),
+    ],
+    "contributor": [
+        IndexModel(
+            [("interested_project", ASCENDING), ("is_admin_approved", ASCENDING)],
+            name="project_approved",
+        ),
+    ],
+    "maintainer_credentials": [IndexModel([("email", ASCENDING)], name="email")],
+    "admins": [IndexModel([("email", ASCENDING)], name="email")],
+    "webHook": [IndexModel([("token", ASCENDING)], name="token")],
+    "contactUs": [IndexModel([("message", HASHED)], name="message_hashed")],
+    "token_epochs": [IndexModel([("updated_at", ASCENDING)], name="updated_at")],
+    "outbox": [
+        IndexModel(
+            [("status", ASCENDING), ("next_attempt_at", ASCENDING)],
+            name="status_next_attempt_at",
+        ),
+        IndexModel(
+            [("expires_at", ASCENDING)], name="expires_at", expireAfterSeconds=0
+        ),
+    ],
+    "github_cache": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at", expireAfterSeconds=0)
+    ],
+    "rate_limits": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at", expireAfterSeconds=0)
+    ],
+}
+
+
+def _same_index(existing: Dict[str, Any], declared: Dict[str, Any]) -> bool:
+    options = set(declared) - {"name", "key"}
+    return list(existing["key"]) == list(declared["key"].items()) and all(
+        existing.get(option) == declared[option] for option in options
+    )
+
+
+def ensure_indexes(db, prune: bool = False, dry_run: bool = False) -> List[str]:
+    """Create missing indexes and rebuild the ones whose definition changed.
+
+    Args:
+        db: pymongo database
+        prune (bool): drop indexes that are not declared
+        dry_run (bool): only report the actions
+
+    Returns:
+        List[str]: actions taken
+    """
+    actions = []
+    for collection, indexes in INDEXES.items():
+        existing = db[collection].index_information()
+        missing = []
+
+        for index in indexes:
+            declared = index.document
+            name = declared["name"]
+            if name not in existing:
+                missing.append(index)
+                actions.append(f"create {collection}.{name}")
+            elif not _same_index(existing[name], declared):
+                actions.append(f"rebuild {collection}.{name}")
+                if not dry_run:
+                    db[collection].drop_index(name)
+                missing.append(index)
+
+        if prune:
+            declared_names = {index.document["name"] for index in indexes}
+            for name in set(existing) - declared_names - {"_id_"}:
+                actions.append(f"drop {collection}.{name}")
+                if not dry_run:
+                    db[collection].drop_index(name)
+
+        if missing and not dry_run:
+            db[collection].create_indexes(missing)
+
+    return actions
+
+
+def _stages(plan: Any):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _stages(value)
+
+
+def _winning_plans(explained: Any):
+    """Winning plans of an explain output, pipelines and sharded
+    collections nest a query planner per cursor stage or shard"""
+    if isinstance(explained, dict):
+        if "queryPlanner" in explained:
+            yield explained["queryPlanner"]["winningPlan"]
+            return
+        for value in explained.values():
+            yield from _winning_plans(value)
+    elif isinstance(explained, list):
+        for value in explained:
+            yield from _winning_plans(value)
+
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    """Distinct queries recorded by `core.mongo.QueryRecorder`, every
+    worker records its own so shapes are deduplicated again.
+
+    Args:
+        path (str): recorded queries file
+
+    Returns:
+        List[Dict[str, Any]]: `collection` and the explainable `command`
+    """
+    queries, seen = [], set()
+    with open(path) as file:
+        for line in file:
+            query = json_util.loads(line)
+            shape = json.dumps(query_shape(query["command"]))
+            if shape not in seen:
+                seen.add(shape)
+                queries.append(query)
+    return queries
+
+
+def _filter(command: Dict[str, Any]) -> Dict[str, Any]:
+    name = next(iter(command))
+    if name == "find":
+        return command.get("filter", {})
+    if name == "aggregate":
+        pipeline = command["pipeline"]
+        return pipeline[0]["$match"] if pipeline and "$match" in pipeline[0] else {}
+    if name in ("update", "delete"):
+        return command[f"{name}s"][0]["q"]
+    return command.get("query", {})
+
+
+def _lookups(command: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Finds run against the joined collection by the `$lookup` stages,
+    explaining the pipeline itself does not plan them"""
+    for stage in command.get("pipeline", []):
+        lookup = stage.get("$lookup")
+        if lookup is None:
+            continue
+        if "foreignField" in lookup:
+            yield {
+                "collection": lookup["from"],
+                "command": {
+                    "find": lookup["from"],
+                    "filter": {lookup["foreignField"]: ""},
+                },
+            }
+        elif lookup.get("pipeline") and "$match" in lookup["pipeline"][0]:
+            match = lookup["pipeline"][0]["$match"]
+            # correlated matches are only known per joined document
+            if "$expr" not in match:
+                yield {
+                    "collection": lookup["from"],
+                    "command": {"find": lookup["from"], "filter": match},
+                }
+
+
+def find_collscans(db, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Explain every query and the finds of its `$lookup` stages and
+    collect the ones that fall back to a collection scan. Queries without
+    a filter read the whole collection on purpose and are not reported.
+
+    Args:
+        db: pymongo database
+        queries (List[Dict[str, Any]]): see `load_queries`
+
+    Returns:
+        List[Dict[str, Any]]: offending queries
+    """
+    offending = []
+    for query in queries:
+        for explained in (query, *_lookups(query["command"])):
+            if not _filter(explained["command"]):
+                continue
+            plan = db.command("explain", explained["command"], verbosity="queryPlanner")
+            if "COLLSCAN" in _stages(list(_winning_plans(plan))):
+                offending.append(explained)
+    return offending
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.outbox import outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver due email and SNS messages from the outbox"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--loop",
+            type=float,
+            metavar="SECONDS",
+            help="keep draining, sleeping this long whenever nothing is due",
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="retry dead-lettered messages first",
+        )
+        parser.add_argument(
+            "--stats", action="store_true", help="only print messages per status"
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["stats"]:
+            for status, count in outbox.stats().items():
+                self.stdout.write(f"{status}: {count}")
+            return
+
+        if options["requeue_dead"]:
+            self.stdout.write(f"requeued {outbox.requeue_dead()} dead messages")
+
+        while True:
+            result = outbox.drain()
+            if any(result.values()):
+                self.stdout.write(
+                    "sent {sent}, retried {retried}, dead-lettered {dead}".format(
+                        **result
+                    )
+                )
+            if not options["loop"]:
+                return
+            time.sleep(options["loop"])
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.indexes import ensure_indexes, find_collscans, load_queries
+from core.mongo import registry
+
+
+class Command(BaseCommand):
+    help = "Create and reconcile the declared MongoDB indexes"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--prune", action="store_true", help="drop indexes that are not declared"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="only print the planned actions"
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="explain every recorded query and fail on collection scans",
+        )
+        parser.add_argument(
+            "--queries",
+            default=settings.DATABASE["record_queries"],
+            help="queries recorded by the server, defaults to MONGO_RECORD_QUERIES",
+        )
+
+    def handle(self, *args, **options) -> None:
+        db = registry.db
+        actions = ensure_indexes(db, prune=options["prune"], dry_run=options["dry_run"])
+        for action in actions:
+            self.stdout.write(action)
+        if not actions:
+            self.stdout.write("indexes up to date")
+
+        if options["check"]:
+            if options["dry_run"]:
+                raise CommandError("--check needs the indexes, drop --dry-run")
+            if not options["queries"]:
+                raise CommandError("--check needs the queries recorded by the server")
+            offending = find_collscans(db, load_queries(options["queries"]))
+            for query in offending:
+                self.stderr.write(f"COLLSCAN {query['collection']}: {query['command']}")
+            if offending:
+                raise CommandError(f"{len(offending)} queries scan a collection")
+            self.stdout.write(self.style.SUCCESS("all recorded queries use an index"))
@@ -1,150 +1,183 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from administrator import jwt_keys
-from administrator.utils import get_token
 from apis.utils import check_token
+from asgiref.sync import sync_to_async
 from django.http.response import JsonResponse
-from maintainer.models import Entry
 
+from .epochs import token_epochs
 from .errorfactory import AuthenticationErrors
 
-maintainer_entry = Entry()
-maintainer_entry = maintainer_entry.db
 
+class CheckMiddleware:
+    """
+    Middleware running `check` before the view, usable from both the
+    WSGI and ASGI handlers so async views are not pushed onto a thread.
+    Checks doing network or database I/O set `blocking` to run off the
+    event loop.
+    """
 
-class Authorize:
-    def __init__(self, view) -> None:
-        """
-        Initialize requirements
-        """
+    sync_capable = True
+    async_capable = True
+    blocking = False
 
-        self.protected = [
-            "/admin/projects",
-            "/admin/projects/accepted",
-            "/maintainer/projects",
-        ]
+    def __init__(self, view) -> None:
         self.view = view
+        if asyncio.iscoroutinefunction(view):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
 
-    def __call__(self, request) -> JsonResponse:
-        """Middleware to check valid protection
+    def check(self, request) -> Optional[JsonResponse]:
+        return None
 
-        Args:
-            request
+    def __call__(self, request, **kwargs) -> JsonResponse:
+        if asyncio.iscoroutinefunction(self.view):
+            return self.__acall__(request)
+        return self.check(request) or self.view(request)
 
-        Returns:
-            response.Response
-        """
-        if request.path in self.protected:
-            if value := get_token(request_header=request.headers):
-                token_type, token = value
-                try:
-                    assert token_type == "Bearer"
-                except AssertionError:
-                    return JsonResponse(
-                        data={"error": "invalid token type"}, status=401
-                    )
-                try:
-                    decoded = jwt_keys.verify_key(key=token)
-                    role = jwt_keys.verify_role(key=token, path=request.path)
-                    if not role:
-                        raise AuthenticationErrors()
-                except AuthenticationErrors:
-                    return JsonResponse(data={"error": "Invalid key!"}, status=401)
-                request.decoded = decoded
-                return self.view(request)
-
-            return JsonResponse(data={"error": "token error"}, status=401)
-
-        return self.view(request)
-
-
-class MeVerification:
-    def __init__(self, view):
-        self.view = view
-        self.protected = [
-            "/admin/projects",
-            "/admin/projects/accepted",
-            "/maintainer/projects",
-            "/me",
-        ]
+    def is_blocking(self, request) -> bool:
+        return self.blocking
 
-    def __call__(self, request, **kwargs) -> JsonResponse:
-        """Me verification
+    async def __acall__(self, request) -> JsonResponse:
+        if self.is_blocking(request):
+            response = await sync_to_async(self.check, thread_sensitive=False)(request)
+        else:
+            response = self.check(request)
+        return response or await self.view(request)
 
-        Args:
-            request
 
-        Returns:
-            JsonResponse
-        """
-        if request.path in self.protected:
-            token = get_token(request_header=request.headers)
-            try:
-                if token:
-                    token_type, token = token
-                    assert token_type == "Bearer"
-                else:
-                    return JsonResponse(data={"error": "No token provided"}, status=401)
-            except AssertionError:
-                return JsonResponse(data={"error": "Invalid token type"}, status=401)
-
-            try:
-                decoded = jwt_keys.verify_key(key=token)
-            except AuthenticationErrors:
-                return JsonResponse(data={"error": "Invalid key!"}, status=401)
-
-            request.decoded = decoded
-            admin = decoded.get("admin")
-            if admin:
-                return self.view(request)
-            else:
-                email = decoded.get("email")
-                project_ids = decoded.get("project_id")
-                total_items = maintainer_entry.maintainer.count_documents(
-                    {"email": email, "is_admin_approved": True}
-                )
+Policy = Callable[[Any], Optional[JsonResponse]]
 
-            if len(project_ids) != total_items:
-                return JsonResponse(data={"error": "Key expired"}, status=401)
-            request.project_ids, request.total_items = project_ids, total_items
-            return self.view(request)
-        return self.view(request)
+METHODS = ("GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE")
+BODY_METHODS = ("POST", "DELETE")
 
+# Paths needing a token whose role matches the path
+ROLE_PATHS = ("/admin/projects", "/admin/projects/accepted", "/maintainer/projects")
+# Paths needing a token that has not been revoked
+FRESH_PATHS = ROLE_PATHS + ("/me",)
 
-class ReCaptcha:
-    def __init__(self, view):
-        self.view = view
 
-    def __call__(self, request, **kwargs) -> JsonResponse:
-        """Recaptcha middleware
+def recaptcha(request) -> Optional[JsonResponse]:
+    try:
+        token = request.META["HTTP_X_RECAPTCHA_TOKEN"]
+    except KeyError:
+        return JsonResponse(data={"error": "recaptcha token not provided"}, status=401)
 
-        Args:
-            request
+    if check_token(token):
+        return None
+    return JsonResponse(data={"error": "invalid recaptcha token"}, status=401)
 
-        Returns:
-            JsonResponse
-        """
-        if request.method == "POST" or request.method == "DELETE":
-            try:
-                recaptcha = request.META["HTTP_X_RECAPTCHA_TOKEN"]
-            except KeyError as e:
-                return JsonResponse(
-                    data={"error": "recaptcha token not provided"}, status=401
-                )
 
-            if check_token(recaptcha):
-                return self.view(request)
+def json_content(request) -> Optional[JsonResponse]:
+    if "application/json" not in request.META.get("CONTENT_TYPE", "").split(";"):
+        return JsonResponse(data={"error": "content type should be json"}, status=415)
+    return None
+
 
-            return JsonResponse(data={"error": "invalid recaptcha token"}, status=401)
-        return self.view(request)
+def bearer(missing: str, wrong_type: str) -> Policy:
+    """Policy verifying the bearer token, verified claims are left on
+    `request.decoded`
 
+    Args:
+        missing (str): error when no token is sent
+        wrong_type (str): error when the token is not a bearer token
+
+    Returns:
+        Policy
+    """
+
+    def policy(request) -> Optional[JsonResponse]:
+        header = request.headers.get("Authorization") or ""
+        parts = header.split()
+        if len(parts) < 2:
+            return JsonResponse(data={"error": missing}, status=401)
+        if parts[0] != "Bearer":
+            return JsonResponse(data={"error": wrong_type}, status=401)
+        try:
+            jwt_keys.verify_request(request, parts[1])
+        except AuthenticationErrors:
+            return JsonResponse(data={"error": "Invalid key!"}, status=401)
+        return None
+
+    return policy
+
+
+def role(request) -> Optional[JsonResponse]:
+    if jwt_keys.verify_role(key=None, path=request.path, decoded=request.decoded):
+        return None
+    return JsonResponse(data={"error": "Invalid key!"}, status=401)
+
+
+def fresh(request) -> Optional[JsonResponse]:
+    decoded = request.decoded
+    if decoded.get("admin"):
+        return None
+
+    if not token_epochs.is_current(decoded.get("email"), decoded.get("epoch")):
+        return JsonResponse(data={"error": "Key expired"}, status=401)
+    project_ids = decoded.get("project_id")
+    request.project_ids, request.total_items = project_ids, len(project_ids)
+    return None
+
+
+def compile_routes() -> Dict[Tuple[str, str], Tuple[Policy, ...]]:
+    """Policy chain of every protected method and path, requests not in
+    the table only get the chain of their method.
+
+    Returns:
+        Dict[Tuple[str, str], Tuple[Policy, ...]]
+    """
+    routes = {}
+    for method in METHODS:
+        for path in FRESH_PATHS:
+            if path in ROLE_PATHS:
+                token = (bearer("token error", "invalid token type"), role)
+            else:
+                token = (bearer("No token provided", "Invalid token type"),)
+
+            if method in BODY_METHODS:
+                routes[method, path] = (recaptcha, *token, fresh, json_content)
+            else:
+                routes[method, path] = (*token, fresh)
+    return routes
+
+
+class Authentication(CheckMiddleware):
+    """
+    Captcha, content type, token, role and revocation checks in one
+    pass, the chain for each method and path is compiled once so
+    unprotected GETs go straight to the view.
+    """
 
-class JsonResponseCheck:
     def __init__(self, view) -> None:
-        self.view = view
+        super().__init__(view)
+        self.routes = compile_routes()
+        self.defaults = {method: () for method in METHODS}
+        for method in BODY_METHODS:
+            self.defaults[method] = (recaptcha, json_content)
+
+    def policies(self, request) -> Tuple[Policy, ...]:
+        # Other methods are checked like GET
+        method = request.method if request.method in self.defaults else "GET"
+        policies = self.routes.get((method, request.path))
+        if policies is None:
+            policies = self.defaults[method]
+        return policies
+
+    def is_blocking(self, request) -> bool:
+        # reCAPTCHA verification is a network call
+        return recaptcha in self.policies(request)
+
+    def check(self, request) -> Optional[JsonResponse]:
+        """Run the policy chain of the request
 
-    def __call__(self, request, **kwargs) -> JsonResponse:
-        if request.method == "POST" or request.method == "DELETE":
-            if "application/json" not in request.META["CONTENT_TYPE"].split(";"):
-                return JsonResponse(
-                    data={"error": "content type should be json"}, status=415
-                )
-        return self.view(request)
+        Args:
+            request
+
+        Returns:
+            Optional[JsonResponse]: error response, None to continue
+        """
+        for policy in self.policies(request):
+            if response := policy(request):
+                return response
+        return None
@@ -1,28 +1,136 @@
-import random
-import string
+from typing import Any, Callable, Dict, Optional
 
-import pymongo
-from django.conf import settings
+from pymongo.errors import DuplicateKeyError
+
+from .ids import allocator, is_id_collision
+from .mongo import async_registry, registry
+
+
+def only(*fields: str) -> Dict[str, int]:
+    """Projection for the fields a read needs, `_id` is left out unless
+    asked for so reads on indexed fields can be covered by the index.
+
+    Args:
+        fields (str): field names
+
+    Returns:
+        Dict[str, int]
+    """
+    return {"_id": 0, **{field: 1 for field in fields}}
 
 
 class BaseModel:
-    def __init__(self) -> None:
+    @property
+    def db(self):
+        """
+        Database on the process wide shared client
+        """
+
+        return registry.db
+
+    def get_uid(self) -> str:
+        """Generate an ID locally, uniqueness is left to the `_id` index.
+        Prefer `insert_with_uid` which retries on collisions.
+
+        Returns:
+            str
+        """
+        return allocator.new_id()
+
+    def insert_with_uid(self, collection: str, doc: dict, session=None) -> str:
+        """Insert into collection with a generated `_id`
+
+        Args:
+            collection (str): collection name
+            doc (dict): document without `_id`
+            session: optional client session
+
+        Returns:
+            str: inserted `_id`
+        """
+        return allocator.insert(self.db[collection], doc, session=session)
+
+    def run_transaction(
+        self,
+        callback: Callable[[Any], Any],
+        compensate: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """Run `callback(session)` in a multi-document transaction. Transient
+        errors are retried by the driver, `_id` collisions by running the
+        callback again with fresh IDs, so it must be safe to call twice.
+
+        Standalone servers have no transactions, `callback(None)` runs
+        without one and `compensate` undoes its writes if it raises.
+
+        Args:
+            callback (Callable[[Any], Any]): writes, takes the session
+            compensate (Optional[Callable[[], None]]): undo on standalone servers
+
+        Returns:
+            Any: callback result
+        """
+        if not registry.supports_transactions:
+            try:
+                return callback(None)
+            except Exception:
+                if compensate:
+                    compensate()
+                raise
+
+        with registry.client.start_session() as session:
+            for _ in range(allocator.max_retries):
+                try:
+                    return session.with_transaction(callback)
+                except DuplicateKeyError as e:
+                    if not is_id_collision(e.details or {}):
+                        raise
+        raise DuplicateKeyError("could not allocate a unique _id")
+
+
+class AsyncBaseModel:
+    @property
+    def db(self):
         """
-        Connect to mongodb
+        Motor database on the process wide shared async client
         """
 
-        client = pymongo.MongoClient(settings.DATABASE["mongo_uri"])
-        self.db = client[settings.DATABASE["db"]]
+        return async_registry.db
 
     def get_uid(self) -> str:
-        # Todo: Find more efficient way for 4 byte uuid generation
-        gen_id = random.choices(string.ascii_uppercase + string.digits, k=8)
+        return allocator.new_id()
+
+    async def insert_with_uid(self, collection: str, doc: dict, session=None) -> str:
+        """Insert into collection with a generated `_id`
+
+        Args:
+            collection (str): collection name
+            doc (dict): document without `_id`
+            session: optional client session
+
+        Returns:
+            str: inserted `_id`
+        """
+        return await allocator.insert_async(self.db[collection], doc, session=session)
 
-        if (
-            self.db.project.find_one({"_id": gen_id})
-            or self.db.contributor.find_one({"_id": gen_id})
-            or self.db.maintainer.find_one({"_id": gen_id})
-        ):
-            return self.get_uid()
+    async def run_transaction(
+        self,
+        callback: Callable[[Any], Any],
+        compensate: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """`BaseModel.run_transaction` with coroutine callbacks"""
+        if not await async_registry.supports_transactions_async():
+            try:
+                return await callback(None)
+            except Exception:
+                if compensate:
+                    await compensate()
+                raise
 
-        return "".join(gen_id)
+        async with await async_registry.client.start_session() as session:
+            for _ in range(allocator.max_retries):
+                try:
+                    return await session.with_transaction(callback)
+                except DuplicateKeyError as e:
+                    if not is_id_collision(e.details or {}):
+                        raise
+        raise DuplicateKeyError("could not allocate a unique _id")
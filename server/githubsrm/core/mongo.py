@@ -0,0 +1,356 @@
+"""
+Process wide MongoClient registry, every model shares the same client
+and connection pool instead of opening one per instance.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+import bson
+import pymongo
+from bson import json_util
+from django.conf import settings
+from pymongo import monitoring
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters for the current worker."""
+
+    def __init__(self) -> None:
+        # events are published from the monitor and application threads
+        self._lock = threading.Lock()
+        self.counters = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checked_out": 0,
+            "checked_in": 0,
+            "checkout_failed": 0,
+        }
+
+    def _incr(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        self._incr("connections_created")
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self._incr("connections_closed")
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        self._incr("checkout_failed")
+
+    def connection_checked_out(self, event) -> None:
+        self._incr("checked_out")
+
+    def connection_checked_in(self, event) -> None:
+        self._incr("checked_in")
+
+
+class CommandStats(monitoring.CommandListener):
+    """Command and reply size counters for the current worker, in total
+    and per collection and command. Encoding every reply again costs CPU
+    so it is only enabled through `DATABASE["command_stats"]`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[Any, int], str] = {}
+        self.counters = {"commands": 0, "bytes_received": 0}
+        self.collections: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def _collection(event) -> Optional[str]:
+        if event.command_name == "getMore":
+            return event.command.get("collection")
+        name = event.command.get(event.command_name)
+        return name if isinstance(name, str) else None
+
+    def _record(self, event, size: int) -> None:
+        with self._lock:
+            self.counters["commands"] += 1
+            self.counters["bytes_received"] += size
+            collection = self._pending.pop(
+                (event.connection_id, event.request_id), None
+            )
+            if collection is not None:
+                counters = self.collections.setdefault(
+                    collection, {"bytes_received": 0}
+                )
+                counters[event.command_name] = counters.get(event.command_name, 0) + 1
+                counters["bytes_received"] += size
+
+    def started(self, event) -> None:
+        collection = self._collection(event)
+        if collection is not None:
+            with self._lock:
+                self._pending[(event.connection_id, event.request_id)] = collection
+
+    def succeeded(self, event) -> None:
+        self._record(event, len(bson.encode(event.reply)))
+
+    def failed(self, event) -> None:
+        self._record(event, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters,
+                "collections": {
+                    name: dict(counters) for name, counters in self.collections.items()
+                },
+            }
+
+
+def query_shape(value: Any) -> Any:
+    """`value` with every leaf replaced by its type name and lists cut to
+    their first item, queries differing only in values share a shape"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [query_shape(item) for item in value[:1]]
+    return type(value).__name__
+
+
+class QueryRecorder(monitoring.CommandListener):
+    """Appends every distinct query shape the worker runs to a file as
+    extended JSON lines, `ensure_indexes --check` explains them. Enabled
+    through `DATABASE["record_queries"]` for the test runs."""
+
+    # explainable commands and the fields they are explained with
+    FIELDS = {
+        "find": ("filter", "sort", "projection", "hint", "skip", "limit"),
+        "aggregate": ("pipeline", "hint"),
+        "count": ("query", "hint"),
+        "distinct": ("key", "query"),
+        "findAndModify": (
+            "query",
+            "sort",
+            "update",
+            "remove",
+            "upsert",
+            "new",
+            "fields",
+        ),
+        "update": ("updates",),
+        "delete": ("deletes",),
+    }
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): file the shapes are appended to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._seen: Set[str] = set()
+
+    def _commands(self, event):
+        fields = self.FIELDS.get(event.command_name)
+        collection = event.command.get(event.command_name)
+        if fields is None or not isinstance(collection, str):
+            return
+        command = {event.command_name: collection}
+        command.update(
+            (field, event.command[field]) for field in fields if field in event.command
+        )
+        if event.command_name == "aggregate":
+            if any("$changeStream" in stage for stage in command["pipeline"]):
+                return
+            command["cursor"] = {}
+        # explain takes a single write statement
+        for field in ("updates", "deletes"):
+            if field in command:
+                for statement in command[field]:
+                    yield collection, {**command, field: [statement]}
+                return
+        yield collection, command
+
+    def started(self, event) -> None:
+        for collection, command in self._commands(event):
+            shape = json.dumps(query_shape(command))
+            with self._lock:
+                if shape in self._seen:
+                    continue
+                self._seen.add(shape)
+                with open(self.path, "a") as file:
+                    file.write(
+                        json_util.dumps({"collection": collection, "command": command})
+                        + "\n"
+                    )
+
+    def succeeded(self, event) -> None:
+        pass
+
+    def failed(self, event) -> None:
+        pass
+
+
+class MongoRegistry:
+    def __init__(self) -> None:
+        """
+        Clients are created lazily on first use and dropped after a fork,
+        pymongo clients must never be shared between parent and child.
+        """
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._client = None
+        self._db = None
+        self._stats = PoolStats()
+        self._commands = CommandStats()
+        self._queries = None
+        self._transactions = None
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._client = None
+        self._db = None
+        self._stats = PoolStats()
+        self._commands = CommandStats()
+        self._transactions = None
+
+    @staticmethod
+    def _is_transactional(hello: Dict[str, Any]) -> bool:
+        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+    def _listeners(self) -> list:
+        listeners = [self._stats]
+        if settings.DATABASE["command_stats"]:
+            listeners.append(self._commands)
+        if settings.DATABASE["record_queries"]:
+            if self._queries is None:
+                self._queries = QueryRecorder(settings.DATABASE["record_queries"])
+            listeners.append(self._queries)
+        return listeners
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    @property
+    def client(self) -> pymongo.MongoClient:
+        """Shared client for the current worker
+
+        Returns:
+            pymongo.MongoClient
+        """
+        self._check_pid()
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = pymongo.MongoClient(
+                        settings.DATABASE["mongo_uri"],
+                        maxPoolSize=settings.DATABASE["max_pool_size"],
+                        waitQueueTimeoutMS=settings.DATABASE["wait_queue_timeout_ms"],
+                        event_listeners=self._listeners(),
+                    )
+        return self._client
+
+    @property
+    def db(self) -> Any:
+        """Configured database on the shared client
+
+        Returns:
+            pymongo.database.Database
+        """
+        self._check_pid()
+        if self._db is None:
+            self._db = self.client[settings.DATABASE["db"]]
+        return self._db
+
+    @property
+    def supports_transactions(self) -> bool:
+        """Replica set or mongos, standalone servers reject transactions
+
+        Returns:
+            bool
+        """
+        self._check_pid()
+        if self._transactions is None:
+            hello = self.client.admin.command("ismaster")
+            self._transactions = self._is_transactional(hello)
+        return self._transactions
+
+    def stats(self) -> Dict[str, Any]:
+        """Per worker client stats
+
+        Returns:
+            Dict[str, Any]: pool and command counters tagged with the worker pid
+        """
+        self._check_pid()
+        return {
+            "pid": self._pid,
+            "connected": self._client is not None,
+            **self._stats.snapshot(),
+            **self._commands.snapshot(),
+        }
+
+
+class AsyncMongoRegistry(MongoRegistry):
+    """
+    Motor counterpart of the registry for the async views, motor is only
+    imported when the first async model touches the database.
+    """
+
+    @property
+    def client(self) -> Any:
+        """Shared motor client for the current worker
+
+        Returns:
+            motor.motor_asyncio.AsyncIOMotorClient
+        """
+        self._check_pid()
+        if self._client is None:
+            from motor.motor_asyncio import AsyncIOMotorClient
+
+            with self._lock:
+                if self._client is None:
+                    self._client = AsyncIOMotorClient(
+                        settings.DATABASE["mongo_uri"],
+                        maxPoolSize=settings.DATABASE["max_pool_size"],
+                        waitQueueTimeoutMS=settings.DATABASE["wait_queue_timeout_ms"],
+                        event_listeners=self._listeners(),
+                    )
+        return self._client
+
+    async def supports_transactions_async(self) -> bool:
+        """`supports_transactions` without blocking the event loop
+
+        Returns:
+            bool
+        """
+        self._check_pid()
+        if self._transactions is None:
+            hello = await self.client.admin.command("ismaster")
+            self._transactions = self._is_transactional(hello)
+        return self._transactions
+
+
+registry = MongoRegistry()
+async_registry = AsyncMongoRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=registry._reset)
+    os.register_at_fork(after_in_child=async_registry._reset)
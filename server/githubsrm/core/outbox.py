@@ -0,0 +1,251 @@
+"""
+Durable outbox for emails and SNS notifications. Messages are written
+in the same transaction as the submission they belong to and delivered
+afterwards by `Outbox.dispatch`, from the notification workers right
+after the request and from the `drain_outbox` management command.
+
+Every message has an idempotency key derived from the document it is
+about, enqueueing it twice keeps one message. A dispatcher claims a
+message by pushing its `next_attempt_at` one lease ahead, so concurrent
+dispatchers never send the same message twice unless one of them dies
+mid-delivery. Failed deliveries are retried with exponential backoff
+and dead-lettered after `max_attempts`.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+
+from .aws import BotoService, notifier, service
+from .models import BaseModel
+from .mongo import async_registry
+
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+
+# message kind -> BotoService method
+HANDLERS = {"email": "wrapper_email", "sns": "sns"}
+
+
+class Outbox(BaseModel):
+    collection = "outbox"
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return settings.OUTBOX
+
+    @property
+    def service(self) -> BotoService:
+        return service
+
+    @staticmethod
+    def email(key: str, role: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Outbox message for `service.wrapper_email`
+
+        Args:
+            key (str): idempotency key
+            role (str): email role, see email_statics.json
+            data (Dict[str, Any]): template data with the recipient `email`
+
+        Returns:
+            Dict[str, Any]
+        """
+        return {
+            "_id": key,
+            "kind": "email",
+            "payload": {"role": role, "data": data},
+        }
+
+    @staticmethod
+    def sns(key: str, payload: Dict[str, str]) -> Dict[str, Any]:
+        """Outbox message for `service.sns`
+
+        Args:
+            key (str): idempotency key
+            payload (Dict[str, str]): SNSpayload
+
+        Returns:
+            Dict[str, Any]
+        """
+        return {"_id": key, "kind": "sns", "payload": {"payload": payload}}
+
+    @staticmethod
+    def _upserts(messages: List[Dict[str, Any]]) -> List[UpdateOne]:
+        now = datetime.utcnow()
+        return [
+            UpdateOne(
+                {"_id": message["_id"]},
+                {
+                    "$setOnInsert": {
+                        **message,
+                        "status": PENDING,
+                        "attempts": 0,
+                        "created_at": now,
+                        "next_attempt_at": now,
+                    }
+                },
+                upsert=True,
+            )
+            for message in messages
+        ]
+
+    def enqueue(self, messages: List[Dict[str, Any]], session=None) -> None:
+        """Write messages, keys already in the outbox are left alone
+
+        Args:
+            messages (List[Dict[str, Any]]): from `email` and `sns`
+            session: session of the surrounding transaction
+        """
+        if messages:
+            self.db[self.collection].bulk_write(
+                self._upserts(messages), ordered=False, session=session
+            )
+
+    async def enqueue_async(self, messages: List[Dict[str, Any]], session=None) -> None:
+        """Motor counterpart of `enqueue` for the async models
+
+        Args:
+            messages (List[Dict[str, Any]]): from `email` and `sns`
+            session: motor session of the surrounding transaction
+        """
+        if messages:
+            await async_registry.db[self.collection].bulk_write(
+                self._upserts(messages), ordered=False, session=session
+            )
+
+    def _claim(self, now: datetime) -> Optional[Dict[str, Any]]:
+        return self.db[self.collection].find_one_and_update(
+            {"status": PENDING, "next_attempt_at": {"$lte": now}},
+            {
+                "$set": {
+                    "next_attempt_at": now
+                    + timedelta(seconds=self.config["lease_seconds"]),
+                    "lease": uuid.uuid4().hex,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def _deliver(self, message: Dict[str, Any]) -> Optional[str]:
+        handler = getattr(self.service, HANDLERS[message["kind"]])
+        try:
+            if handler(**message["payload"]):
+                return None
+            return "delivery failed"
+        except Exception as e:
+            return repr(e)
+
+    def dispatch(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """Deliver one batch of due messages
+
+        Args:
+            limit (Optional[int]): defaults to `batch_size`
+
+        Returns:
+            Dict[str, int]: sent, retried and dead-lettered messages
+        """
+        config = self.config
+        result = {"sent": 0, "retried": 0, "dead": 0}
+
+        for _ in range(limit or config["batch_size"]):
+            message = self._claim(datetime.utcnow())
+            if message is None:
+                break
+
+            error = self._deliver(message)
+            now = datetime.utcnow()
+            if error is None:
+                outcome = "sent"
+                update = {
+                    "status": SENT,
+                    "sent_at": now,
+                    "expires_at": now + timedelta(seconds=config["retention_seconds"]),
+                }
+            elif message["attempts"] >= config["max_attempts"]:
+                outcome = "dead"
+                update = {"status": DEAD, "error": error}
+            else:
+                outcome = "retried"
+                backoff = config["backoff_seconds"] * 2 ** (message["attempts"] - 1)
+                update = {
+                    "next_attempt_at": now + timedelta(seconds=backoff),
+                    "error": error,
+                }
+
+            # a dispatcher whose lease ran out must not overwrite the next one
+            self.db[self.collection].update_one(
+                {"_id": message["_id"], "lease": message["lease"]},
+                {"$set": update, "$unset": {"lease": ""}},
+            )
+            result[outcome] += 1
+
+        return result
+
+    def drain(self) -> Dict[str, int]:
+        """Dispatch batches until nothing is due
+
+        Returns:
+            Dict[str, int]: totals of `dispatch`
+        """
+        totals = {"sent": 0, "retried": 0, "dead": 0}
+        while True:
+            result = self.dispatch()
+            for outcome, count in result.items():
+                totals[outcome] += count
+            if sum(result.values()) < self.config["batch_size"]:
+                return totals
+
+    def kick(self, wait: bool = True) -> None:
+        """Dispatch on the notification workers, called once a request
+        has committed its messages.
+
+        Args:
+            wait (bool): wait for room in a full queue, async views must
+                not block the event loop. Messages of a dropped kick go out
+                with the next one or through `drain_outbox`.
+        """
+        if wait:
+            notifier.submit(self.dispatch)
+        else:
+            notifier.submit_nowait(self.dispatch)
+
+    def requeue_dead(self) -> int:
+        """Give dead-lettered messages a fresh set of attempts
+
+        Returns:
+            int: requeued messages
+        """
+        return (
+            self.db[self.collection]
+            .update_many(
+                {"status": DEAD},
+                {
+                    "$set": {
+                        "status": PENDING,
+                        "attempts": 0,
+                        "next_attempt_at": datetime.utcnow(),
+                    }
+                },
+            )
+            .modified_count
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Messages per status
+
+        Returns:
+            Dict[str, int]
+        """
+        return {
+            status: self.db[self.collection].count_documents({"status": status})
+            for status in (PENDING, SENT, DEAD)
+        }
+
+
+outbox = Outbox()
@@ -0,0 +1,137 @@
+"""
+Password hashing off the request thread. Hashes are derived in a small
+process pool so concurrent logins do not starve the worker, and are
+stored as `algorithm$params$salt$hash` so the algorithm and cost can be
+changed with existing hashes upgraded on the next successful login.
+"""
+
+import binascii
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+
+LEGACY_ITERATIONS = 100000
+
+
+def _derive(algorithm: str, params: Tuple[int, ...], password: str, salt: str) -> str:
+    """Hex digest of the password, runs in the pool processes
+
+    Args:
+        algorithm (str): `pbkdf2_sha512` or `scrypt`
+        params (Tuple[int, ...]): (iterations,) or (n, r, p)
+        password (str): plain text password
+        salt (str): ascii salt
+
+    Returns:
+        str
+    """
+    password, salt = password.encode("utf-8"), salt.encode("ascii")
+    if algorithm == "pbkdf2_sha512":
+        digest = hashlib.pbkdf2_hmac("sha512", password, salt, params[0])
+    elif algorithm == "scrypt":
+        n, r, p = params
+        digest = hashlib.scrypt(
+            password, salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 2**20
+        )
+    else:
+        raise ValueError(f"unknown password hash algorithm {algorithm}")
+    return binascii.hexlify(digest).decode("ascii")
+
+
+class PasswordHasher:
+    def __init__(self) -> None:
+        """
+        The pool is created on first use, dropped after a fork and sized
+        by `PASSWORD_HASHING["workers"]`, zero hashes on the calling
+        thread.
+        """
+        self._lock = threading.Lock()
+        self._pid = None
+        self._pool = None
+        self._pending = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return settings.PASSWORD_HASHING
+
+    def _params(self) -> Tuple[str, Tuple[int, ...]]:
+        algorithm = self.config["algorithm"]
+        if algorithm == "scrypt":
+            return algorithm, (self.config["n"], self.config["r"], self.config["p"])
+        return algorithm, (self.config["iterations"],)
+
+    def _run(self, *args) -> str:
+        if not self.config["workers"]:
+            return _derive(*args)
+
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # Processes are spawned, forking a threaded server is unsafe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.config["workers"],
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    self._pending = threading.BoundedSemaphore(
+                        self.config["max_pending"]
+                    )
+                    self._pid = os.getpid()
+
+        with self._pending:
+            return self._pool.submit(_derive, *args).result()
+
+    @staticmethod
+    def _decode(encoded: str) -> Tuple[str, Tuple[int, ...], str, str]:
+        if "$" not in encoded:
+            # Hashes stored before the format carried its parameters
+            return "pbkdf2_sha512", (LEGACY_ITERATIONS,), encoded[:64], encoded[64:]
+        algorithm, params, salt, digest = encoded.split("$")
+        return algorithm, tuple(int(i) for i in params.split(",")), salt, digest
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured algorithm and cost
+
+        Args:
+            password (str): plain text password
+
+        Returns:
+            str: encoded hash
+        """
+        algorithm, params = self._params()
+        salt = hashlib.sha256(os.urandom(60)).hexdigest()
+        digest = self._run(algorithm, params, password, salt)
+        return "$".join([algorithm, ",".join(map(str, params)), salt, digest])
+
+    def verify(self, password: str, encoded: str) -> bool:
+        """Check a password against an encoded hash
+
+        Args:
+            password (str): plain text password
+            encoded (str): stored hash
+
+        Returns:
+            bool
+        """
+        algorithm, params, salt, digest = self._decode(encoded)
+        return hmac.compare_digest(self._run(algorithm, params, password, salt), digest)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Whether the hash was made with other parameters than the
+        configured ones
+
+        Args:
+            encoded (str): stored hash
+
+        Returns:
+            bool
+        """
+        return "$" not in encoded or self._decode(encoded)[:2] != self._params()
+
+
+passwords = PasswordHasher()
@@ -38,6 +38,7 @@ else:
 ALLOWED_HOSTS = ["*"]
 USE_DATABASE = "MONGO" if DEBUG is False else "TEST"
 TRIGGER_AWS = False if DEBUG else True
+ASYNC_VIEWS = True if os.getenv("ASYNC_VIEWS") else False
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "rest_framework",
     "corsheaders",
+    "core",
     "apis",
     "administrator",
     "maintainer",
@@ -61,10 +63,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "core.middleware.ReCaptcha",
-    "core.middleware.Authorize",
-    "core.middleware.MeVerification",
-    "core.middleware.JsonResponseCheck",
+    "core.middleware.Authentication",
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -115,6 +114,15 @@ else:
 
 from .throttle import PostThrottle
 
+# PostThrottle counters, see core.throttle. core.throttle.LocalRateLimiter
+# keeps them per worker.
+RATE_LIMIT = {
+    "BACKEND": os.getenv("RATE_LIMIT_BACKEND", "core.throttle.MongoRateLimiter"),
+    # Local counters are used right away once the backend failed this often
+    "failure_threshold": int(os.getenv("RATE_LIMIT_FAILURE_THRESHOLD", 1)),
+    "reset_timeout": float(os.getenv("RATE_LIMIT_RESET_TIMEOUT", 10)),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -135,6 +143,121 @@ if USE_DATABASE == "MONGO":
 else:
     DATABASE = {"mongo_uri": os.getenv("MONGO_URI"), "db": os.getenv("TEST_MONGO_DB")}
 
+# Shared client pool, see core.mongo
+DATABASE["max_pool_size"] = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+DATABASE["wait_queue_timeout_ms"] = (
+    int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS"))
+    if os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+    else None
+)
+# Count commands and reply bytes per collection, exposed by the health check
+DATABASE["command_stats"] = DEBUG or bool(os.getenv("MONGO_COMMAND_STATS"))
+# Append every distinct query shape to this file, checked for collection
+# scans by `ensure_indexes --check`
+DATABASE["record_queries"] = os.getenv("MONGO_RECORD_QUERIES")
+
+# Shared Django cache, e.g. redis or memcached, used by the
+# core.cache.DjangoCacheBackend caches.
+if os.getenv("CACHE_BACKEND"):
+    CACHES = {
+        "default": {
+            "BACKEND": os.getenv("CACHE_BACKEND"),
+            "LOCATION": os.getenv("CACHE_LOCATION", ""),
+        }
+    }
+
+# Public project listing, see core.cache
+PROJECT_LISTING_CACHE = {
+    "BACKEND": os.getenv("PROJECT_LISTING_CACHE_BACKEND", "core.cache.LocalLRUBackend"),
+    "OPTIONS": {"timeout": int(os.getenv("PROJECT_LISTING_CACHE_TIMEOUT", 60))},
+    # Larger listings are streamed on every request instead of cached
+    "MAX_ENTRY_SIZE": 4 * 1024 * 1024,
+}
+
+# Seconds before a token epoch bumped by another worker is seen, see core.epochs
+TOKEN_EPOCHS = {"refresh_interval": float(os.getenv("TOKEN_EPOCH_REFRESH", 5))}
+# Verified tokens cached per worker, see administrator.issue_jwt
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 1024))
+# Seconds the approved projects of a refreshing maintainer are reused
+REFRESH_PROJECTS_CACHE_TIMEOUT = float(os.getenv("REFRESH_PROJECTS_CACHE_TIMEOUT", 10))
+
+# Password hashing, see core.passwords. Changing the algorithm or cost
+# upgrades stored hashes on the next login.
+PASSWORD_HASHING = {
+    "algorithm": os.getenv("PASSWORD_HASH_ALGORITHM", "pbkdf2_sha512"),
+    "iterations": int(os.getenv("PASSWORD_HASH_ITERATIONS", 100000)),
+    "n": int(os.getenv("PASSWORD_HASH_SCRYPT_N", 2**14)),
+    "r": int(os.getenv("PASSWORD_HASH_SCRYPT_R", 8)),
+    "p": int(os.getenv("PASSWORD_HASH_SCRYPT_P", 1)),
+    "workers": int(os.getenv("PASSWORD_HASH_WORKERS", 2)),
+    "max_pending": int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32)),
+}
+
+# Shared boto3 clients, see core.aws
+AWS = {
+    "enabled": TRIGGER_AWS,
+    "region": os.getenv("AWS_REGION", "ap-south-1"),
+    "endpoint_url": os.getenv("AWS_ENDPOINT_URL"),
+    "max_pool_connections": int(os.getenv("AWS_MAX_POOL_CONNECTIONS", 10)),
+    # SES stored templates used for bulk emails
+    "template_prefix": os.getenv("SES_TEMPLATE_PREFIX", "githubsrm"),
+    "bulk_max_attempts": int(os.getenv("SES_BULK_MAX_ATTEMPTS", 3)),
+    "bulk_backoff_seconds": float(os.getenv("SES_BULK_BACKOFF_SECONDS", 1)),
+}
+
+# Notification worker pool, see core.aws.NotificationExecutor
+NOTIFICATIONS = {
+    "workers": int(os.getenv("NOTIFICATION_WORKERS", 4)),
+    "max_queue": int(os.getenv("NOTIFICATION_MAX_QUEUE", 1000)),
+    "submit_timeout": float(os.getenv("NOTIFICATION_SUBMIT_TIMEOUT", 0.5)),
+    "drain_timeout": float(os.getenv("NOTIFICATION_DRAIN_TIMEOUT", 10)),
+}
+
+# Email templates compiled at startup, see core.email_templates
+EMAIL_TEMPLATES = {
+    "folder": os.path.join(BASE_DIR, "apis", "templates"),
+    # defaults to a per user directory under the system temp dir
+    "bytecode_cache": os.getenv("EMAIL_TEMPLATE_CACHE_DIR"),
+}
+
+# Email and SNS outbox, see core.outbox
+OUTBOX = {
+    "batch_size": int(os.getenv("OUTBOX_BATCH_SIZE", 50)),
+    "max_attempts": int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8)),
+    "backoff_seconds": float(os.getenv("OUTBOX_BACKOFF_SECONDS", 30)),
+    "lease_seconds": float(os.getenv("OUTBOX_LEASE_SECONDS", 60)),
+    "retention_seconds": int(os.getenv("OUTBOX_RETENTION_SECONDS", 7 * 24 * 60 * 60)),
+}
+
+# reCAPTCHA verification, see apis.recaptcha
+RECAPTCHA = {
+    "secret": os.getenv("RECAPTCHA_SECRET_KEY"),
+    "verify_url": os.getenv(
+        "RECAPTCHA_VERIFY_URL", "https://www.google.com/recaptcha/api/siteverify"
+    ),
+    "min_score": 0.5,
+    "connect_timeout": float(os.getenv("RECAPTCHA_CONNECT_TIMEOUT", 1)),
+    "read_timeout": float(os.getenv("RECAPTCHA_READ_TIMEOUT", 2)),
+    "pool_size": 10,
+    "cache_size": 1024,
+    "cache_ttl": float(os.getenv("RECAPTCHA_CACHE_TTL", 60)),
+    "failure_threshold": int(os.getenv("RECAPTCHA_FAILURE_THRESHOLD", 5)),
+    "reset_timeout": float(os.getenv("RECAPTCHA_RESET_TIMEOUT", 30)),
+    # Let requests through while the verify endpoint is failing
+    "fail_open": True if os.getenv("RECAPTCHA_FAIL_OPEN") else False,
+}
+
+# GitHub user and repository checks, see apis.github
+GITHUB_CACHE = {
+    "ttl": int(os.getenv("GITHUB_CACHE_TTL", 24 * 60 * 60)),
+    "negative_ttl": int(os.getenv("GITHUB_CACHE_NEGATIVE_TTL", 10 * 60)),
+    "timeout": float(os.getenv("GITHUB_TIMEOUT", 5)),
+    "token": os.getenv("GITHUB_TOKEN"),
+}
+
+# Seconds admin registration webhook tokens are cached, see administrator.webhooks
+WEBHOOK_TOKENS = {"ttl": float(os.getenv("WEBHOOK_TOKEN_TTL", 30))}
+
 print("USING DB: ", DATABASE["db"])
 
 LANGUAGE_CODE = "en-us"
@@ -1,10 +1,243 @@
+"""
+Rate limiting shared by every worker. Limits are sliding window
+counters, the weighted count of the previous fixed window plus the
+current one, kept in MongoDB so they hold across workers, nodes and
+restarts. Workers fall back to in-process counters while MongoDB is
+unreachable, a circuit breaker skips MongoDB meanwhile so requests do
+not wait out the server selection timeout.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
 from rest_framework import throttling
 
+from .breaker import CircuitBreaker
+
+
+@lru_cache(maxsize=None)
+def _logger():
+    # core.settings imports this module, the logger needs the settings
+    from .log_utils.log import get_logger
+
+    return get_logger("rate_limit.errors", filename="RateLimitError.log", level=30)
+
+
+def _estimate(start: float, count: int, prev: int, now: float, window: float):
+    """Sliding window estimate and seconds until the current window ends
+
+    Args:
+        start (float): start of the current window
+        count (int): hits in the current window
+        prev (int): hits in the previous window
+        now (float): current time
+        window (float): window length in seconds
+
+    Returns:
+        Tuple[float, float]
+    """
+    elapsed = now - start
+    return prev * (1 - elapsed / window) + count, window - elapsed
+
+
+class LocalRateLimiter:
+    def __init__(self, max_keys: int = 10000) -> None:
+        """
+        In-process sliding window counters, private to the worker.
+
+        Args:
+            max_keys (int): counters kept before expired ones are dropped
+        """
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._windows: Dict[str, list] = {}
+
+    def _prune(self, now: float) -> None:
+        for key, (start, _, _, window) in list(self._windows.items()):
+            if start + 2 * window <= now:
+                del self._windows[key]
+
+    def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        """Count a request against `key`
+
+        Args:
+            key (str): client key
+            limit (int): requests allowed per window
+            window (float): window length in seconds
+
+        Returns:
+            Tuple[bool, float]: allowed, seconds to wait when not allowed
+        """
+        now = time.time()
+        start = math.floor(now / window) * window
+        with self._lock:
+            current = self._windows.get(key)
+            if current is None and len(self._windows) >= self.max_keys:
+                self._prune(now)
+
+            if current is None or current[0] < start - window:
+                current = [start, 0, 0, window]
+            elif current[0] < start:
+                current = [start, 0, current[1], window]
+            current[1] += 1
+            self._windows[key] = current
+            estimate, wait = _estimate(start, current[1], current[2], now, window)
+        return estimate <= limit, wait
+
+
+class MongoRateLimiter:
+    def __init__(self, collection: str = "rate_limits") -> None:
+        """
+        Sliding window counters in MongoDB, one atomic pipeline update
+        per request rolls the window and counts the hit. Counters expire
+        through the `expires_at` TTL index.
+
+        Args:
+            collection (str): counter collection
+        """
+        self.collection = collection
+
+    def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        """Count a request against `key`
+
+        Args:
+            key (str): client key
+            limit (int): requests allowed per window
+            window (float): window length in seconds
+
+        Returns:
+            Tuple[bool, float]: allowed, seconds to wait when not allowed
+        """
+        from .mongo import registry
+
+        now = time.time()
+        start = math.floor(now / window) * window
+        same = {"$eq": ["$start", start]}
+        previous = {"$eq": ["$start", start - window]}
+
+        # Fields of one $set stage all read the document before the update
+        doc = registry.db[self.collection].find_one_and_update(
+            {"_id": key},
+            [
+                {
+                    "$set": {
+                        "start": start,
+                        "count": {"$cond": [same, {"$add": ["$count", 1]}, 1]},
+                        "prev": {
+                            "$cond": [
+                                same,
+                                "$prev",
+                                {"$cond": [previous, "$count", 0]},
+                            ]
+                        },
+                        "expires_at": datetime.utcfromtimestamp(start)
+                        + timedelta(seconds=2 * window),
+                    }
+                }
+            ],
+            projection={"_id": 0, "count": 1, "prev": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        estimate, wait = _estimate(start, doc["count"], doc["prev"], now, window)
+        return estimate <= limit, wait
+
+
+class RateLimiter:
+    def __init__(self, setting: str = "RATE_LIMIT") -> None:
+        """
+        Limiter configured by `setting`, falls back to in-process
+        counters when the backend fails and while its breaker is open.
+
+        Args:
+            setting (str): settings attribute holding the backend config
+        """
+        self.setting = setting
+        self._backend = None
+        self._breaker = None
+        self.fallback = LocalRateLimiter()
+
+    @property
+    def config(self):
+        from django.conf import settings
+
+        return getattr(settings, self.setting)
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            from .cache import load_backend
+
+            self._backend = load_backend(self.config)
+        return self._backend
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        if self._breaker is None:
+            config = self.config
+            self._breaker = CircuitBreaker(
+                config["failure_threshold"], config["reset_timeout"]
+            )
+        return self._breaker
+
+    @property
+    def blocking(self) -> bool:
+        """Whether `hit` may wait on MongoDB, in-process counters and an
+        open breaker answer straight away
+
+        Returns:
+            bool
+        """
+        return (
+            not isinstance(self.backend, LocalRateLimiter)
+            and self.breaker.state != "open"
+        )
+
+    def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        if not self.breaker.allow():
+            return self.fallback.hit(key, limit, window)
+        try:
+            result = self.backend.hit(key, limit, window)
+        except PyMongoError:
+            if self.breaker.failure():
+                _logger().exception("Rate limiter falling back to local counters!")
+            return self.fallback.hit(key, limit, window)
+        if self.breaker.success():
+            _logger().warning("Rate limiter back on shared counters")
+        return result
+
+
+rate_limiter = RateLimiter()
+
 
 class PostThrottle(throttling.AnonRateThrottle):
     scope = "post_throttle"
 
+    def counts(self, request) -> bool:
+        """Whether `allow_request` counts `request`, GETs are never
+        limited and return before any counter work
+
+        Returns:
+            bool
+        """
+        return request.method != "GET" and self.rate is not None
+
     def allow_request(self, request, view):
-        if request.method == "GET":
+        if not self.counts(request):
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
             return True
-        return super().allow_request(request, view)
+
+        allowed, self._wait = rate_limiter.hit(key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return getattr(self, "_wait", None)
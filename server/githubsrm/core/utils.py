@@ -1,10 +1,11 @@
+import base64
 import json
-import os
-from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from functools import wraps
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from jinja2 import Template
+from bson import json_util
 
+from .email_templates import email_templates
 from .settings import PostThrottle
 
 
@@ -17,55 +18,98 @@ def get_email_content(role: str, data: Dict[str, str]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: [description]
     """
+    return email_templates.render(role, data)
 
-    templates_folder = find_templates_folder()
 
-    with open(f"{templates_folder}/email_statics.json", "r") as fp:
-        email_statics = json.load(fp)
+def encode_cursor(value: Any) -> str:
+    """Opaque keyset cursor for the last record of a page
 
-    if role not in email_statics:
-        raise ValueError("role not found, wrong role passed")
+    Args:
+        value (Any): sort key of the last record
+
+    Returns:
+        str
+    """
+    raw = json.dumps({"k": value}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Any:
+    """Decode cursor created by `encode_cursor`
+
+    Args:
+        cursor (str): opaque cursor
 
-    email_context = email_statics[role]
+    Raises:
+        ValueError: malformed cursor
 
-    # length of kw in dict should be equal to the union of data and kw, data can have extra unused args but must have the neccesary ones.
-    if len(set(email_context["kw"]) & data.keys()) != len(email_context["kw"]):
-        raise ValueError(
-            f"inconsistent data, data should have the following keys {email_context['kw']}"
-        )
+    Returns:
+        Any: sort key
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return json.loads(raw)["k"]
+    except Exception:
+        raise ValueError("invalid cursor")
+
+
+def keyset_page(
+    collection, match: Dict[str, Any], after: str, limit: int
+) -> Dict[str, Any]:
+    """Page through `collection` ordered by `_id` starting after `after`,
+    costs the same for every page unlike `$skip`.
 
-    path = f"{templates_folder}/{email_context['file']}.html"
+    Args:
+        collection: pymongo collection
+        match (Dict[str, Any]): filter for the listing
+        after (str): cursor from a previous page, empty for the first page
+        limit (int): page size
 
-    html_email = None
-    with open(path) as file_:
-        template = Template(file_.read())
-        html_email = template.render(**data)
+    Raises:
+        ValueError: malformed cursor
 
-    if html_email is None:
-        raise IOError("failed to render templates")
+    Returns:
+        Dict[str, Any]: records, hasNextPage and nextCursor
+    """
+    if after:
+        match = {"$and": [match, {"_id": {"$gt": decode_cursor(after)}}]}
 
-    body_kw = [data[i] for i in email_context["body_kw"]]
+    records = list(collection.find(match).sort("_id", 1).limit(limit + 1))
+    has_next = len(records) > limit
+    records = records[:limit]
 
     return {
-        "Simple": {
-            "Subject": {"Data": email_context["subject"], "Charset": "utf-8"},
-            "Body": {
-                "Text": {
-                    "Data": email_context["bodyText"].format(*body_kw),
-                    "Charset": "utf-8",
-                },
-                "Html": {"Data": html_email, "Charset": "utf-8"},
-            },
-        },
+        "hasNextPage": has_next,
+        "nextCursor": encode_cursor(records[-1]["_id"]) if has_next else None,
+        "records": records,
     }
 
 
-@lru_cache
-def find_templates_folder():
-    for (root, dirs, _) in os.walk("."):
-        if "templates" in dirs:
-            return f"{root}/templates"
-    raise IOError("templates folder not found")
+def stream_json(
+    documents: Iterable[Dict[str, Any]], chunk_size: int = 64 * 1024
+) -> Iterator[str]:
+    """Encode documents as a JSON array one document at a time, for
+    `StreamingHttpResponse`. Only the current chunk is held in memory.
+
+    Args:
+        documents (Iterable[Dict[str, Any]]): pymongo cursor or documents
+        chunk_size (int): characters buffered before a chunk is yielded
+
+    Returns:
+        Iterator[str]
+    """
+    buffer, size = ["["], 1
+    for index, document in enumerate(documents):
+        encoded = json_util.dumps(document)
+        if index:
+            buffer.append(", ")
+        buffer.append(encoded)
+        size += len(encoded) + 2
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    buffer.append("]")
+    yield "".join(buffer)
 
 
 def api_view(
@@ -82,3 +126,62 @@ def api_view(
         return func
 
     return decorator
+
+
+def async_api_view(
+    http_methods: List[str],
+    throttle_classes: Optional[List[type]] = [PostThrottle],
+):
+    """`api_view` for coroutine views served through `core.asgi`, DRF
+    views are sync only so method checks, throttling, JSON parsing and
+    APIException handling are done here.
+    """
+    from asgiref.sync import sync_to_async
+    from django.http import JsonResponse
+    from rest_framework.exceptions import APIException
+
+    from .throttle import rate_limiter
+
+    def decorator(func):
+        @wraps(func)
+        async def view(request, *args, **kwargs) -> JsonResponse:
+            if request.method not in http_methods:
+                return JsonResponse(
+                    data={"detail": f'Method "{request.method}" not allowed.'},
+                    status=405,
+                )
+
+            for throttle_class in throttle_classes or []:
+                throttle = throttle_class()
+                if not throttle.counts(request):
+                    continue
+                # only the MongoDB counters block, keep them off the event loop
+                if rate_limiter.blocking:
+                    allowed = await sync_to_async(
+                        throttle.allow_request, thread_sensitive=False
+                    )(request, None)
+                else:
+                    allowed = throttle.allow_request(request, None)
+                if not allowed:
+                    return JsonResponse(
+                        data={"detail": "Request was throttled."},
+                        status=429,
+                        headers={"Retry-After": str(int(throttle.wait() or 0))},
+                    )
+
+            try:
+                request.data = json.loads(request.body) if request.body else {}
+            except ValueError:
+                return JsonResponse(data={"detail": "JSON parse error"}, status=400)
+
+            try:
+                return await func(request, *args, **kwargs)
+            except APIException as e:
+                detail = e.detail
+                if not isinstance(detail, (dict, list)):
+                    detail = {"detail": detail}
+                return JsonResponse(data=detail, status=e.status_code, safe=False)
+
+        return view
+
+    return decorator
@@ -2,8 +2,11 @@ import os
 import time
 
 import psutil
+from apis.github import github
 from django.http import JsonResponse
 
+from .aws import notifier
+from .mongo import registry
 from .utils import api_view
 
 
@@ -16,5 +19,13 @@ def health_check(request) -> JsonResponse:
     """
     uptime = time.time() - psutil.Process(os.getpid()).create_time()
     return JsonResponse(
-        {"uptime": uptime, "status": "OK", "timeStamp": time.time()}, status=200
+        {
+            "uptime": uptime,
+            "status": "OK",
+            "timeStamp": time.time(),
+            "mongo": registry.stats(),
+            "github": github.stats(),
+            "notifications": notifier.stats(),
+        },
+        status=200,
     )
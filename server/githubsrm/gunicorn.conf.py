@@ -0,0 +1,21 @@
+"""
+Gunicorn hooks, picked up from the working directory (see Procfile).
+"""
+
+
+def post_fork(server, worker) -> None:
+    """Reload token epochs in workers forked from a preloaded app"""
+    from django.apps import apps
+
+    # without preload_app, CoreConfig.ready loads them in the worker
+    if apps.ready:
+        from core.epochs import token_epochs
+
+        token_epochs.start()
+
+
+def worker_exit(server, worker) -> None:
+    """Send queued notifications before the worker goes away"""
+    from core.aws import notifier
+
+    notifier.shutdown()
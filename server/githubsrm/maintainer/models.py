@@ -1,12 +1,11 @@
-import binascii
-import hashlib
-import os
-from threading import Thread
-from typing import Any, Dict, Iterable
+from typing import Any, Dict
 
 from administrator import jwt_keys
-from core.aws import service
-from core.models import BaseModel
+from core.aws import notifier, service
+from core.cache import project_listing
+from core.epochs import token_epochs
+from core.models import BaseModel, only
+from core.passwords import passwords
 
 from .errors import (
     AuthenticationErrors,
@@ -23,42 +22,101 @@ class Entry(BaseModel):
         super().__init__()
 
     def hash_password(self, password: str) -> str:
-        """Hashes password using salted password hashing (SHA512 & PBKDF_HMAC2)
+        """Hashes password with the configured algorithm, see core.passwords
         Args:
             password : Password to be hashed
 
         Returns:
             str : Hashed password
         """
-        salt = hashlib.sha256(os.urandom(60)).hexdigest().encode("ascii")
-        pwd_hash = hashlib.pbkdf2_hmac("sha512", password.encode("utf-8"), salt, 100000)
-        pwd_hash = binascii.hexlify(pwd_hash)
-        final_hashed_pwd = (salt + pwd_hash).decode("ascii")
-        return final_hashed_pwd
-
-    # Might Not be needed in maintainer
-    def check_hash(self, email: str, pwd: str) -> bool:
+        return passwords.hash(password)
+
+    def check_hash(
+        self, email: str, pwd: str, credentials: Dict[str, Any] = None
+    ) -> bool:
         """Verifies hashed password with stored hash & verifies maintainer before login
 
         Args:
             email : Email ID of maintainer
+            pwd : entered password
+            credentials : credentials already read, see find_login
 
         Returns:
             bool
         """
-        if value := self.db.maintainer_credentials.find_one({"email": email}):
-            dbpwd = value["password"]
-            salt = dbpwd[:64]
-            dbpwd = dbpwd[64:]
-            pwd_hash = hashlib.pbkdf2_hmac(
-                "sha512", pwd.encode("utf-8"), salt.encode("ascii"), 100000
+        if credentials is None:
+            credentials = self.db.maintainer_credentials.find_one(
+                {"email": email}, only("password")
             )
-            pwd_hash = binascii.hexlify(pwd_hash).decode("ascii")
-
-            if pwd_hash == dbpwd:
+        if value := credentials:
+            if passwords.verify(pwd, value["password"]):
+                if passwords.needs_rehash(value["password"]):
+                    self.db.maintainer_credentials.update_one(
+                        {"email": email, "password": value["password"]},
+                        {"$set": {"password": passwords.hash(pwd)}},
+                    )
                 return value
         raise InvalidMaintainerCredentialsError()
 
+    def find_login(self, email: str) -> Dict[str, Any]:
+        """Credentials, token epoch and approved projects of a maintainer
+        in one round trip. The epoch is looked up before the projects so
+        a concurrent approval still revokes the token issued from them.
+
+        Args:
+            email (str): maintainer email
+
+        Returns:
+            Dict[str, Any]: `password`, `epoch` and `maintainers` with the
+                name and project id of every approved entry, None if there
+                are no credentials
+        """
+        approved = {
+            "$filter": {
+                "input": "$maintainers",
+                "cond": {"$eq": ["$$this.is_admin_approved", True]},
+            }
+        }
+        login = self.db.maintainer_credentials.aggregate(
+            [
+                {"$match": {"email": email}},
+                {"$limit": 1},
+                {"$project": {"_id": 0, "email": 1, "password": 1}},
+                {
+                    "$lookup": {
+                        "from": token_epochs.collection,
+                        "localField": "email",
+                        "foreignField": "_id",
+                        "as": "epoch",
+                    }
+                },
+                {
+                    "$lookup": {
+                        "from": "maintainer",
+                        "localField": "email",
+                        "foreignField": "email",
+                        "as": "maintainers",
+                    }
+                },
+                {
+                    "$project": {
+                        "password": 1,
+                        "epoch": {"$ifNull": [{"$max": "$epoch.epoch"}, 0]},
+                        "maintainers": {
+                            "$map": {
+                                "input": approved,
+                                "in": {
+                                    "name": "$$this.name",
+                                    "project_id": "$$this.project_id",
+                                },
+                            }
+                        },
+                    }
+                },
+            ]
+        )
+        return next(login, None)
+
     def _approve_contributor(self, contributor: Dict[str, str]):
         """Trigger lambda for contributor addition
 
@@ -66,7 +124,8 @@ class Entry(BaseModel):
             contributor (Dict[str, str]): contirbutor details
         """
         project = self.db.project.find_one(
-            filter={"_id": contributor["interested_project"]}
+            filter={"_id": contributor["interested_project"]},
+            projection=only("team_slug"),
         )
         submission = {
             **{"team-slug": project["team_slug"]},
@@ -101,6 +160,15 @@ class Entry(BaseModel):
         contributor = self.db.contributor.find_one_and_update(
             {"_id": contributor_id, "interested_project": project_id},
             update={"$set": {"is_maintainer_approved": True}},
+            projection=only(
+                "_id",
+                "name",
+                "email",
+                "github_id",
+                "interested_project",
+                "is_maintainer_approved",
+                "is_admin_approved",
+            ),
         )
 
         if contributor:
@@ -110,13 +178,14 @@ class Entry(BaseModel):
                 raise ContributorApprovedError(
                     detail={"error": "Contributor already approved"}
                 )
-            Thread(
-                target=self._approve_contributor, kwargs={"contributor": contributor}
-            ).start()
+            notifier.submit(self._approve_contributor, contributor=contributor)
             project_doc = self.db.project.find_one_and_update(
                 {"_id": project_id},
                 update={"$addToSet": {"contributor_id": contributor_id}},
+                projection=only("project_name", "project_url"),
             )
+            # contributor_id is part of the public listing
+            project_listing.invalidate()
             return {**project_doc, **contributor}
         raise ContributorNotFoundError(detail={"error": "Contributor Not Found!"})
 
@@ -129,7 +198,7 @@ class Entry(BaseModel):
         Returns:
             Dict
         """
-        return self.db.maintainer_credentials.find_one({"email": email})
+        return self.db.maintainer_credentials.find_one({"email": email}, only("email"))
 
     def find_Maintainer_with_email(self, email: str) -> Dict[str, Any]:
         """To find maintainer with email
@@ -140,18 +209,7 @@ class Entry(BaseModel):
         Returns:
             Dict
         """
-        return self.db.maintainer.find_one({"email": email})
-
-    def find_all_Maintainer_with_email(self, email) -> Iterable:
-        """To find maintainer with email
-
-        Args:
-            email
-
-        Returns:
-            Iterable
-        """
-        return self.db.maintainer.find({"email": email})
+        return self.db.maintainer.find_one({"email": email}, only("name"))
 
     def find_contributor_for_removal(
         self, identifier: str, project_ids: list
@@ -173,10 +231,11 @@ class Entry(BaseModel):
                 "is_admin_approved": True,
                 "is_maintainer_approved": False,
                 "interested_project": {"$in": project_ids},
-            }
+            },
+            projection=only("name", "email", "interested_project"),
         )
         project_name = self.db.project.find_one(
-            {"_id": contributor["interested_project"]}
+            {"_id": contributor["interested_project"]}, only("project_name")
         )["project_name"]
 
         if contributor:
@@ -193,7 +252,7 @@ class Entry(BaseModel):
         Returns:
             bool
         """
-        self.db.contributor.find_one_and_delete({"_id": identifier})
+        self.db.contributor.delete_one({"_id": identifier})
         return True
 
     def set_password(self, key: str, password: str) -> bool:
@@ -223,6 +282,7 @@ class Entry(BaseModel):
                     "reset": False,
                 }
             },
+            projection=only("_id"),
         )
 
         if maintainer:
@@ -241,18 +301,7 @@ class Entry(BaseModel):
             list: list of all projects
         """
         projects = self.db.maintainer.find(
-            {"email": email, "is_admin_approved": True},
-            {
-                "name": 0,
-                "email": 0,
-                "srm_email": 0,
-                "reg_number": 0,
-                "branch": 0,
-                "is_admin_approved": 0,
-                "time_stamp": 0,
-                "github_id": 0,
-                "_id": 0,
-            },
+            {"email": email, "is_admin_approved": True}, only("project_id")
         )
 
         projects = list(projects)
@@ -3,10 +3,8 @@ from math import ceil
 from typing import Any, Dict
 from administrator import jwt_keys
 from administrator.utils import get_token
-from . import entry
-
-open_entry = entry
-entry = entry.db
+from core.utils import keyset_page
+from . import entry as open_entry
 
 ITEMS_PER_PAGE = 10
 
@@ -29,7 +27,7 @@ def project_pagination(request, **kwargs):
         totalItems = request.total_items
 
         record = list(
-            entry.project.aggregate(
+            open_entry.db.project.aggregate(
                 [
                     {"$match": {"_id": {"$in": projects_ids}}},
                     {"$skip": (page - 1) * ITEMS_PER_PAGE},
@@ -53,6 +51,24 @@ def project_pagination(request, **kwargs):
         return {"hasNextPage": False, "hasPreviousPage": False, "records": []}
 
 
+def project_cursor_pagination(request, **kwargs) -> Dict[str, Any]:
+    """Maintainer projects after the cursor passed in the `after` query param
+    Args:
+        request
+    Returns:
+        Dict[str, Any]
+    """
+    try:
+        return keyset_page(
+            open_entry.db.project,
+            match={"_id": {"$in": request.project_ids}},
+            after=request.GET.get("after"),
+            limit=ITEMS_PER_PAGE,
+        )
+    except ValueError:
+        return {"error": "Invalid cursor"}
+
+
 def project_single_project(request, **kwargs) -> Dict[str, Any]:
     """Get a specific project with all maintainer details and contributor details if they are approved
     Args:
@@ -77,35 +93,19 @@ def project_single_project(request, **kwargs) -> Dict[str, Any]:
     if project_id not in projects_ids:
         return {"error": "wrong ID"}
 
-    doc = entry.project.aggregate(
-        get_pagnation_aggregate(project_id=project_id, count=True)
-    )
-
-    doc = list(doc)
-
-    maintainer_count = 0
-    contributor_count = 0
-
-    try:
-        maintainer_count = doc[0]["maintainer"][0]["count"]
-        contributor_count = doc[0]["contributor"][0]["count"]
-    except Exception as e:
-        pass
-
     try:
         docs = list(
-            entry.project.aggregate(
+            open_entry.db.project.aggregate(
                 get_pagnation_aggregate(
                     project_id=project_id,
-                    count=False,
                     maintainer_page=maintainer_page,
                     contributor_page=contributor_page,
-                    maintainer_docs=maintainer_count,
-                    contributor_docs=contributor_count,
                 )
             )
         )
         docs = docs[0]
+        maintainer_count = docs.pop("maintainer_count")
+        contributor_count = docs.pop("contributor_count")
         docs["maintainerHasNextPage"] = (ITEMS_PER_PAGE * int(maintainer_page)) < int(
             maintainer_count
         )
@@ -119,96 +119,80 @@ def project_single_project(request, **kwargs) -> Dict[str, Any]:
     return docs
 
 
+def _paginated_lookup(collection: str, match: Dict[str, Any], page) -> Dict[str, Any]:
+    """$lookup returning one page of `collection` and the total match count"""
+    return {
+        "$lookup": {
+            "from": collection,
+            "pipeline": [
+                {"$match": match},
+                {
+                    "$facet": {
+                        "records": [
+                            {"$skip": (int(page) - 1) * ITEMS_PER_PAGE},
+                            {"$limit": ITEMS_PER_PAGE},
+                        ],
+                        "total": [{"$count": "count"}],
+                    }
+                },
+            ],
+            "as": collection,
+        }
+    }
+
+
+def _facet_count(field: str) -> Dict[str, Any]:
+    return {
+        "$let": {
+            "vars": {"facet": {"$arrayElemAt": [f"${field}", 0]}},
+            "in": {"$ifNull": [{"$arrayElemAt": ["$$facet.total.count", 0]}, 0]},
+        }
+    }
+
+
 def get_pagnation_aggregate(
-    count: bool,
     project_id,
-    maintainer_docs=None,
-    contributor_docs=None,
-    maintainer_page=None,
-    contributor_page=None,
+    maintainer_page,
+    contributor_page,
 ):
+    """Single round trip pipeline for the project with one page of approved
+    maintainers and contributors plus both totals.
+    """
 
-    doc = [
+    return [
         {"$match": {"_id": project_id}},
+        _paginated_lookup(
+            "maintainer",
+            {"is_admin_approved": True, "project_id": project_id},
+            maintainer_page,
+        ),
+        _paginated_lookup(
+            "contributor",
+            {"is_admin_approved": True, "interested_project": project_id},
+            contributor_page,
+        ),
         {
-            "$lookup": {
-                "from": "maintainer",
-                "pipeline": [
-                    {"$match": {"is_admin_approved": True, "project_id": project_id}},
-                    {"$count": "count"},
-                ],
-                "as": "maintainer",
-            }
-        },
-        {
-            "$lookup": {
-                "from": "contributor",
-                "pipeline": [
-                    {
-                        "$match": {
-                            "is_admin_approved": True,
-                            "interested_project": project_id,
-                        }
-                    },
-                    {"$count": "count"},
-                ],
-                "as": "contributor",
+            "$addFields": {
+                "maintainer_count": _facet_count("maintainer"),
+                "contributor_count": _facet_count("contributor"),
+                "maintainer": {"$arrayElemAt": ["$maintainer.records", 0]},
+                "contributor": {"$arrayElemAt": ["$contributor.records", 0]},
             }
         },
     ]
-    if count:
-        return doc
-    else:
-        doc = [
-            {"$match": {"_id": project_id}},
-            {
-                "$lookup": {
-                    "from": "maintainer",
-                    "pipeline": [
-                        {
-                            "$match": {
-                                "is_admin_approved": True,
-                                "project_id": project_id,
-                            }
-                        },
-                        {"$skip": (int(maintainer_page) - 1) * ITEMS_PER_PAGE},
-                        {"$limit": ITEMS_PER_PAGE},
-                    ],
-                    "as": "maintainer",
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "contributor",
-                    "pipeline": [
-                        {
-                            "$match": {
-                                "is_admin_approved": True,
-                                "interested_project": project_id,
-                            }
-                        },
-                        {"$skip": (int(contributor_page) - 1) * ITEMS_PER_PAGE},
-                        {"$limit": ITEMS_PER_PAGE},
-                    ],
-                    "as": "contributor",
-                }
-            },
-        ]
-
-    return doc
 
 
 def RequestSetPassword(email):
     """
     When new user is created or when the user requests a change in password
     """
-    document = entry.maintainer_credentials.find_one_and_update(
+    document = open_entry.db.maintainer_credentials.find_one_and_update(
         {"email": email}, update={"$set": {"reset": True}}
     )
     expiry = 10
     if not document:
         doc = {"email": email, "password": secrets.token_hex(), "reset": True}
-        entry.maintainer_credentials.insert_one(doc)
+        open_entry.db.maintainer_credentials.insert_one(doc)
         expiry = 168 * 60
 
     return jwt_keys.issue_key({"email": email}, expiry=expiry)
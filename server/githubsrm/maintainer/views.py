@@ -1,8 +1,6 @@
-from threading import Thread
-
 from administrator import jwt_keys
 from administrator.utils import get_token
-from core.aws import service
+from core.aws import notifier, service
 from core.settings import PostThrottle
 from core.utils import api_view
 from django.http.response import JsonResponse
@@ -11,7 +9,12 @@ from rest_framework.views import APIView
 from maintainer import entry
 
 from .definitions import MaintainerSchema, RejectionSchema
-from .utils import RequestSetPassword, project_pagination, project_single_project
+from .utils import (
+    RequestSetPassword,
+    project_cursor_pagination,
+    project_pagination,
+    project_single_project,
+)
 
 
 class Projects(APIView):
@@ -42,27 +45,23 @@ class Projects(APIView):
         contributor = entry.find_contributor_for_removal(
             request.data.get("contributor_id"), request.decoded.get("project_id")
         )
-        Thread(
-            target=service.sns,
-            kwargs={
-                "payload": {
-                    "message": f"Maintainer removed contributor ({request.data.get('contributor_id')}) \
+        notifier.submit(
+            service.sns,
+            payload={
+                "message": f"Maintainer removed contributor ({request.data.get('contributor_id')}) \
                     removed by -> {request.decoded.get('email')}",
-                    "status": "[MAINTAINER-REMOVED-CONTRIBUTOR]",
-                }
+                "status": "[MAINTAINER-REMOVED-CONTRIBUTOR]",
             },
-        ).start()
-        Thread(
-            target=service.wrapper_email,
-            kwargs={
-                "role": "maitainer_contributor_rejection",
-                "data": {
-                    "name": contributor["name"],
-                    "email": contributor["email"],
-                    "project_name": contributor["project_name"],
-                },
+        )
+        notifier.submit(
+            service.wrapper_email,
+            role="maitainer_contributor_rejection",
+            data={
+                "name": contributor["name"],
+                "email": contributor["email"],
+                "project_name": contributor["project_name"],
             },
-        ).start()
+        )
 
         return JsonResponse(
             data={"removed": request.data.get("contributor_id")}, status=200
@@ -71,10 +70,7 @@ class Projects(APIView):
     def delete(self, request) -> JsonResponse:
         RejectionSchema(data=request.data).valid()
         _, token = get_token(request_header=request.headers)
-        decoded = jwt_keys.verify_key(token)
-        if decoded:
-            request.decoded = decoded
-        else:
+        if not jwt_keys.verify_request(request, token):
             return JsonResponse(data={"error": "Invalid key"}, status=401)
         return self._remove_contributor(request=request)
 
@@ -83,7 +79,13 @@ class Projects(APIView):
         single_project = ["projectId", "maintainer", "contributor"]
 
         request_query_keys = list(request.GET.keys())
-        if len(set(pagination) & set(request_query_keys)) == 1:
+        if "after" in request_query_keys:
+            response = project_cursor_pagination(request)
+            if "error" in response:
+                return JsonResponse(response, status=400)
+            return JsonResponse(response, status=200)
+
+        elif len(set(pagination) & set(request_query_keys)) == 1:
             response = project_pagination(request)
             if "error" in response:
                 return JsonResponse(response, status=401)
@@ -107,23 +109,21 @@ class Projects(APIView):
 @api_view(["POST"])
 def login(request) -> JsonResponse:
     MaintainerSchema(request.data, path=request.path.split("maintainer/")[1]).valid()
-    user_credentials = entry.find_Maintainer_credentials_with_email(
-        request.data["email"]
-    )
+    email = request.data["email"]
+    login = entry.find_login(email)
 
-    if not user_credentials:
+    if not login:
         return JsonResponse(
             data={"error": "Maintainer not found / Not approved"}, status=400
         )
 
-    entry.check_hash(request.data["email"], request.data["password"])
-    doc_list = list(entry.find_all_Maintainer_with_email(request.data["email"]))
-
-    if doc_list:
+    entry.check_hash(email, request.data["password"], credentials=login)
+    if maintainers := login["maintainers"]:
         payload = {}
-        payload["email"] = doc_list[0]["email"]
-        payload["name"] = doc_list[0]["name"]
-        payload["project_id"] = [i["project_id"] for i in doc_list]
+        payload["email"] = email
+        payload["name"] = maintainers[0]["name"]
+        payload["project_id"] = [i["project_id"] for i in maintainers]
+        payload["epoch"] = login["epoch"]
 
         jwt = jwt_keys.issue_key(payload, get_refresh_token=True)
         return JsonResponse(data=jwt, status=200)
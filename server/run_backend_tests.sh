@@ -1,9 +1,24 @@
 start=$(date +%s)
 a=15
 
+# The server records every query it runs, test_indexes explains them last
+export MONGO_RECORD_QUERIES=${MONGO_RECORD_QUERIES:-/tmp/githubsrm-queries.jsonl}
+rm -f "$MONGO_RECORD_QUERIES"
+
 echo "[STARTING-DJANGO-SERVER]"
 python3 githubsrm/manage.py runserver &
 
+python3 -m unittest -v tests/test_cache.py
+python3 -m unittest -v tests/test_passwords.py
+python3 -m unittest -v tests/test_throttle.py
+python3 -m unittest -v tests/test_recaptcha.py
+python3 -m unittest -v tests/test_github.py
+python3 -m unittest -v tests/test_aws.py
+python3 -m unittest -v tests/test_notifications.py
+python3 -m unittest -v tests/test_outbox.py
+python3 -m unittest -v tests/test_email_templates.py
+python3 -m unittest -v tests/test_bulk_email.py
+
 sleep $a
 python3 -m unittest -v tests/test_schema.py
 
@@ -13,12 +28,17 @@ python3 -m unittest -v tests/test_apis.py
 sleep $a
 python3 -m unittest -v tests/test_admin.py
 
+sleep $a
+python3 -m unittest -v tests/test_projections.py
+
 sleep $a
 python3 -m unittest -v tests/test_maintainer.py
 
 sleep $a
 python3 -m unittest -v tests/test_full_flow.py
 
+python3 -m unittest -v tests/test_indexes.py
+
 echo "[RUNNING-CLEANUP-JOBS]"
 fuser -k 8000/tcp
 
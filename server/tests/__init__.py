@@ -3,9 +3,95 @@ import hashlib
 import json
 import os
 import secrets
-from django.conf import settings
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
 
-settings.configure(USE_DATABASE="TESTMONGO")
+import django
+from django.conf import settings
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Server modules import each other as top level packages (core, apis...)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "githubsrm"))
+# boto3 signs the requests it sends to the AWS stand-ins
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("SNS_ARN", "arn:aws:sns:ap-south-1:000000000000:test")
+
+# Unit tests swap the rest of the settings they need with override_settings
+settings.configure(
+    USE_DATABASE="TESTMONGO",
+    DATABASE={
+        "mongo_uri": os.getenv("MONGO_URI"),
+        "db": os.getenv("TestDB"),
+        "max_pool_size": 10,
+        "wait_queue_timeout_ms": None,
+        "command_stats": False,
+        "record_queries": None,
+    },
+)
+django.setup()
+
+EMAIL_TEMPLATES = {
+    "folder": os.path.join(
+        os.path.dirname(__file__), "..", "githubsrm", "apis", "templates"
+    ),
+    "bytecode_cache": None,
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Base of the local stand-ins for upstream HTTP APIs, state shared
+    between requests lives on `self.server`.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # keep-alive replies must not wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def reply(
+        self,
+        status: int = 200,
+        body: Any = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Answer the request, bodies other than bytes are sent as JSON"""
+        headers = dict(headers or {})
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+            headers.setdefault("Content-Type", "application/json")
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Serves a `StubHandler` on a free local port from a daemon thread"""
+
+    daemon_threads = True
+
+    def __init__(self, handler: type) -> None:
+        super().__init__(("127.0.0.1", 0), handler)
+        self.url = f"http://127.0.0.1:{self.server_port}"
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.shutdown()
+        self.server_close()
 
 
 class Base:
@@ -257,6 +343,16 @@ class Base:
             params={"page": 1},
         )
 
+    def get_admin_projects_cursor(self, instance, admin_jwt, after=""):
+        return instance.client.get(
+            url=instance.base_url + "admin/projects",
+            headers={
+                **self.base_headers,
+                **{"Authorization": f"Bearer {admin_jwt}"},
+            },
+            params={"after": after},
+        )
+
     def reject_maintainer(self, instance, alpha, admin_jwt):
         data = {"maintainer_id": alpha["_id"]}
         return instance.client.delete(
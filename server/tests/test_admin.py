@@ -6,6 +6,8 @@ import requests
 import pymongo
 import unittest
 import json
+import time
+import jwt
 from githubsrm.core.settings import DATABASE
 
 entry = Base()
@@ -208,6 +210,53 @@ class TestClient(unittest.TestCase):
         self.assertEqual(response.status_code, 403)
         self.clean()
 
+    def test_wrong_webhook_cached(self):
+        """
+        unknown webhook tokens are rejected without reading webHook, needs
+        the server in DEBUG mode for the health check command stats
+        """
+        self.clean()
+        # also reloads the token set if its TTL ran out
+        response = entry.register_admin(self, "unknown-webhook-0")
+        self.assertEqual(response.status_code, 403)
+
+        def webhook_finds():
+            response = self.client.get(url=self.base_url + "api/healthcheck")
+            stats = response.json()["mongo"]["collections"]
+            return stats.get("webHook", {}).get("find", 0)
+
+        start = webhook_finds()
+        for i in range(1, 21):
+            response = entry.register_admin(self, f"unknown-webhook-{i}")
+            self.assertEqual(response.status_code, 403)
+        self.assertEqual(webhook_finds(), start)
+        self.clean()
+
+    def test_new_webhook_token(self):
+        """
+        tokens added to webHook are accepted before the TTL runs out, only
+        on a replica set where the server watches the collection
+        """
+        if "setName" not in self.db.client.admin.command("ismaster"):
+            self.skipTest("change streams need a replica set")
+
+        self.clean()
+        response = entry.register_admin(self, "new-webhook-token")
+        self.assertEqual(response.status_code, 403)
+
+        inserted = self.db.webHook.insert_one({"token": "new-webhook-token"})
+        try:
+            # the change event reaches the server asynchronously
+            for _ in range(20):
+                response = entry.register_admin(self, "new-webhook-token")
+                if response.status_code == 200:
+                    break
+                time.sleep(0.1)
+            self.assertEqual(response.status_code, 200)
+        finally:
+            self.db.webHook.delete_one({"_id": inserted.inserted_id})
+            self.clean()
+
     def test_approve_maintainer_w_wrong_jwt(self):
         self.clean()
         response = entry.register_admin(self)
@@ -305,6 +354,53 @@ class TestClient(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.clean()
 
+    def test_me_route_expired_jwt(self):
+        """
+        cached tokens are still rejected once they expire
+        """
+        self.clean()
+        response = entry.register_admin(self)
+        self.assertEqual(response.status_code, 200)
+
+        admin_jwt = jwt.encode(
+            payload={"admin": True, "user": "test", "exp": int(time.time()) + 2},
+            key=os.getenv("SIGNATURE"),
+        )
+        response = entry.get_me_admin(self, admin_jwt)
+        self.assertEqual(response.status_code, 200)
+
+        time.sleep(3)
+        response = entry.get_me_admin(self, admin_jwt)
+        self.assertEqual(response.status_code, 401)
+        self.clean()
+
+    def test_get_projects_cursor(self):
+        """
+        keyset pagination with the after cursor
+        """
+        self.clean()
+        response = entry.register_admin(self)
+        self.assertEqual(response.status_code, 200)
+
+        response = entry.login_admin(self)
+        admin_jwt = response.json()["access_token"]
+        self.assertEqual(response.status_code, 200)
+
+        response = entry.add_alpha_maintainer(self)
+        self.assertEqual(response.status_code, 201)
+
+        response = entry.add_another_alpha(self)
+        self.assertEqual(response.status_code, 201)
+
+        response = entry.get_admin_projects_cursor(self, admin_jwt)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["records"]), 2)
+        self.assertFalse(response.json()["hasNextPage"])
+
+        response = entry.get_admin_projects_cursor(self, admin_jwt, after="!")
+        self.assertEqual(response.status_code, 400)
+        self.clean()
+
     def test_me_route_w_wrong_jwt(self):
         self.clean()
         response = entry.register_admin(self)
@@ -0,0 +1,41 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from core.aws import BotoService
+from django.test import SimpleTestCase, override_settings
+
+
+@override_settings(
+    AWS={
+        "enabled": True,
+        "region": "ap-south-1",
+        "endpoint_url": None,
+        "max_pool_connections": 10,
+    }
+)
+class TestBotoService(SimpleTestCase):
+    """
+    Shared boto3 clients
+    """
+
+    def test_reused(self):
+        service = BotoService()
+        self.assertIs(service.client("sns"), service.client("sns"))
+        self.assertIsNot(service.client("sns"), service.client("sesv2"))
+        self.assertIsNot(
+            service.client("sns", "us-east-1"), service.client("sns", "eu-west-1")
+        )
+
+    def test_threads_share_one_client(self):
+        service = BotoService()
+        with ThreadPoolExecutor(8) as pool:
+            clients = set(pool.map(lambda _: id(service.client("sns")), range(32)))
+        self.assertEqual(len(clients), 1)
+
+    def test_rebuilt_after_fork(self):
+        service = BotoService()
+        client = service.client("sns")
+        # what a forked child sees
+        service._pid = -1
+        self.assertIsNot(service.client("sns"), client)
+        self.assertEqual(service._pid, os.getpid())
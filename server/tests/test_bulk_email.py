@@ -0,0 +1,227 @@
+import json
+import threading
+import time
+from urllib.parse import parse_qs
+
+from core.aws import BotoService, notifier
+from core.email_templates import email_templates
+from django.test import SimpleTestCase, override_settings
+
+from . import EMAIL_TEMPLATES, StubHandler, StubServer
+
+PUBLISH = b"""<PublishResponse xmlns="http://sns.amazonaws.com/doc/2010-03-31/">
+<PublishResult><MessageId>test</MessageId></PublishResult>
+<ResponseMetadata><RequestId>test</RequestId></ResponseMetadata>
+</PublishResponse>"""
+
+
+class SESStandIn(StubHandler):
+    """
+    Local stand-in for SES v2 CreateEmailTemplate and SendBulkEmail, and
+    SNS Publish for the failure reports. Recipients in `server.flaky` fail
+    once with TRANSIENT_FAILURE, those in `server.down` every time and
+    those in `server.rejected` always fail with MESSAGE_REJECTED.
+    """
+
+    def do_POST(self) -> None:
+        raw = self.body()
+        if self.path == "/":
+            self.server.published.append(parse_qs(raw.decode())["Message"][0])
+            self.reply(200, PUBLISH, headers={"Content-Type": "text/xml"})
+            return
+
+        body = json.loads(raw)
+
+        if self.path == "/v2/email/templates":
+            if body["TemplateName"] in self.server.templates:
+                self.reply(
+                    400,
+                    {"message": "exists"},
+                    headers={"x-amzn-ErrorType": "AlreadyExistsException"},
+                )
+            else:
+                self.server.templates[body["TemplateName"]] = body["TemplateContent"]
+                self.reply(200, {})
+        else:
+            self.server.batches.append(body)
+            results = []
+            for entry in body["BulkEmailEntries"]:
+                email = entry["Destination"]["ToAddresses"][0]
+                if email in self.server.rejected:
+                    results.append({"Status": "MESSAGE_REJECTED", "Error": "test"})
+                elif email in self.server.flaky or email in self.server.down:
+                    self.server.flaky.discard(email)
+                    results.append({"Status": "TRANSIENT_FAILURE", "Error": "test"})
+                else:
+                    results.append({"Status": "SUCCESS", "MessageId": email})
+            self.reply(200, {"BulkEmailEntryResults": results})
+
+
+server = StubServer(SESStandIn)
+
+AWS = {
+    "enabled": True,
+    "region": "ap-south-1",
+    "endpoint_url": server.url,
+    "max_pool_connections": 2,
+    "template_prefix": "test",
+    "bulk_max_attempts": 2,
+    "bulk_backoff_seconds": 0.01,
+}
+
+
+def tearDownModule() -> None:
+    server.close()
+
+
+@override_settings(
+    AWS=AWS,
+    NOTIFICATIONS={
+        "workers": 2,
+        "max_queue": 16,
+        "submit_timeout": 0.05,
+        "drain_timeout": 2,
+    },
+    EMAIL_TEMPLATES=EMAIL_TEMPLATES,
+)
+class TestBulkEmail(SimpleTestCase):
+    """
+    Templated bulk sending against a local SES stand-in
+    """
+
+    data = {
+        "project_name": "githubsrm",
+        "contributor_name": "Contributor",
+        "contributor_email": "contributor@example.com",
+    }
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        # drains the notification workers while the settings are overridden
+        notifier.shutdown()
+        super().tearDownClass()
+
+    def setUp(self) -> None:
+        server.templates, server.batches, server.published = {}, [], []
+        server.flaky, server.down, server.rejected = set(), set(), set()
+        # the shared templates were built from other settings
+        email_templates._roles = None
+        self.service = BotoService()
+
+    def wait_for(self, condition) -> None:
+        """Retries and reports run on the notification workers"""
+        deadline = time.monotonic() + 2
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def recipients(self, count: int):
+        return [
+            {"name": f"Maintainer {i}", "email": f"maintainer{i}@example.com"}
+            for i in range(count)
+        ]
+
+    def send(self, count: int) -> int:
+        return self.service.bulk_email(
+            role="contributor_application_to_maintainer",
+            data=self.data,
+            recipients=self.recipients(count),
+        )
+
+    def test_batches(self):
+        self.assertEqual(self.send(120), 120)
+        self.assertEqual(
+            [len(batch["BulkEmailEntries"]) for batch in server.batches],
+            [50, 50, 20],
+        )
+
+    def test_template_stored_once(self):
+        self.assertTrue(self.send(3))
+        self.assertTrue(self.send(3))
+        self.assertEqual(len(server.templates), 1)
+
+        # a fresh process finds the template already stored
+        self.assertTrue(
+            BotoService().bulk_email(
+                role="contributor_application_to_maintainer",
+                data=self.data,
+                recipients=self.recipients(1),
+            )
+        )
+        self.assertEqual(len(server.templates), 1)
+
+        template = next(iter(server.templates.values()))
+        self.assertIn("{{name}}", template["Html"])
+        self.assertIn("{{contributor_name}}", template["Html"])
+
+    def test_per_recipient_data(self):
+        self.assertTrue(self.send(2))
+        batch = server.batches[0]
+        self.assertEqual(
+            json.loads(batch["DefaultContent"]["Template"]["TemplateData"]),
+            self.data,
+        )
+        entry = batch["BulkEmailEntries"][1]
+        self.assertEqual(
+            entry["Destination"]["ToAddresses"], ["maintainer1@example.com"]
+        )
+        replacement = json.loads(
+            entry["ReplacementEmailContent"]["ReplacementTemplate"][
+                "ReplacementTemplateData"
+            ]
+        )
+        self.assertEqual(replacement["name"], "Maintainer 1")
+
+    def test_transient_failures_retried(self):
+        server.flaky = {"maintainer3@example.com", "maintainer60@example.com"}
+        # counted while the retry is pending
+        self.assertEqual(self.send(70), 70)
+        self.wait_for(lambda: len(server.batches) == 3)
+        retried = server.batches[-1]["BulkEmailEntries"]
+        self.assertEqual(
+            [entry["Destination"]["ToAddresses"][0] for entry in retried],
+            ["maintainer3@example.com", "maintainer60@example.com"],
+        )
+        self.assertEqual(server.published, [])
+
+    def test_backoff_off_the_workers(self):
+        server.flaky = {"maintainer1@example.com"}
+        with override_settings(AWS={**AWS, "bulk_backoff_seconds": 0.5}):
+            self.assertEqual(self.send(3), 3)
+            # both notification workers are free while the retry waits
+            barrier = threading.Barrier(3, timeout=0.3)
+            for _ in range(2):
+                notifier.submit(barrier.wait)
+            barrier.wait()
+            self.assertEqual(len(server.batches), 1)
+            self.wait_for(lambda: len(server.batches) == 2)
+
+    def test_failures_reported(self):
+        server.rejected = {"maintainer1@example.com"}
+        self.assertEqual(self.send(3), 2)
+        self.wait_for(lambda: server.published)
+        # permanent failures are not retried
+        self.assertEqual(len(server.batches), 1)
+        self.assertIn("maintainer1@example.com", server.published[0])
+
+    def test_retries_exhausted(self):
+        server.down = {"maintainer1@example.com"}
+        self.assertEqual(self.send(3), 3)
+        self.wait_for(lambda: server.published)
+        self.assertEqual(len(server.batches), 2)
+        self.assertIn("maintainer1@example.com", server.published[0])
+
+    def test_nobody_emailed(self):
+        server.rejected = {f"maintainer{i}@example.com" for i in range(3)}
+        self.assertEqual(self.send(3), 0)
+
+    def test_missing_data(self):
+        self.assertEqual(
+            self.service.bulk_email(
+                role="contributor_application_to_maintainer",
+                data={"project_name": "githubsrm"},
+                recipients=self.recipients(1),
+            ),
+            0,
+        )
+        self.assertEqual(server.batches, [])
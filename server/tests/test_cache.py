@@ -0,0 +1,119 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from githubsrm.core.cache import DjangoCacheBackend, LocalLRUBackend, VersionedCache
+from githubsrm.core.utils import stream_json
+
+
+class ThreadRecordingBackend(DjangoCacheBackend):
+    """Django cache backend remembering the threads it was called from"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads = set()
+
+    def get(self, key: str):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+
+class TestVersionedCache(unittest.TestCase):
+    """
+    Read-through cache used by the public project listing
+    """
+
+    def setUp(self) -> None:
+        self.fills = 0
+        self.cache = VersionedCache("test", "PROJECT_LISTING_CACHE")
+        self.cache._backend = LocalLRUBackend(max_entries=4)
+
+    def fill(self):
+        self.fills += 1
+        return f"listing-{self.fills}"
+
+    async def afill(self):
+        return self.fill()
+
+    def test_read_through(self):
+        self.assertEqual(self.cache.get_or_set("public", self.fill), "listing-1")
+        self.assertEqual(self.cache.get_or_set("public", self.fill), "listing-1")
+        self.assertEqual(self.fills, 1)
+
+    def test_invalidate(self):
+        self.cache.get_or_set("public", self.fill)
+        self.cache.invalidate()
+        self.assertEqual(self.cache.get_or_set("public", self.fill), "listing-2")
+        self.assertEqual(self.fills, 2)
+
+    def test_lost_version_does_not_resurrect(self):
+        self.cache.get_or_set("public", self.fill)
+        self.cache.backend.delete(self.cache._version_key)
+        self.assertEqual(self.cache.get_or_set("public", self.fill), "listing-2")
+
+    def test_lru_timeout(self):
+        backend = LocalLRUBackend(max_entries=2, timeout=0.05)
+        backend.set("a", 1)
+        backend.set("b", 2, None)
+        backend.set("c", 3, None)
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.get("b"), 2)
+
+        backend.set("d", 4)
+        time.sleep(0.06)
+        self.assertIsNone(backend.get("d"))
+        self.assertEqual(backend.get("b"), 2)
+
+    def test_stream_through(self):
+        documents = [{"_id": str(i), "tags": ["a", "b"]} for i in range(500)]
+        chunks = list(
+            self.cache.stream_through(
+                "public", lambda: stream_json(documents, chunk_size=1024)
+            )
+        )
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads("".join(chunks)), documents)
+
+        cached = list(self.cache.stream_through("public", self.fail))
+        self.assertEqual(cached, ["".join(chunks)])
+
+    def test_stream_too_large(self):
+        self.cache._max_entry_size = 10
+        list(self.cache.stream_through("public", lambda: stream_json([{"a": 1}] * 5)))
+        self.assertEqual(
+            list(self.cache.stream_through("public", lambda: stream_json([]))), ["[]"]
+        )
+
+    def test_async_too_large(self):
+        self.cache._max_entry_size = 5
+        read = lambda: asyncio.run(self.cache.aget_or_set("public", self.afill))
+        self.assertEqual(read(), "listing-1")
+        self.assertEqual(read(), "listing-2")
+        self.assertEqual(self.fills, 2)
+
+    def test_async_read_through(self):
+        read = lambda: asyncio.run(self.cache.aget_or_set("public", self.afill))
+        self.assertEqual(read(), "listing-1")
+        self.assertEqual(read(), "listing-1")
+        # sync and async readers share entries and versions
+        self.assertEqual(self.cache.get_or_set("public", self.fill), "listing-1")
+        self.cache.invalidate()
+        self.assertEqual(read(), "listing-2")
+        self.assertEqual(self.fills, 2)
+
+    def test_async_shared_backend_off_loop(self):
+        backend = ThreadRecordingBackend()
+        backend.clear()
+        self.cache._backend = backend
+
+        async def read():
+            return threading.get_ident(), await self.cache.aget_or_set(
+                "public", self.afill
+            )
+
+        loop_thread, value = asyncio.run(read())
+        self.assertEqual(value, "listing-1")
+        self.assertTrue(backend.threads)
+        self.assertNotIn(loop_thread, backend.threads)
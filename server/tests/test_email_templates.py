@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+
+from core.email_templates import EmailTemplates
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from . import EMAIL_TEMPLATES
+
+FOLDER = EMAIL_TEMPLATES["folder"]
+
+
+def templates(folder: str, bytecode_cache: str) -> override_settings:
+    return override_settings(
+        EMAIL_TEMPLATES={"folder": folder, "bytecode_cache": bytecode_cache}
+    )
+
+
+class TestEmailTemplates(SimpleTestCase):
+    """
+    Email templates compiled at startup
+    """
+
+    def setUp(self) -> None:
+        self.cache = tempfile.TemporaryDirectory()
+        overridden = templates(FOLDER, self.cache.name)
+        overridden.enable()
+        self.addCleanup(overridden.disable)
+
+    def test_all_roles(self):
+        templates = EmailTemplates()
+        with open(os.path.join(FOLDER, "email_statics.json")) as fp:
+            statics = json.load(fp)
+        self.assertEqual(set(templates.load()), set(statics))
+        self.assertTrue(os.listdir(self.cache.name))
+
+        for role, context in statics.items():
+            data = {key: f"{key}-value" for key in context["kw"]}
+            content = templates.render(role, data)["Simple"]
+            self.assertEqual(content["Subject"]["Data"], context["subject"])
+            self.assertTrue(content["Body"]["Html"]["Data"])
+
+    def test_render_data(self):
+        templates = EmailTemplates()
+        data = {
+            "name": "Contributor",
+            "email": "contributor@example.com",
+            "project_name": "githubsrm",
+            "contribution": "tests",
+        }
+        content = templates.render("contributor_received", data)["Simple"]
+        self.assertIn("Contributor", content["Body"]["Html"]["Data"])
+        self.assertIn("githubsrm", content["Body"]["Text"]["Data"])
+
+    def test_missing_data(self):
+        templates = EmailTemplates()
+        with self.assertRaises(ValueError):
+            templates.render("contributor_received", {"name": "Contributor"})
+        with self.assertRaises(ValueError):
+            templates.render("unknown", {})
+
+    def test_undeclared_key(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, "email_statics.json"), "w") as fp:
+                json.dump(
+                    {
+                        "role": {
+                            "subject": "subject",
+                            "bodyText": "{}",
+                            "body_kw": ["name"],
+                            "file": "1",
+                            "kw": ["name"],
+                        }
+                    },
+                    fp,
+                )
+            with open(os.path.join(folder, "1.html"), "w") as fp:
+                fp.write("{{ name }} {{ token }}")
+
+            with templates(folder, self.cache.name):
+                with self.assertRaises(ImproperlyConfigured):
+                    EmailTemplates().load()
+
+    def tearDown(self) -> None:
+        self.cache.cleanup()
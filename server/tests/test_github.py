@@ -0,0 +1,124 @@
+import time
+from datetime import datetime, timedelta
+
+from apis.github import GithubVerifier
+from core.mongo import registry
+from django.test import SimpleTestCase, override_settings
+
+from . import StubHandler, StubServer
+
+
+class Stub(StubHandler):
+    """
+    Stand-in for GitHub, `/found` exists, `/missing` does not,
+    `/limited` is rate limited and `/slow` answers after 0.5 seconds.
+    `server.etag` is answered with 304.
+    """
+
+    def do_GET(self) -> None:
+        self.server.hits += 1
+        if self.path == "/slow":
+            time.sleep(0.5)
+        if self.path == "/limited" or self.server.limited:
+            status = 403
+        elif self.path == "/missing":
+            status = 404
+        elif self.headers.get("If-None-Match") == self.server.etag:
+            status = 304
+        else:
+            status = 200
+        self.reply(status, headers={"ETag": self.server.etag})
+
+
+server = StubServer(Stub)
+url = server.url
+db = registry.db
+
+
+def tearDownModule() -> None:
+    db.test_github_cache.drop()
+    server.close()
+
+
+GITHUB_CACHE = {"token": None, "timeout": 1, "ttl": 60, "negative_ttl": 30}
+
+
+@override_settings(GITHUB_CACHE=GITHUB_CACHE)
+class TestGithubVerifier(SimpleTestCase):
+    """
+    GitHub verification cache against a local stub server
+    """
+
+    def setUp(self) -> None:
+        server.hits, server.etag, server.limited = 0, '"v1"', False
+        self.verifier = GithubVerifier(collection="test_github_cache")
+        db.test_github_cache.delete_many({})
+
+    def expire(self) -> None:
+        db.test_github_cache.update_many(
+            {}, {"$set": {"fresh_until": datetime.utcnow()}}
+        )
+
+    def test_cached(self):
+        self.assertTrue(self.verifier.verify(f"{url}/found"))
+        self.assertTrue(self.verifier.verify(f"{url}/found"))
+        self.assertEqual(server.hits, 1)
+        self.assertEqual(self.verifier.stats()["hit_rate"], 0.5)
+
+    def test_shared_across_workers(self):
+        self.verifier.verify(f"{url}/found")
+        other = GithubVerifier(collection="test_github_cache")
+        self.assertTrue(other.verify(f"{url}/found"))
+        self.assertEqual(other.stats()["upstream_calls"], 0)
+
+    def test_negative_entry(self):
+        self.assertFalse(self.verifier.verify(f"{url}/missing"))
+        self.assertFalse(self.verifier.verify(f"{url}/missing"))
+        self.assertEqual(server.hits, 1)
+
+    def test_revalidated(self):
+        self.verifier.verify(f"{url}/found")
+        self.expire()
+        self.assertTrue(self.verifier.verify(f"{url}/found"))
+        self.assertEqual(self.verifier.stats()["revalidated"], 1)
+
+        server.etag = '"v2"'
+        self.expire()
+        self.assertTrue(self.verifier.verify(f"{url}/found"))
+        self.assertEqual(self.verifier.stats()["revalidated"], 1)
+
+    def test_rate_limited(self):
+        self.verifier.verify(f"{url}/found")
+        self.expire()
+        server.limited = True
+        # stale answer while rate limited
+        self.assertTrue(self.verifier.verify(f"{url}/found"))
+        server.limited = False
+        self.assertFalse(self.verifier.verify(f"{url}/limited"))
+        self.assertTrue(self.verifier.verify(f"{url}/limited", fallback=f"{url}/found"))
+
+    def test_fallback_cached(self):
+        self.assertTrue(self.verifier.verify(f"{url}/limited", fallback=f"{url}/found"))
+        self.assertTrue(self.verifier.verify(f"{url}/limited", fallback=f"{url}/found"))
+        self.assertEqual(server.hits, 2)
+
+        entry = db.test_github_cache.find_one({"_id": f"{url}/limited"})
+        self.assertLessEqual(
+            entry["fresh_until"], datetime.utcnow() + timedelta(seconds=30)
+        )
+
+    @override_settings(GITHUB_CACHE={**GITHUB_CACHE, "timeout": 0.2})
+    def test_timeout(self):
+        self.assertFalse(self.verifier.verify(f"{url}/slow"))
+        self.assertEqual(db.test_github_cache.count_documents({}), 0)
+
+        # stale answer while GitHub does not answer in time
+        db.test_github_cache.insert_one(
+            {
+                "_id": f"{url}/slow",
+                "ok": True,
+                "etag": None,
+                "fresh_until": datetime.utcnow(),
+            }
+        )
+        self.assertTrue(self.verifier.verify(f"{url}/slow"))
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+import pymongo
+from dotenv import load_dotenv
+from githubsrm.core.indexes import (
+    _stages,
+    ensure_indexes,
+    find_collscans,
+    load_queries,
+)
+from githubsrm.core.mongo import QueryRecorder
+from githubsrm.core.settings import DATABASE
+
+
+class TestIndexes(unittest.TestCase):
+    """
+    Every model query must be backed by a declared index
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        load_dotenv()
+
+        cls.pymongo_client = pymongo.MongoClient(DATABASE["mongo_uri"])
+        cls.db = cls.pymongo_client[os.getenv("TestDB")]
+
+    def test_ensure_indexes_idempotent(self):
+        """
+        A second run has nothing left to do
+        """
+        ensure_indexes(self.db)
+        self.assertEqual(ensure_indexes(self.db), [])
+
+    def test_no_collscan(self):
+        """
+        explain() every query the server ran during the test run, the
+        server records them when started with MONGO_RECORD_QUERIES
+        """
+        path = DATABASE["record_queries"]
+        if not path or not os.path.exists(path):
+            self.skipTest("no queries recorded, set MONGO_RECORD_QUERIES")
+        ensure_indexes(self.db)
+        self.assertEqual(find_collscans(self.db, load_queries(path)), [])
+
+    def test_record_queries(self):
+        """
+        Recorded once per shape, `$lookup` finds and unindexed filters
+        are explained too
+        """
+        ensure_indexes(self.db)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "queries.jsonl")
+            client = pymongo.MongoClient(
+                DATABASE["mongo_uri"], event_listeners=[QueryRecorder(path)]
+            )
+            db = client[self.db.name]
+            db.maintainer.find_one({"email": "a@srmist.edu.in"})
+            db.maintainer.find_one({"email": "b@srmist.edu.in"})
+            db.team.find_one({})
+            db.maintainer_credentials.aggregate(
+                [
+                    {"$match": {"email": "a@srmist.edu.in"}},
+                    {
+                        "$lookup": {
+                            "from": "contributor",
+                            "localField": "email",
+                            "foreignField": "poc_email",
+                            "as": "contributors",
+                        }
+                    },
+                ]
+            )
+            client.close()
+
+            queries = load_queries(path)
+            self.assertEqual(
+                [query["collection"] for query in queries],
+                ["maintainer", "team", "maintainer_credentials"],
+            )
+            self.assertEqual(
+                find_collscans(self.db, queries),
+                [
+                    {
+                        "collection": "contributor",
+                        "command": {"find": "contributor", "filter": {"poc_email": ""}},
+                    }
+                ],
+            )
+
+    def test_refresh_projects_covered(self):
+        """
+        Approved project ids read on token refresh come from the index alone
+        """
+        ensure_indexes(self.db)
+        explained = self.db.command(
+            "explain",
+            {
+                "find": "maintainer",
+                "filter": {"email": "", "is_admin_approved": True},
+                "projection": {"_id": 0, "project_id": 1},
+            },
+            verbosity="queryPlanner",
+        )
+        stages = list(_stages(explained["queryPlanner"]["winningPlan"]))
+        self.assertIn("IXSCAN", stages)
+        self.assertNotIn("FETCH", stages)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.pymongo_client.close()
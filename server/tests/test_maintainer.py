@@ -8,7 +8,8 @@ import requests
 import pymongo
 import unittest
 import json
-from githubsrm.core.settings import DATABASE
+import time
+from githubsrm.core.settings import DATABASE, TOKEN_EPOCHS
 from . import Base
 
 entry = Base()
@@ -245,6 +246,45 @@ class TestClient(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.clean()
 
+    def test_revoked_token_other_worker(self):
+        """
+        epoch bumps by another worker revoke tokens after the refresh interval
+        """
+        self.clean()
+        response = entry.register_admin(self)
+        self.assertEqual(response.status_code, 200)
+
+        response = entry.login_admin(self)
+        admin_jwt = response.json()["access_token"]
+        self.assertEqual(response.status_code, 200)
+
+        response = entry.add_alpha_maintainer(self)
+        self.assertEqual(response.status_code, 201)
+
+        alpha = dict(self.db.maintainer.find_one({"github_id": "riju561"}))
+        response = entry.approve_alpha_maintainer(self, alpha, admin_jwt)
+        self.assertEqual(response.status_code, 200)
+
+        entry.set_alpha_password(self)
+
+        response = entry.login_maintainer(self)
+        maintainer_jwt = response.json()["access_token"]
+        self.assertEqual(response.status_code, 200)
+
+        response = entry.get_maintainer_projects(self, maintainer_jwt)
+        self.assertEqual(response.status_code, 200)
+
+        self.db.token_epochs.update_one(
+            {"_id": alpha["email"]},
+            {"$inc": {"epoch": 1}, "$currentDate": {"updated_at": True}},
+        )
+        time.sleep(TOKEN_EPOCHS["refresh_interval"] + 1)
+
+        response = entry.get_maintainer_projects(self, maintainer_jwt)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["error"], "Key expired")
+        self.clean()
+
     def test_maintainer_login_with_admin_jwt(self):
         self.clean()
         response = entry.register_admin(self)
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from core.aws import NotificationExecutor
+from django.test import SimpleTestCase, override_settings
+
+NOTIFICATIONS = {
+    "workers": 2,
+    "max_queue": 4,
+    "submit_timeout": 0.05,
+    "drain_timeout": 2,
+}
+
+
+def notifications(**config) -> override_settings:
+    return override_settings(NOTIFICATIONS={**NOTIFICATIONS, **config})
+
+
+def wait(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@notifications()
+class TestNotificationExecutor(SimpleTestCase):
+    """
+    Bounded notification worker pool
+    """
+
+    def test_runs_submitted(self):
+        executor = NotificationExecutor()
+        sent = []
+        for i in range(10):
+            self.assertTrue(executor.submit(lambda i: sent.append(i), i=i))
+        self.assertEqual(executor.shutdown(), 0)
+        self.assertEqual(sorted(sent), list(range(10)))
+        self.assertEqual(executor.stats()["completed"], 10)
+
+    def test_bounded(self):
+        executor = NotificationExecutor()
+        release = threading.Event()
+        threads = set()
+
+        def blocked():
+            threads.add(threading.get_ident())
+            release.wait()
+
+        accepted = [executor.submit(blocked) for _ in range(8)]
+        # two running, four queued
+        self.assertEqual(accepted, [True] * 6 + [False] * 2)
+        stats = executor.stats()
+        self.assertEqual(stats["queue_depth"], 4)
+        self.assertEqual(stats["rejected"], 2)
+
+        release.set()
+        executor.shutdown()
+        self.assertEqual(len(threads), 2)
+        self.assertEqual(executor.stats()["completed"], 6)
+
+    def test_failure_counted(self):
+        executor = NotificationExecutor()
+
+        def fail():
+            raise RuntimeError("SES down")
+
+        executor.submit(fail)
+        executor.submit(wait, seconds=0)
+        executor.shutdown()
+        stats = executor.stats()
+        self.assertEqual((stats["failed"], stats["completed"]), (1, 1))
+
+    @notifications(workers=1, drain_timeout=0.1)
+    def test_drain_timeout(self):
+        executor = NotificationExecutor()
+        for _ in range(3):
+            executor.submit(wait, seconds=0.3)
+        self.assertEqual(executor.shutdown(), 2)
+
+    def test_after_shutdown(self):
+        executor = NotificationExecutor()
+        executor.shutdown()
+        sent = []
+        executor.submit(lambda i: sent.append(i), i=1)
+        executor.shutdown()
+        self.assertEqual(sent, [1])
+
+    @notifications(workers=1, max_queue=1, submit_timeout=1)
+    def test_submit_nowait(self):
+        executor = NotificationExecutor()
+        release = threading.Event()
+        self.assertTrue(executor.submit_nowait(release.wait))
+        # the worker picks up the first one, the second fills the queue
+        time.sleep(0.05)
+        self.assertTrue(executor.submit_nowait(release.wait))
+
+        start = time.monotonic()
+        self.assertFalse(executor.submit_nowait(release.wait))
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(executor.stats()["rejected"], 1)
+
+        release.set()
+        executor.shutdown()
+        self.assertFalse(executor.submit_nowait(release.wait))
@@ -0,0 +1,149 @@
+import json
+import time
+from datetime import datetime
+from urllib.parse import parse_qs
+
+from core.aws import service
+from core.email_templates import email_templates
+from core.mongo import registry
+from core.outbox import Outbox
+from django.test import SimpleTestCase, override_settings
+
+from . import EMAIL_TEMPLATES, StubHandler, StubServer
+
+PUBLISH = b"""<PublishResponse xmlns="http://sns.amazonaws.com/doc/2010-03-31/">
+<PublishResult><MessageId>test</MessageId></PublishResult>
+<ResponseMetadata><RequestId>test</RequestId></ResponseMetadata>
+</PublishResponse>"""
+
+REJECTED = b"""<ErrorResponse xmlns="http://sns.amazonaws.com/doc/2010-03-31/">
+<Error><Type>Sender</Type><Code>InvalidParameter</Code><Message>rejected</Message></Error>
+<RequestId>test</RequestId>
+</ErrorResponse>"""
+
+
+class SESStandIn(StubHandler):
+    """
+    Local stand-in for SES v2 SendEmail and SNS Publish, records what was
+    sent and rejects everything while `server.failing` is set.
+    """
+
+    def do_POST(self) -> None:
+        body = self.body()
+        failing = self.server.failing
+
+        if self.path == "/v2/email/outbound-emails":
+            if failing:
+                self.reply(
+                    400,
+                    {"message": "rejected"},
+                    headers={"x-amzn-ErrorType": "MessageRejected"},
+                )
+                return
+            self.server.emails.append(json.loads(body))
+            self.reply(200, {"MessageId": "test"})
+        else:
+            if not failing:
+                self.server.published.append(parse_qs(body.decode()))
+            self.reply(
+                400 if failing else 200,
+                REJECTED if failing else PUBLISH,
+                headers={"Content-Type": "text/xml"},
+            )
+
+
+server = StubServer(SESStandIn)
+db = registry.db
+
+
+def tearDownModule() -> None:
+    db.test_outbox.drop()
+    server.close()
+
+
+@override_settings(
+    AWS={
+        "enabled": True,
+        "region": "ap-south-1",
+        "endpoint_url": server.url,
+        "max_pool_connections": 2,
+    },
+    OUTBOX={
+        "batch_size": 10,
+        "max_attempts": 2,
+        "backoff_seconds": 0.1,
+        "lease_seconds": 60,
+        "retention_seconds": 60,
+    },
+    EMAIL_TEMPLATES=EMAIL_TEMPLATES,
+)
+class TestOutboxDispatch(SimpleTestCase):
+    """
+    Outbox delivery against a local SES stand-in
+    """
+
+    def setUp(self) -> None:
+        # the shared service and templates were built from other settings
+        service._reset()
+        email_templates._roles = None
+        server.failing, server.emails, server.published = False, [], []
+        self.outbox = Outbox()
+        self.outbox.collection = "test_outbox"
+        db.test_outbox.delete_many({})
+
+    def messages(self):
+        return [
+            self.outbox.email(
+                "contributor_received:1",
+                role="contributor_received",
+                data={
+                    "contribution": "tests",
+                    "project_name": "githubsrm",
+                    "name": "Contributor",
+                    "email": "contributor@example.com",
+                },
+            ),
+            self.outbox.sns(
+                "contributor_entry:1", payload={"message": "entry", "subject": "test"}
+            ),
+        ]
+
+    def test_enqueue_idempotent(self):
+        self.outbox.enqueue(self.messages())
+        self.outbox.enqueue(self.messages())
+        self.assertEqual(self.outbox.stats()["pending"], 2)
+
+    def test_dispatch(self):
+        self.outbox.enqueue(self.messages())
+        self.assertEqual(self.outbox.dispatch(), {"sent": 2, "retried": 0, "dead": 0})
+        self.assertEqual(len(server.emails), 1)
+        self.assertEqual(
+            server.emails[0]["Destination"]["ToAddresses"],
+            ["contributor@example.com"],
+        )
+        self.assertEqual(server.published[0]["Message"], ["entry"])
+
+        # delivered messages keep their key
+        self.outbox.enqueue(self.messages())
+        self.assertEqual(self.outbox.dispatch(), {"sent": 0, "retried": 0, "dead": 0})
+        self.assertEqual(len(server.emails), 1)
+
+    def test_retry_and_dead_letter(self):
+        server.failing = True
+        self.outbox.enqueue(self.messages())
+        self.assertEqual(self.outbox.dispatch(), {"sent": 0, "retried": 2, "dead": 0})
+        # not due before the backoff
+        self.assertEqual(self.outbox.dispatch(), {"sent": 0, "retried": 0, "dead": 0})
+        time.sleep(0.15)
+        self.assertEqual(self.outbox.dispatch(), {"sent": 0, "retried": 0, "dead": 2})
+        self.assertEqual(self.outbox.stats()["dead"], 2)
+
+        server.failing = False
+        self.assertEqual(self.outbox.requeue_dead(), 2)
+        self.assertEqual(self.outbox.drain(), {"sent": 2, "retried": 0, "dead": 0})
+
+    def test_claimed_messages_hidden(self):
+        self.outbox.enqueue(self.messages())
+        claimed = self.outbox._claim(datetime.utcnow())
+        self.assertIsNotNone(claimed)
+        self.assertEqual(self.outbox.dispatch()["sent"], 1)
@@ -0,0 +1,72 @@
+import binascii
+import hashlib
+import os
+
+from django.test import SimpleTestCase, override_settings
+from githubsrm.core.passwords import PasswordHasher
+
+PASSWORD_HASHING = {
+    "algorithm": "pbkdf2_sha512",
+    "iterations": 1000,
+    "n": 2**10,
+    "r": 8,
+    "p": 1,
+    "workers": 0,
+    "max_pending": 4,
+}
+
+
+def hashing(**config) -> override_settings:
+    return override_settings(PASSWORD_HASHING={**PASSWORD_HASHING, **config})
+
+
+def legacy_hash(password: str) -> str:
+    salt = hashlib.sha256(os.urandom(60)).hexdigest().encode("ascii")
+    pwd_hash = hashlib.pbkdf2_hmac("sha512", password.encode("utf-8"), salt, 100000)
+    return (salt + binascii.hexlify(pwd_hash)).decode("ascii")
+
+
+@hashing()
+class TestPasswordHasher(SimpleTestCase):
+    """
+    Password hashing used by admin and maintainer logins
+    """
+
+    def test_verify(self):
+        hasher = PasswordHasher()
+        encoded = hasher.hash("test1234")
+        self.assertTrue(encoded.startswith("pbkdf2_sha512$1000$"))
+        self.assertTrue(hasher.verify("test1234", encoded))
+        self.assertFalse(hasher.verify("test12345", encoded))
+        self.assertFalse(hasher.needs_rehash(encoded))
+
+    @hashing(iterations=100000)
+    def test_legacy_hash(self):
+        hasher = PasswordHasher()
+        encoded = legacy_hash("test1234")
+        self.assertTrue(hasher.verify("test1234", encoded))
+        self.assertFalse(hasher.verify("test12345", encoded))
+        self.assertTrue(hasher.needs_rehash(encoded))
+
+    def test_needs_rehash_on_new_parameters(self):
+        hasher = PasswordHasher()
+        encoded = hasher.hash("test1234")
+        with hashing(iterations=2000):
+            self.assertTrue(hasher.needs_rehash(encoded))
+
+        with hashing(algorithm="scrypt"):
+            self.assertTrue(hasher.needs_rehash(encoded))
+            self.assertTrue(hasher.verify("test1234", encoded))
+
+            encoded = hasher.hash("test1234")
+            self.assertTrue(encoded.startswith("scrypt$1024,8,1$"))
+            self.assertTrue(hasher.verify("test1234", encoded))
+            self.assertFalse(hasher.needs_rehash(encoded))
+
+    def test_process_pool(self):
+        with hashing(workers=1):
+            hasher = PasswordHasher()
+            encoded = hasher.hash("test1234")
+            self.assertTrue(hasher.verify("test1234", encoded))
+        self.assertTrue(PasswordHasher().verify("test1234", encoded))
+        hasher._pool.shutdown()
@@ -0,0 +1,145 @@
+import os
+import unittest
+
+import bson
+import pymongo
+import requests
+from dotenv import load_dotenv
+from githubsrm.core.settings import DATABASE
+from pymongo import monitoring
+
+from . import Base
+
+entry = Base()
+
+# No-op update, replays a findAndModify that returns the whole document
+NO_OP = {"$setOnInsert": {"_unused": True}}
+
+
+class ReplyBytes(monitoring.CommandListener):
+    def __init__(self) -> None:
+        self.bytes = 0
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        self.bytes += len(bson.encode(event.reply))
+
+    def failed(self, event) -> None:
+        pass
+
+
+class TestProjections(unittest.TestCase):
+    """
+    Bytes read from MongoDB per endpoint, against the whole-document
+    reads the models used to issue. Needs the server in DEBUG mode for
+    the health check command stats.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        load_dotenv()
+
+        cls.replies = ReplyBytes()
+        cls.client = requests.Session()
+        cls.pymongo_client = pymongo.MongoClient(
+            DATABASE["mongo_uri"], event_listeners=[cls.replies]
+        )
+        cls.db = cls.pymongo_client[os.getenv("TestDB")]
+
+        cls.base_url = "http://localhost:8000/"
+        cls.webhook = list(cls.db.webHook.find({}))[0]["token"]
+
+    def server_bytes(self, call, collections=("project", "maintainer")):
+        """
+        Reply bytes the server received from `collections` while handling
+        `call`, other collections also see throttle and epoch poll traffic
+        """
+
+        def received():
+            response = self.client.get(url=self.base_url + "api/healthcheck")
+            stats = response.json()["mongo"]["collections"]
+            return sum(
+                stats.get(name, {}).get("bytes_received", 0) for name in collections
+            )
+
+        start = received()
+        response = call()
+        return response, received() - start
+
+    def legacy_bytes(self, *reads):
+        """
+        Reply bytes of the legacy whole-document reads
+        """
+        start = self.replies.bytes
+        for read in reads:
+            read()
+        return self.replies.bytes - start
+
+    def setUp(self) -> None:
+        self.clean()
+        response = entry.register_admin(self)
+        self.assertEqual(response.status_code, 200)
+
+        response = entry.login_admin(self)
+        self.assertEqual(response.status_code, 200)
+        self.admin_jwt = response.json()["access_token"]
+
+        response = entry.add_alpha_maintainer(self)
+        self.assertEqual(response.status_code, 201)
+        self.alpha = dict(self.db.maintainer.find_one({"github_id": "riju561"}))
+
+    def test_remove_maintainer_bytes(self):
+        project_id = self.alpha["project_id"]
+        before = self.legacy_bytes(
+            lambda: self.db.maintainer.find_one_and_update(
+                {"_id": self.alpha["_id"]}, NO_OP
+            ),
+            lambda: self.db.project.find_one({"_id": project_id}),
+            lambda: self.db.project.find_one_and_update({"_id": project_id}, NO_OP),
+        )
+
+        response, after = self.server_bytes(
+            lambda: entry.reject_maintainer(self, self.alpha, self.admin_jwt)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(
+            after, before, f"admin remove maintainer: {before} -> {after} bytes"
+        )
+
+    def test_approve_project_bytes(self):
+        response = entry.approve_alpha_maintainer(self, self.alpha, self.admin_jwt)
+        self.assertEqual(response.status_code, 200)
+
+        project_id = self.alpha["project_id"]
+        maintainers = {"_id": {"$in": [self.alpha["_id"]]}}
+        before = self.legacy_bytes(
+            lambda: self.db.project.find_one({"_id": project_id}),
+            lambda: list(self.db.maintainer.find(maintainers)),
+            lambda: self.db.project.find_one_and_update({"_id": project_id}, NO_OP),
+            lambda: list(self.db.maintainer.find(maintainers)),
+        )
+
+        response, after = self.server_bytes(
+            lambda: entry.approve_project(self, self.alpha, self.admin_jwt)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(
+            after, before, f"admin approve project: {before} -> {after} bytes"
+        )
+
+    def tearDown(self) -> None:
+        self.clean()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.pymongo_client.close()
+        cls.client.close()
+
+    def clean(self):
+        self.db.admins.delete_many({})
+        self.db.project.delete_many({})
+        self.db.maintainer.delete_many({})
+        self.db.maintainer_credentials.delete_many({})
+        self.db.contributor.delete_many({})
@@ -0,0 +1,136 @@
+import json
+import time
+
+from apis.recaptcha import RecaptchaClient
+from django.test import SimpleTestCase, override_settings
+
+from . import StubHandler, StubServer
+
+
+class Stub(StubHandler):
+    """
+    Stand-in for the siteverify endpoint, answers with `server.mode`
+    """
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self) -> None:
+        self.body()
+        self.server.hits += 1
+        mode = self.server.mode
+
+        if mode == "slow":
+            time.sleep(0.5)
+        if mode == "error":
+            self.reply(500, {})
+        elif mode == "malformed":
+            self.reply(200, ["not", "an", "object"])
+        else:
+            score = 0.1 if mode == "low" else 0.9
+            self.reply(200, {"success": True, "score": score})
+
+
+server = StubServer(Stub)
+
+RECAPTCHA = {
+    "secret": "test",
+    "verify_url": f"{server.url}/siteverify",
+    "min_score": 0.5,
+    "connect_timeout": 0.2,
+    "read_timeout": 0.2,
+    "pool_size": 2,
+    "cache_size": 16,
+    "cache_ttl": 60,
+    "failure_threshold": 2,
+    "reset_timeout": 0.3,
+    "fail_open": False,
+}
+
+
+def recaptcha(**config) -> override_settings:
+    return override_settings(RECAPTCHA={**RECAPTCHA, **config})
+
+
+def tearDownModule() -> None:
+    server.close()
+
+
+@recaptcha()
+class TestRecaptchaClient(SimpleTestCase):
+    """
+    reCAPTCHA verification against a local stub server
+    """
+
+    def setUp(self) -> None:
+        server.mode, server.hits, server.connections = "ok", 0, 0
+
+    def test_valid_not_cached(self):
+        client = RecaptchaClient()
+        self.assertTrue(client.verify("token"))
+        self.assertTrue(client.verify("token"))
+        # a replayed token is checked again, siteverify rejects duplicates
+        self.assertEqual(server.hits, 2)
+
+    def test_low_score(self):
+        server.mode = "low"
+        client = RecaptchaClient()
+        self.assertFalse(client.verify("token"))
+        self.assertFalse(client.verify("token"))
+        self.assertEqual(server.hits, 1)
+
+    def test_keep_alive(self):
+        client = RecaptchaClient()
+        for i in range(5):
+            self.assertTrue(client.verify(f"token-{i}"))
+        self.assertEqual(server.hits, 5)
+        self.assertEqual(server.connections, 1)
+
+    def test_timeout_policy(self):
+        server.mode = "slow"
+        self.assertFalse(RecaptchaClient().verify("token"))
+        with recaptcha(fail_open=True):
+            self.assertTrue(RecaptchaClient().verify("token"))
+
+    def test_circuit_breaker(self):
+        server.mode = "error"
+        client = RecaptchaClient()
+        for i in range(4):
+            self.assertFalse(client.verify(f"token-{i}"))
+        self.assertEqual(server.hits, 2)
+        self.assertEqual(client.breaker.state, "open")
+
+        time.sleep(0.4)
+        server.mode = "ok"
+        self.assertTrue(client.verify("token-5"))
+        self.assertEqual(client.breaker.state, "closed")
+        self.assertEqual(server.hits, 3)
+
+    def test_half_open_failure(self):
+        server.mode = "error"
+        client = RecaptchaClient()
+        client.verify("token-1")
+        client.verify("token-2")
+        time.sleep(0.4)
+        with recaptcha(fail_open=True):
+            self.assertTrue(client.verify("token-3"))
+        self.assertEqual(client.breaker.state, "open")
+        self.assertEqual(server.hits, 3)
+
+    def test_half_open_malformed_answer(self):
+        server.mode = "error"
+        client = RecaptchaClient()
+        client.verify("token-1")
+        client.verify("token-2")
+        time.sleep(0.4)
+
+        # a non-object body still ends the trial
+        server.mode = "malformed"
+        self.assertFalse(client.verify("token-3"))
+        self.assertEqual(client.breaker.state, "open")
+
+        time.sleep(0.4)
+        server.mode = "ok"
+        self.assertTrue(client.verify("token-4"))
+        self.assertEqual(client.breaker.state, "closed")
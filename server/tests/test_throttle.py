@@ -0,0 +1,152 @@
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from core.mongo import registry
+from core.throttle import LocalRateLimiter, MongoRateLimiter, RateLimiter
+from django.test import SimpleTestCase, override_settings
+from pymongo.errors import ServerSelectionTimeoutError
+
+db = registry.db
+
+
+def tearDownModule() -> None:
+    db.test_rate_limits.drop()
+
+
+class UnreachableLimiter:
+    """Backend failing like MongoRateLimiter does while MongoDB is down"""
+
+    calls = 0
+
+    def hit(self, key: str, limit: int, window: float):
+        UnreachableLimiter.calls += 1
+        raise ServerSelectionTimeoutError("unreachable")
+
+
+class TestLocalRateLimiter(unittest.TestCase):
+    """
+    Sliding window counters used when MongoDB is unreachable
+    """
+
+    def test_limit(self):
+        limiter = LocalRateLimiter()
+        allowed = [limiter.hit("client", 5, 60)[0] for _ in range(7)]
+        self.assertEqual(allowed, [True] * 5 + [False] * 2)
+        self.assertTrue(limiter.hit("other", 5, 60)[0])
+
+    def test_wait(self):
+        limiter = LocalRateLimiter()
+        limiter.hit("client", 1, 60)
+        allowed, wait = limiter.hit("client", 1, 60)
+        self.assertFalse(allowed)
+        self.assertTrue(0 < wait <= 60)
+
+    def test_previous_window_weighs_in(self):
+        limiter = LocalRateLimiter()
+        window = 0.5
+        # start right after a window boundary
+        time.sleep(window - time.time() % window)
+        for _ in range(4):
+            limiter.hit("client", 4, window)
+
+        time.sleep(window - time.time() % window + 0.05)
+        # most of the previous window still counts
+        self.assertFalse(limiter.hit("client", 4, window)[0])
+
+        time.sleep(2 * window)
+        self.assertTrue(limiter.hit("client", 4, window)[0])
+
+    def test_prune(self):
+        limiter = LocalRateLimiter(max_keys=2)
+        limiter.hit("a", 1, 0.1)
+        limiter.hit("b", 1, 0.1)
+        time.sleep(0.3)
+        limiter.hit("c", 1, 0.1)
+        self.assertEqual(list(limiter._windows), ["c"])
+
+
+class TestMongoRateLimiter(SimpleTestCase):
+    """
+    Sliding window counters shared by every worker, against TestDB
+    """
+
+    def setUp(self) -> None:
+        self.limiter = MongoRateLimiter(collection="test_rate_limits")
+        db.test_rate_limits.delete_many({})
+
+    def test_limit(self):
+        allowed = [self.limiter.hit("client", 5, 60)[0] for _ in range(7)]
+        self.assertEqual(allowed, [True] * 5 + [False] * 2)
+        self.assertTrue(self.limiter.hit("other", 5, 60)[0])
+        # one upserted counter per key
+        self.assertEqual(db.test_rate_limits.count_documents({}), 2)
+
+    def test_wait(self):
+        self.limiter.hit("client", 1, 60)
+        allowed, wait = self.limiter.hit("client", 1, 60)
+        self.assertFalse(allowed)
+        self.assertTrue(0 < wait <= 60)
+
+    def test_window_roll(self):
+        window = 0.5
+        # start right after a window boundary
+        time.sleep(window - time.time() % window)
+        for _ in range(4):
+            self.limiter.hit("client", 4, window)
+
+        time.sleep(window - time.time() % window + 0.05)
+        # most of the previous window still counts
+        self.assertFalse(self.limiter.hit("client", 4, window)[0])
+        doc = db.test_rate_limits.find_one({"_id": "client"})
+        self.assertEqual((doc["count"], doc["prev"]), (1, 4))
+
+        # a window without hits in between drops the old count
+        time.sleep(2 * window)
+        self.assertTrue(self.limiter.hit("client", 4, window)[0])
+        doc = db.test_rate_limits.find_one({"_id": "client"})
+        self.assertEqual((doc["count"], doc["prev"]), (1, 0))
+
+    def test_expires_at(self):
+        window = 60
+        self.limiter.hit("client", 5, window)
+        doc = db.test_rate_limits.find_one({"_id": "client"})
+        # the TTL index drops counters once they stop counting as `prev`
+        start = datetime.utcfromtimestamp(doc["start"])
+        self.assertEqual(doc["expires_at"], start + timedelta(seconds=2 * window))
+        self.assertEqual(doc["start"] % window, 0)
+
+
+@override_settings(
+    RATE_LIMIT={
+        "BACKEND": "tests.test_throttle.UnreachableLimiter",
+        "failure_threshold": 1,
+        "reset_timeout": 0.3,
+    }
+)
+class TestRateLimiterFallback(SimpleTestCase):
+    """
+    Local counters take over while the shared backend fails
+    """
+
+    def setUp(self) -> None:
+        UnreachableLimiter.calls = 0
+        self.limiter = RateLimiter()
+
+    def test_breaker_skips_backend(self):
+        self.assertTrue(self.limiter.blocking)
+        allowed = [self.limiter.hit("client", 2, 60)[0] for _ in range(3)]
+        self.assertEqual(allowed, [True, True, False])
+        # only the first hit waited on the backend
+        self.assertEqual(UnreachableLimiter.calls, 1)
+        self.assertFalse(self.limiter.blocking)
+
+        time.sleep(0.4)
+        self.assertFalse(self.limiter.hit("client", 2, 60)[0])
+        self.assertEqual(UnreachableLimiter.calls, 2)
+
+    def test_local_backend_not_blocking(self):
+        with override_settings(
+            RATE_LIMIT={"BACKEND": "core.throttle.LocalRateLimiter"}
+        ):
+            self.assertFalse(RateLimiter().blocking)